@@ -0,0 +1,196 @@
+"""
+Benchmark del costo por candidato de src.evaluador.analizar_experiencia.
+
+Compara el comportamiento anterior (un NLPAnalyzer nuevo con spacy.load por
+candidato) contra el analizador compartido del proceso. Con --perfiles
+compara en cambio los perfiles de análisis (rapido, estandar, completo):
+tiempo por candidato y diferencias de puntaje respecto al perfil completo.
+Con --oraciones compara el modelo con todos sus componentes y oraciones del
+parser contra el modelo reducido a los componentes de los subanálisis y la
+segmentación por reglas. Con --ventanas analiza un único CV formado por los
+N textos y compara la memoria pico del análisis completo contra el análisis
+por ventanas. Con --sentimiento compara el sentimiento por oración anterior
+(un diccionario por oración) contra LoteSentimiento, en tiempo y tamaño del
+resultado, sobre los N CVs y sobre CVs largos.
+
+Uso:
+    python benchmarks/bench_analizador.py [--candidatos N] [--perfiles | --oraciones | --ventanas | --sentimiento]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+
+from benchmarks.sintetico import generar_cvs
+from src.config import SENTIMIENTO_MAX_ORACIONES
+from src import nlp_analyzer
+from src.evaluador import analizar_experiencia, calcular_puntaje
+from src.palabras_clave import contar_palabras_clave
+
+def medir(textos, preparar):
+    """Ejecuta analizar_experiencia sobre cada texto y devuelve segundos por candidato."""
+    inicio = time.perf_counter()
+    for texto in textos:
+        preparar()
+        analizar_experiencia(texto)
+    return (time.perf_counter() - inicio) / len(textos)
+
+def comparar_perfiles(textos):
+    """Mide cada perfil de análisis y compara sus puntajes con los del perfil completo."""
+    conteos = [contar_palabras_clave(texto.lower()) for texto in textos]
+    # Cargar el analizador antes de medir
+    analizar_experiencia(textos[0], perfil="completo")
+
+    medidas = {}
+    for perfil in reversed(nlp_analyzer.PERFILES):
+        inicio = time.perf_counter()
+        exps = [analizar_experiencia(texto, conteos=c, perfil=perfil) for texto, c in zip(textos, conteos)]
+        segundos = (time.perf_counter() - inicio) / len(textos)
+        puntajes = [calcular_puntaje(exp, c["palabras_positivas"], c["palabras_riesgo"])
+                    for exp, c in zip(exps, conteos)]
+        medidas[perfil] = (segundos, puntajes)
+
+    base_segundos, base_puntajes = medidas["completo"]
+    print(f"Candidatos: {len(textos)}")
+    print(f"{'Perfil':<10}{'ms/candidato':>14}{'Aceleración':>13}{'Puntajes iguales':>18}{'Dif. máx.':>11}")
+    for perfil, (segundos, puntajes) in medidas.items():
+        diferencias = [abs(a - b) for a, b in zip(puntajes, base_puntajes)]
+        iguales = sum(d == 0 for d in diferencias) / len(diferencias)
+        print(f"{perfil:<10}{segundos * 1000:>14.2f}{base_segundos / segundos:>12.1f}x"
+              f"{iguales:>17.0%} {max(diferencias):>10.1f}")
+
+def comparar_segmentacion(textos):
+    """
+    Mide NLPAnalyzer con el modelo completo y el parser frente al modelo
+    reducido con el sentencizer de spaCy y con las reglas, con el perfil
+    completo (el único que usa las oraciones del parser). El sentimiento por oración depende de cuántas
+    oraciones se detectan, así que también entra en la medida.
+    """
+    variantes = {
+        "completo + parser": nlp_analyzer.NLPAnalyzer(spacy.load(nlp_analyzer.MODELO_SPACY), oraciones="parser"),
+        "reducido + sentencizer": nlp_analyzer.NLPAnalyzer(oraciones="sentencizer"),
+        "reducido + reglas": nlp_analyzer.NLPAnalyzer(oraciones="reglas")
+    }
+    print(f"Candidatos: {len(textos)}")
+    base = None
+    for nombre, analizador in variantes.items():
+        analizador.analizar_texto(textos[0], perfil="completo")
+        inicio = time.perf_counter()
+        for texto in textos:
+            analizador.analizar_texto(texto, perfil="completo")
+        segundos = (time.perf_counter() - inicio) / len(textos)
+        base = base or segundos
+        print(f"{nombre:<24}{segundos * 1000:>8.2f} ms/candidato {base / segundos:>5.1f}x  "
+              f"componentes: {', '.join(analizador.nlp.pipe_names)}")
+
+def comparar_ventanas(textos):
+    """Mide tiempo y memoria pico de un CV muy largo analizado entero y por ventanas."""
+    texto = "\n".join(textos)
+    variantes = {
+        "entero": nlp_analyzer.NLPAnalyzer(ventana=len(texto) + 1),
+        f"ventanas de {nlp_analyzer.NLP_VENTANA_CARACTERES}": nlp_analyzer.NLPAnalyzer()
+    }
+    print(f"Caracteres del CV: {len(texto)}")
+    for nombre, analizador in variantes.items():
+        analizador.analizar_texto(textos[0])
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        resultado = analizador.analizar_texto(texto)
+        segundos = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{nombre:<22}{segundos:>8.2f} s {pico / 1e6:>9.1f} MB pico  "
+              f"calidad: {resultado['calidad_texto']}")
+
+def comparar_sentimiento(textos, largos=5, oraciones_largos=2000):
+    """
+    Mide el sentimiento VADER del texto y de cada oración con el método
+    anterior (lista de puntajes por oración) y con LoteSentimiento, con y sin
+    límite de oraciones, y el tamaño serializado de los resultados.
+    """
+    sia = nlp_analyzer.NLPAnalyzer().sia
+
+    def anterior(limpios, oraciones):
+        return [{"general": sia.polarity_scores(limpio),
+                 "por_oracion": [sia.polarity_scores(nlp_analyzer.limpiar_texto(o)) for o in oraciones_texto]}
+                for limpio, oraciones_texto in zip(limpios, oraciones)]
+
+    def por_lote(limpios, oraciones, max_oraciones):
+        lote = nlp_analyzer.LoteSentimiento(sia, max_oraciones)
+        resultados = [lote.agregar(limpio, oraciones_texto) for limpio, oraciones_texto in zip(limpios, oraciones)]
+        lote.resolver()
+        return resultados
+
+    corpus = {
+        f"{len(textos)} CVs": textos,
+        f"{largos} CVs de {oraciones_largos} oraciones": generar_cvs(largos, oraciones_largos, semilla=len(textos))
+    }
+    for nombre_corpus, textos_corpus in corpus.items():
+        limpios = [nlp_analyzer.limpiar_texto(texto) for texto in textos_corpus]
+        oraciones = [nlp_analyzer.dividir_oraciones(texto) for texto in textos_corpus]
+        variantes = {
+            "anterior (por oración)": lambda: anterior(limpios, oraciones),
+            "lote, todas": lambda: por_lote(limpios, oraciones, None),
+            f"lote, máx. {SENTIMIENTO_MAX_ORACIONES}": lambda: por_lote(limpios, oraciones, SENTIMIENTO_MAX_ORACIONES)
+        }
+        print(f"{nombre_corpus}:")
+        base = None
+        for nombre, funcion in variantes.items():
+            inicio = time.perf_counter()
+            resultados = funcion()
+            segundos = (time.perf_counter() - inicio) / len(textos_corpus)
+            base = base or segundos
+            print(f"  {nombre:<24}{segundos * 1000:>8.2f} ms/CV {base / segundos:>5.1f}x "
+                  f"{len(pickle.dumps(resultados)) / len(textos_corpus) / 1000:>8.1f} KB/CV")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidatos", type=int, default=20)
+    parser.add_argument("--perfiles", action="store_true", help="Compara los perfiles de análisis")
+    parser.add_argument("--oraciones", action="store_true",
+                        help="Compara el modelo completo con parser contra el reducido con sentencizer o reglas")
+    parser.add_argument("--ventanas", action="store_true",
+                        help="Compara un CV muy largo analizado entero y por ventanas")
+    parser.add_argument("--sentimiento", action="store_true",
+                        help="Compara el sentimiento por oración anterior con el resumen por lotes")
+    args = parser.parse_args()
+
+    textos = generar_cvs(args.candidatos)
+    if args.perfiles:
+        comparar_perfiles(textos)
+        return
+    if args.oraciones:
+        comparar_segmentacion(textos)
+        return
+    if args.ventanas:
+        comparar_ventanas(textos)
+        return
+    if args.sentimiento:
+        comparar_sentimiento(textos)
+        return
+
+    def analizador_nuevo():
+        # Reproduce el comportamiento previo: modelo recargado por candidato
+        nlp_analyzer._analizadores.clear()
+        nlp_analyzer._analizadores[os.getpid()] = nlp_analyzer.NLPAnalyzer(
+            spacy.load(nlp_analyzer.MODELO_SPACY)
+        )
+
+    antes = medir(textos, analizador_nuevo)
+    nlp_analyzer._analizadores.clear()
+    despues = medir(textos, lambda: None)
+
+    print(f"Candidatos: {args.candidatos}")
+    print(f"Antes (spacy.load por candidato): {antes * 1000:.1f} ms/candidato")
+    print(f"Después (analizador compartido):  {despues * 1000:.1f} ms/candidato")
+    print(f"Aceleración: {antes / despues:.1f}x")
+
+if __name__ == "__main__":
+    main()
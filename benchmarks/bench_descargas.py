@@ -0,0 +1,67 @@
+"""
+Benchmark del descargador de PDFs contra un servidor HTTP local.
+
+Compara la descarga secuencial con requests.get (comportamiento anterior)
+contra DescargadorPDF con sesión compartida y descargas concurrentes.
+
+Uso:
+    python benchmarks/bench_descargas.py [--archivos N] [--latencia S] [--fallos N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from benchmarks.servidor_local import ServidorLocal
+from src.descargas import DescargadorPDF
+
+def crear_fixtures(carpeta, cantidad, tamano):
+    """Crea archivos PDF de relleno del tamaño indicado."""
+    nombres = []
+    for i in range(cantidad):
+        nombre = f"cv_{i}.pdf"
+        with open(os.path.join(carpeta, nombre), "wb") as f:
+            f.write(b"%PDF-1.4\n" + os.urandom(tamano))
+        nombres.append(nombre)
+    return nombres
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--archivos", type=int, default=50)
+    parser.add_argument("--tamano", type=int, default=200_000, help="Bytes por archivo")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Segundos por petición")
+    parser.add_argument("--fallos", type=int, default=0, help="Respuestas 503 iniciales por archivo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as origen, tempfile.TemporaryDirectory() as destino:
+        nombres = crear_fixtures(origen, args.archivos, args.tamano)
+
+        with ServidorLocal(origen, latencia=args.latencia) as servidor:
+            inicio = time.perf_counter()
+            for nombre in nombres:
+                r = requests.get(servidor.url(nombre))
+                with open(os.path.join(destino, "sec_" + nombre), "wb") as f:
+                    f.write(r.content)
+            secuencial = time.perf_counter() - inicio
+
+        with ServidorLocal(origen, latencia=args.latencia, fallos_por_archivo=args.fallos) as servidor:
+            descargador = DescargadorPDF(backoff=0.05)
+            tareas = [(servidor.url(n), os.path.join(destino, n)) for n in nombres]
+            inicio = time.perf_counter()
+            resultados = descargador.descargar_todos(tareas)
+            concurrente = time.perf_counter() - inicio
+
+        correctos = sum(r["ok"] for r in resultados)
+        print(f"Archivos: {args.archivos} x {args.tamano} bytes, latencia {args.latencia}s")
+        print(f"Secuencial (requests.get): {secuencial:.2f}s")
+        print(f"DescargadorPDF:            {concurrente:.2f}s ({correctos}/{len(tareas)} correctos)")
+        print(f"Progreso: {descargador.progreso}")
+
+if __name__ == "__main__":
+    main()
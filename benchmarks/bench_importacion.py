@@ -0,0 +1,75 @@
+"""
+Benchmark del tiempo de importación del paquete src.
+
+Importar src no debe cargar spaCy ni NLTK ni intentar descargas. El script
+mide `import src` en un intérprete nuevo, muestra los módulos más costosos
+y termina con código 1 si la mediana supera el presupuesto.
+
+Uso:
+    python benchmarks/bench_importacion.py [--presupuesto SEGUNDOS] [--repeticiones N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto por defecto para `import src`, en segundos
+PRESUPUESTO = 1.0
+
+# Módulos que no deben cargarse al importar src
+MODULOS_PROHIBIDOS = ["spacy", "nltk", "textblob"]
+
+def medir_importacion():
+    """Importa src en un proceso nuevo y devuelve (segundos, salida de -X importtime)."""
+    comando = [sys.executable, "-X", "importtime", "-c", "import src"]
+    entorno = dict(os.environ, EVALUADOR_OFFLINE="1")
+    inicio = time.perf_counter()
+    proceso = subprocess.run(comando, cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True)
+    return time.perf_counter() - inicio, proceso.stderr
+
+def modulos_importados(salida):
+    """Devuelve pares (segundos acumulados, módulo) a partir de la salida de -X importtime."""
+    modulos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or linea.count("|") != 2:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        if acumulado.strip().isdigit():
+            modulos.append((int(acumulado) / 1e6, nombre.strip()))
+    return modulos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    tiempos = []
+    salida = ""
+    for _ in range(args.repeticiones):
+        segundos, salida = medir_importacion()
+        tiempos.append(segundos)
+    mediana = statistics.median(tiempos)
+
+    print(f"import src: mediana {mediana:.3f}s, mínimo {min(tiempos):.3f}s (presupuesto {args.presupuesto:.2f}s)")
+    print("Módulos más costosos (acumulado):")
+    modulos = modulos_importados(salida)
+    for segundos, nombre in sorted(modulos, reverse=True)[1:11]:
+        print(f"  {segundos:7.3f}s  {nombre}")
+
+    nombres = {nombre for _, nombre in modulos}
+    cargados = [m for m in MODULOS_PROHIBIDOS if m in nombres]
+    if cargados:
+        print(f"ERROR: import src cargó {', '.join(cargados)}")
+        sys.exit(1)
+    if mediana > args.presupuesto:
+        print("ERROR: import src supera el presupuesto")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
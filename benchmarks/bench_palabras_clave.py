@@ -0,0 +1,56 @@
+"""
+Benchmark del conteo de palabras clave.
+
+Compara el recorrido anterior (un texto.count por palabra clave y categoría)
+con ContadorPalabrasClave, que recorre el texto una sola vez.
+
+Uso:
+    python benchmarks/bench_palabras_clave.py [--oraciones N] [--repeticiones N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.sintetico import generar_cv
+from src.palabras_clave import CATEGORIAS, ContadorPalabrasClave
+
+def contar_con_count(texto):
+    """Conteo anterior: una pasada de str.count por palabra clave."""
+    return {categoria: sum(texto.count(p) for p in palabras) for categoria, palabras in CATEGORIAS.items()}
+
+def medir(funcion, texto, repeticiones):
+    """Devuelve los milisegundos promedio por llamada."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(texto)
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--oraciones", type=int, nargs="+", default=[60, 600, 6000])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    contador = ContadorPalabrasClave()
+    compilacion = (time.perf_counter() - inicio) * 1000
+    palabras = sum(len(p) for p in CATEGORIAS.values())
+    print(f"Palabras clave: {palabras} en {len(CATEGORIAS)} categorías (compilación {compilacion:.1f} ms)")
+
+    for oraciones in args.oraciones:
+        texto = generar_cv(oraciones, oraciones).lower()
+        antes = medir(contar_con_count, texto, args.repeticiones)
+        despues = medir(contador.contar, texto, args.repeticiones)
+        print(f"{len(texto):>9} caracteres: str.count {antes:8.2f} ms | una pasada {despues:8.2f} ms | {antes / despues:.1f}x")
+
+    # Las diferencias provienen de exigir límites de palabra (p. ej. "auto" ya no cuenta dentro de "autor")
+    texto = generar_cv(0, 600).lower()
+    print("Conteos str.count:  ", contar_con_count(texto))
+    print("Conteos una pasada: ", contador.contar(texto))
+
+if __name__ == "__main__":
+    main()
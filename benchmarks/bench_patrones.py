@@ -0,0 +1,139 @@
+"""
+Benchmark del banco de expresiones regulares de años, formación y competencias.
+
+Compara el método anterior (un re.finditer/re.findall/re.search por
+variante, con una conversión a minúsculas en cada función) con src.patrones
+(una expresión precompilada por categoría y una sola conversión), y con una
+única alternancia de todos los patrones. Cuenta los recorridos del texto por
+documento y verifica que los dos primeros den el mismo resultado.
+
+Uso:
+    python benchmarks/bench_patrones.py [--oraciones N ...] [--repeticiones N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.sintetico import generar_cv
+from src.nlp_analyzer import limpiar_texto
+from src.patrones import (
+    PATRONES_AÑOS_CV,
+    PATRONES_GRADOS_CV,
+    PATRON_INSTITUCIONES_CV,
+    PATRONES_AÑOS,
+    PATRONES_GRADOS,
+    PATRONES_COMPETENCIAS,
+    AÑO_REFERENCIA,
+    menciones_cv,
+    menciones_nlp
+)
+
+# Variantes de años del método anterior, una expresión por variante
+PATRONES_AÑOS_CV_ANTERIORES = [
+    r'(\d+)\s*años?\s*de\s*experiencia',
+    r'experiencia\s*de\s*(\d+)\s*años?',
+    r'(\d+)\s*años?\s*en\s*el\s*cargo',
+    r'(\d+)\s*años?\s*como\s*juez',
+    r'(\d+)\s*años?\s*como\s*magistrado',
+    r'desde\s*el\s*año\s*(\d{4})',
+    r'desde\s*(\d{4})\s*a\s*la\s*fecha'
+]
+PATRONES_AÑOS_ANTERIORES = [
+    r'(\d+)\s*años?\s*de\s*experiencia',
+    r'experiencia\s*de\s*(\d+)\s*años?',
+    r'(\d+)\s*años?\s*en\s*el\s*cargo'
+]
+
+class Recorridos:
+    """Cuenta los recorridos completos del texto del método anterior."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, resultado):
+        self.total += 1
+        return resultado
+
+def por_patron(texto_cv, texto_limpio, recorrido):
+    """Método anterior: una búsqueda por patrón y una conversión a minúsculas por función."""
+    # utils.extraer_años_experiencia
+    años = []
+    for patron in PATRONES_AÑOS_CV_ANTERIORES:
+        for match in recorrido(re.finditer(patron, recorrido(texto_cv.lower()))):
+            valor = match.group(1)
+            años.append(AÑO_REFERENCIA - int(valor) if len(valor) == 4 else int(valor))
+    # utils.analizar_formacion
+    texto = recorrido(texto_cv.lower())
+    grados = {grado: len(recorrido(re.findall(patron, texto))) for grado, patron in PATRONES_GRADOS_CV.items()}
+    instituciones = len(recorrido(re.findall(PATRON_INSTITUCIONES_CV, texto)))
+    # NLPAnalyzer: años, grados y competencias
+    años_nlp = max((int(m.group(1)) for patron in PATRONES_AÑOS_ANTERIORES
+                    for m in recorrido(re.finditer(patron, texto_limpio))), default=0)
+    texto = recorrido(texto_limpio.lower())
+    grados_nlp = [grado for grado, patron in PATRONES_GRADOS.items() if recorrido(re.search(patron, texto))]
+    texto = recorrido(texto_limpio.lower())
+    competencias = {tipo: [m.group() for m in recorrido(re.finditer(patron, texto))]
+                    for tipo, patron in PATRONES_COMPETENCIAS.items()}
+    return ({"años": max(años, default=0), "grados": grados, "instituciones": instituciones},
+            {"años": años_nlp, "grados": grados_nlp, "competencias": competencias})
+
+def con_banco(texto_cv, texto_limpio):
+    """Método actual: una expresión por categoría sobre el texto ya en minúsculas."""
+    return menciones_cv(texto_cv.lower()), menciones_nlp(texto_limpio)
+
+# Recorridos de con_banco: una conversión a minúsculas y una búsqueda por categoría
+RECORRIDOS_BANCO = 1 + len(PATRONES_AÑOS_CV) + len(PATRONES_GRADOS_CV) + 1 + len(PATRONES_AÑOS) + \
+    len(PATRONES_GRADOS) + len(PATRONES_COMPETENCIAS)
+
+def alternancia_unica(patrones):
+    """
+    Compila todos los patrones en una sola alternancia de búsquedas
+    anticipadas con un grupo con nombre por patrón (un recorrido por texto).
+    """
+    sin_valor = [patron.replace("(?P<valor>", "(") for patron in patrones]
+    return re.compile("|".join(f"(?=(?P<p{i}>{patron}))" for i, patron in enumerate(sin_valor)))
+
+ALTERNANCIA_CV = alternancia_unica(PATRONES_AÑOS_CV + list(PATRONES_GRADOS_CV.values()) + [PATRON_INSTITUCIONES_CV])
+ALTERNANCIA_NLP = alternancia_unica(PATRONES_AÑOS + list(PATRONES_GRADOS.values()) +
+                                    list(PATRONES_COMPETENCIAS.values()))
+
+def con_alternancia(texto_cv, texto_limpio):
+    """Una sola alternancia por texto (solo para medir; no agrega los resultados)."""
+    return list(ALTERNANCIA_CV.finditer(texto_cv.lower())), list(ALTERNANCIA_NLP.finditer(texto_limpio))
+
+def medir(funcion, repeticiones):
+    """Devuelve los milisegundos promedio por llamada."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--oraciones", type=int, nargs="+", default=[60, 600, 6000])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    recorrido = Recorridos()
+    for oraciones in args.oraciones:
+        texto = generar_cv(oraciones, oraciones)
+        texto_limpio = limpiar_texto(texto)
+        recorrido.total = 0
+        antes_resultado = por_patron(texto, texto_limpio, recorrido)
+        recorridos = recorrido.total
+        if antes_resultado != con_banco(texto, texto_limpio):
+            print(f"{len(texto):>9} caracteres: ¡resultados distintos!")
+        antes = medir(lambda: por_patron(texto, texto_limpio, recorrido), args.repeticiones)
+        despues = medir(lambda: con_banco(texto, texto_limpio), args.repeticiones)
+        unica = medir(lambda: con_alternancia(texto, texto_limpio), args.repeticiones)
+        print(f"{len(texto):>9} caracteres: por variante {antes:7.2f} ms ({recorridos} recorridos) | "
+              f"banco {despues:7.2f} ms ({RECORRIDOS_BANCO} recorridos, {antes / despues:.1f}x) | "
+              f"alternancia única {unica:7.2f} ms (3 recorridos)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Benchmark por etapas de la evaluación completa sobre un corpus sintético.
+
+Genera (o reutiliza) PDFs de CVs judiciales sintéticos y su lista .xlsx, y
+mide sin red cada etapa: carga del Excel, extracción de texto, conteo de
+palabras clave, NLPAnalyzer.analizar_texto, características, puntaje y
+escritura de resultados. Informa rendimiento, latencias p50/p95 y memoria
+pico, y compara contra una línea base guardada para detectar regresiones.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--candidatos N] [--muestra-nlp M]
+        [--guardar-baseline] [--baseline RUTA] [--tolerancia 0.2]
+
+Termina con código 1 si alguna etapa empeora más que la tolerancia.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import generar_corpus
+from src.config import ESCRITURA_LOTE
+from src.nlp_analyzer import VARIABLE_OFFLINE
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(DIRECTORIO, "resultados", "baseline_pipeline.json")
+
+def rss_pico_mb():
+    """Memoria residente máxima del proceso hasta ahora, en MB (None si no se puede medir)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def resumir(cantidad, segundos, latencias, unidad="candidato"):
+    """Construye las métricas de una etapa."""
+    latencias = np.asarray(latencias) * 1000
+    return {
+        "unidad": unidad,
+        "n": cantidad,
+        "segundos": segundos,
+        "por_segundo": cantidad / segundos if segundos else float("inf"),
+        "p50_ms": float(np.percentile(latencias, 50)) if len(latencias) else None,
+        "p95_ms": float(np.percentile(latencias, 95)) if len(latencias) else None,
+        "rss_pico_mb": rss_pico_mb()
+    }
+
+def medir_por_elemento(entradas, funcion):
+    """Aplica la función a cada entrada y devuelve (salidas, métricas)."""
+    salidas, latencias = [], []
+    inicio = time.perf_counter()
+    for entrada in entradas:
+        t = time.perf_counter()
+        salidas.append(funcion(entrada))
+        latencias.append(time.perf_counter() - t)
+    return salidas, resumir(len(entradas), time.perf_counter() - inicio, latencias)
+
+def ejecutar(args):
+    """Ejecuta todas las etapas y devuelve las métricas por etapa."""
+    # Las etapas no deben intentar descargar modelos ni recursos
+    os.environ[VARIABLE_OFFLINE] = "1"
+
+    from src.extraccion import extraer_texto
+    from src.palabras_clave import contar_palabras_clave
+    from src.evaluador import _caracterizar_candidato, puntuar_seccion
+    from src.nlp_analyzer import obtener_analizador
+    from src.salida import abrir_escritor
+
+    directorio_corpus = args.corpus or os.path.join(tempfile.gettempdir(), f"evaluador_corpus_{args.candidatos}")
+    inicio = time.perf_counter()
+    rutas = generar_corpus(directorio_corpus, args.candidatos, args.oraciones)
+    print(f"Corpus: {directorio_corpus} ({time.perf_counter() - inicio:.1f}s para generarlo o validarlo)")
+
+    etapas = {}
+
+    inicio = time.perf_counter()
+    df = pd.read_excel(rutas["lista"])
+    segundos = time.perf_counter() - inicio
+    etapas["carga_excel"] = resumir(len(df), segundos, [segundos], unidad="archivo")
+
+    archivos = [os.path.join(rutas["pdfs"], os.path.basename(url)) for url in df["URL"]]
+    textos, etapas["extraccion"] = medir_por_elemento(archivos, lambda ruta: extraer_texto(ruta)["texto"])
+    textos = [texto.lower() for texto in textos]
+
+    conteos, etapas["palabras_clave"] = medir_por_elemento(textos, contar_palabras_clave)
+
+    muestra = textos[:args.muestra_nlp] if args.muestra_nlp else textos
+    try:
+        analizador = obtener_analizador()
+    except (OSError, LookupError) as e:
+        print(f"Etapa NLP omitida: {e}")
+        return etapas
+    resultados_nlp, etapas["nlp"] = medir_por_elemento(muestra, analizador.analizar_texto)
+
+    def caracterizar(i):
+        tarea = {"poder": df["Poder"].iloc[i], "nombre": df["Nombre"].iloc[i], "url": df["URL"].iloc[i]}
+        candidato = {
+            "texto": textos[i],
+            "conteos": conteos[i],
+            "redes_detectadas": False,
+            "conteo_positivas": conteos[i]["palabras_positivas"],
+            "conteo_riesgos": conteos[i]["palabras_riesgo"] + 1
+        }
+        return _caracterizar_candidato(tarea, candidato, resultados_nlp[i])
+
+    filas, etapas["caracteristicas"] = medir_por_elemento(range(len(muestra)), caracterizar)
+
+    # Puntaje y escritura se miden sobre todos los candidatos; si el NLP se
+    # limitó a una muestra, sus características se repiten
+    filas = [filas[i % len(filas)] for i in range(len(textos))]
+    inicio = time.perf_counter()
+    df_resultados = puntuar_seccion(filas)
+    segundos = time.perf_counter() - inicio
+    etapas["puntaje"] = resumir(len(filas), segundos, [segundos], unidad="sección")
+
+    registros = df_resultados.to_dict("records")
+    lotes = [registros[i:i + ESCRITURA_LOTE] for i in range(0, len(registros), ESCRITURA_LOTE)]
+    with tempfile.TemporaryDirectory() as carpeta:
+        # El total incluye el cierre, donde los escritores vuelcan lo pendiente
+        inicio = time.perf_counter()
+        with abrir_escritor(os.path.join(carpeta, "resultados"), args.formato) as escritor:
+            _, metricas = medir_por_elemento(lotes, escritor.escribir_filas)
+        segundos = time.perf_counter() - inicio
+    metricas.update(unidad="lote", n=len(registros), segundos=segundos, por_segundo=len(registros) / segundos)
+    etapas["escritura"] = metricas
+
+    return etapas
+
+def comparar(reporte, baseline, tolerancia):
+    """
+    Compara las métricas de una ejecución con la línea base.
+
+    Args:
+        reporte (dict): Métricas de la ejecución actual
+        baseline (dict): Métricas guardadas con --guardar-baseline
+        tolerancia (float): Empeoramiento relativo admitido
+
+    Returns:
+        list: Descripción de cada regresión encontrada
+    """
+    regresiones = []
+    for nombre, actual in reporte["etapas"].items():
+        base = baseline.get("etapas", {}).get(nombre)
+        if base is None:
+            continue
+        if actual["por_segundo"] < base["por_segundo"] * (1 - tolerancia):
+            regresiones.append(f"{nombre}: rendimiento {actual['por_segundo']:.1f}/s "
+                               f"(línea base {base['por_segundo']:.1f}/s)")
+        # En las etapas de un solo lote el p95 es el total, que ya se compara como rendimiento
+        por_lote = actual["unidad"] in ("archivo", "sección")
+        if not por_lote and actual["p95_ms"] and base.get("p95_ms") and actual["p95_ms"] > base["p95_ms"] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: p95 {actual['p95_ms']:.2f} ms (línea base {base['p95_ms']:.2f} ms)")
+    rss, rss_base = reporte["rss_pico_mb"], baseline.get("rss_pico_mb")
+    if rss and rss_base and rss > rss_base * (1 + tolerancia):
+        regresiones.append(f"memoria pico {rss:.0f} MB (línea base {rss_base:.0f} MB)")
+    return regresiones
+
+def imprimir(etapas, baseline):
+    """Muestra la tabla de resultados, con la variación respecto a la línea base."""
+    print(f"\n{'Etapa':<17}{'n':>8}{'Seg.':>9}{'Por seg.':>11}{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>8}  vs. base")
+    for nombre, m in etapas.items():
+        base = baseline.get("etapas", {}).get(nombre) if baseline else None
+        variacion = f"{m['por_segundo'] / base['por_segundo'] - 1:+.0%}" if base else "-"
+        p50 = f"{m['p50_ms']:.2f}" if m["p50_ms"] is not None else "-"
+        p95 = f"{m['p95_ms']:.2f}" if m["p95_ms"] is not None else "-"
+        rss = f"{m['rss_pico_mb']:.0f}" if m["rss_pico_mb"] is not None else "-"
+        print(f"{nombre:<17}{m['n']:>8}{m['segundos']:>9.2f}{m['por_segundo']:>11.1f}{p50:>9}{p95:>9}{rss:>8}  {variacion}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidatos", type=int, default=100, help="Tamaño del corpus (100 a 50000)")
+    parser.add_argument("--oraciones", type=int, default=60, help="Oraciones por CV")
+    parser.add_argument("--muestra-nlp", type=int, default=None,
+                        help="Candidatos analizados con spaCy (por defecto todos)")
+    parser.add_argument("--formato", default="csv", choices=["csv", "jsonl", "parquet"])
+    parser.add_argument("--corpus", default=None, help="Carpeta del corpus (se reutiliza entre ejecuciones)")
+    parser.add_argument("--baseline", default=BASELINE, help="Archivo JSON de la línea base")
+    parser.add_argument("--guardar-baseline", action="store_true", help="Guarda esta ejecución como línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento relativo admitido")
+    parser.add_argument("--salida", default=None, help="Guarda las métricas de esta ejecución en JSON")
+    args = parser.parse_args()
+
+    etapas = ejecutar(args)
+    reporte = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "candidatos": args.candidatos,
+        "oraciones": args.oraciones,
+        "muestra_nlp": args.muestra_nlp,
+        "rss_pico_mb": rss_pico_mb(),
+        "etapas": etapas
+    }
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.guardar_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("candidatos") != args.candidatos:
+            print(f"Aviso: la línea base usa {baseline.get('candidatos')} candidatos")
+
+    imprimir(etapas, baseline)
+    print(f"\nMemoria pico del proceso: {reporte['rss_pico_mb'] or 0:.0f} MB")
+
+    for ruta in [args.salida] + ([args.baseline] if args.guardar_baseline else []):
+        if ruta:
+            os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump(reporte, f, ensure_ascii=False, indent=2)
+            print(f"Métricas guardadas en {ruta}")
+
+    if baseline:
+        regresiones = comparar(reporte, baseline, args.tolerancia)
+        if regresiones:
+            print(f"\nRegresiones (tolerancia {args.tolerancia:.0%}):")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            sys.exit(1)
+        print(f"\nSin regresiones respecto a {args.baseline} (tolerancia {args.tolerancia:.0%})")
+
+if __name__ == "__main__":
+    main()
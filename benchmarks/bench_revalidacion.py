@@ -0,0 +1,90 @@
+"""
+Benchmark de la revalidación condicional de PDFs contra un servidor HTTP local.
+
+Descarga un corpus, lo revalida sin cambios (el servidor debe responder 304
+y no enviar contenido), modifica algunos archivos en el servidor y vuelve a
+revalidar: solo esos deben transferirse y cambiar de hash en el índice.
+
+Uso:
+    python benchmarks/bench_revalidacion.py [--archivos N] [--cambios K] [--tamano BYTES]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.servidor_local import ServidorLocal
+from src.descargas import DescargadorPDF
+from src.evaluador import revalidar_pdfs
+from src.indice_pdfs import IndicePDF
+
+def crear_fixtures(carpeta, cantidad, tamano):
+    """Crea archivos PDF de relleno del tamaño indicado."""
+    nombres = []
+    for i in range(cantidad):
+        nombre = f"cv_{i}.pdf"
+        with open(os.path.join(carpeta, nombre), "wb") as f:
+            f.write(b"%PDF-1.4\n" + os.urandom(tamano))
+        nombres.append(nombre)
+    return nombres
+
+def medir(servidor, funcion):
+    """Ejecuta una fase y devuelve (segundos, respuestas, bytes) que provocó en el servidor."""
+    respuestas = servidor.respuestas
+    enviados = servidor.bytes_enviados
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    delta = {codigo: n - respuestas.get(codigo, 0) for codigo, n in servidor.respuestas.items()}
+    return segundos, {c: n for c, n in delta.items() if n}, servidor.bytes_enviados - enviados
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--archivos", type=int, default=100)
+    parser.add_argument("--cambios", type=int, default=5, help="Archivos modificados en el servidor")
+    parser.add_argument("--tamano", type=int, default=200_000, help="Bytes por archivo")
+    parser.add_argument("--latencia", type=float, default=0.01, help="Segundos por petición")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as origen, tempfile.TemporaryDirectory() as destino:
+        nombres = crear_fixtures(origen, args.archivos, args.tamano)
+        indice = IndicePDF(os.path.join(destino, "indice.json"))
+        descargador = DescargadorPDF(backoff=0.05)
+
+        with ServidorLocal(origen, latencia=args.latencia) as servidor:
+            urls = [servidor.url(n) for n in nombres]
+
+            def descarga_inicial():
+                tareas = [(url, os.path.join(destino, n)) for url, n in zip(urls, nombres)]
+                for (url, ruta), resultado in zip(tareas, descargador.descargar_todos(tareas)):
+                    indice.registrar(url, ruta, validadores=resultado)
+
+            fases = [("descarga inicial", medir(servidor, descarga_inicial))]
+            hashes = {url: indice.buscar(url)["hash"] for url in urls}
+
+            fases.append(("revalidación sin cambios",
+                          medir(servidor, lambda: revalidar_pdfs(urls, 0, indice, descargador))))
+
+            # Cambiar algunos archivos en el servidor (el mtime cambia con la escritura)
+            for nombre in nombres[:args.cambios]:
+                with open(os.path.join(origen, nombre), "wb") as f:
+                    f.write(b"%PDF-1.4\n" + os.urandom(args.tamano))
+            fases.append((f"revalidación con {args.cambios} cambios",
+                          medir(servidor, lambda: revalidar_pdfs(urls, 0, indice, descargador))))
+
+            fases.append(("sin revalidar (max_edad)",
+                          medir(servidor, lambda: revalidar_pdfs(urls, 3600, indice, descargador))))
+
+        cambiados = sum(indice.buscar(url)["hash"] != hashes[url] for url in urls)
+
+    print(f"{'Fase':<32}{'Segundos':>10}{'MB enviados':>14}  Respuestas")
+    for nombre, (segundos, respuestas, enviados) in fases:
+        print(f"{nombre:<32}{segundos:>10.2f}{enviados / 1e6:>14.2f}  {respuestas}")
+    print(f"\nPDFs con hash nuevo en el índice: {cambiados} (esperados {args.cambios})")
+
+if __name__ == "__main__":
+    main()
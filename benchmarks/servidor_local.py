@@ -0,0 +1,145 @@
+"""
+Servidor HTTP local que sustituye al servidor del INE en los benchmarks.
+Sirve los PDFs de una carpeta, admite cabeceras Range y peticiones
+condicionales (ETag / Last-Modified, con respuestas 304) y puede simular
+latencia y fallos transitorios.
+"""
+
+import os
+import time
+import threading
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+class ManejadorPDF(SimpleHTTPRequestHandler):
+    latencia = 0.0
+    fallos_por_archivo = 0
+
+    def __init__(self, *args, estado=None, **kwargs):
+        self.estado = estado
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _registrar(self, codigo, enviados=0):
+        """Cuenta las respuestas y los bytes de contenido enviados."""
+        with self.estado["lock"]:
+            self.estado["respuestas"][codigo] += 1
+            self.estado["bytes"] += enviados
+
+    def _no_modificado(self, etag, mtime):
+        """Evalúa If-None-Match / If-Modified-Since."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [v.strip() for v in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def do_GET(self):
+        ruta = self.translate_path(self.path)
+        if not os.path.isfile(ruta):
+            self.send_error(404)
+            return
+
+        time.sleep(self.latencia)
+
+        # Fallos transitorios: las primeras N peticiones por archivo devuelven 503
+        with self.estado["lock"]:
+            intentos = self.estado["intentos"].get(self.path, 0)
+            self.estado["intentos"][self.path] = intentos + 1
+        if intentos < self.fallos_por_archivo:
+            self._registrar(503)
+            self.send_error(503)
+            return
+
+        estado_archivo = os.stat(ruta)
+        etag = f'"{estado_archivo.st_size:x}-{estado_archivo.st_mtime_ns:x}"'
+        ultima_modificacion = formatdate(estado_archivo.st_mtime, usegmt=True)
+
+        if self._no_modificado(etag, estado_archivo.st_mtime):
+            self._registrar(304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", ultima_modificacion)
+            self.end_headers()
+            return
+
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+
+        inicio = 0
+        rango = self.headers.get("Range")
+        # If-Range: el rango solo se respeta si el archivo no cambió
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range not in (etag, ultima_modificacion):
+            rango = None
+        if rango and rango.startswith("bytes="):
+            inicio = int(rango[len("bytes="):].split("-")[0] or 0)
+            if inicio >= len(contenido):
+                self._registrar(416)
+                self.send_error(416)
+                return
+            self._registrar(206, len(contenido) - inicio)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {inicio}-{len(contenido) - 1}/{len(contenido)}")
+        else:
+            self._registrar(200, len(contenido))
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", ultima_modificacion)
+        self.send_header("Content-Length", str(len(contenido) - inicio))
+        self.end_headers()
+        self.wfile.write(contenido[inicio:])
+
+class ServidorLocal:
+    """
+    Servidor en segundo plano para usar como contexto:
+
+        with ServidorLocal(carpeta) as servidor:
+            url = servidor.url("cv_1.pdf")
+    """
+
+    def __init__(self, carpeta, latencia=0.0, fallos_por_archivo=0):
+        self.estado = {"lock": threading.Lock(), "intentos": {}, "respuestas": Counter(), "bytes": 0}
+        manejador = type("Manejador", (ManejadorPDF,), {
+            "latencia": latencia,
+            "fallos_por_archivo": fallos_por_archivo
+        })
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            partial(manejador, directory=carpeta, estado=self.estado)
+        )
+        self.hilo = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def respuestas(self):
+        """Número de respuestas enviadas por código HTTP."""
+        return dict(self.estado["respuestas"])
+
+    @property
+    def bytes_enviados(self):
+        """Bytes de contenido enviados en respuestas 200/206."""
+        return self.estado["bytes"]
+
+    def url(self, nombre_archivo):
+        """Devuelve la URL local de un archivo servido."""
+        host, puerto = self.httpd.server_address
+        return f"http://{host}:{puerto}/{nombre_archivo}"
+
+    def __enter__(self):
+        self.hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,166 @@
+"""
+Generador de texto sintético de CVs judiciales para los benchmarks.
+Produce textos en español con la misma mezcla de vocabulario que usan
+las listas de palabras clave de src/config.py, y corpus completos de PDFs
+con su lista .xlsx.
+"""
+
+import os
+import json
+import random
+import textwrap
+
+NOMBRES = ["María", "José", "Juan", "Guadalupe", "Francisco", "Alejandra", "Luis", "Verónica"]
+APELLIDOS = ["Hernández", "García", "Martínez", "López", "González", "Pérez", "Rodríguez", "Sánchez"]
+
+FRASES = [
+    "Desde el año {anio} me desempeño como juez de distrito en materia penal.",
+    "Cuento con {n} años de experiencia en la impartición de justicia.",
+    "Fui secretario de estudio y cuenta en el tribunal colegiado de circuito.",
+    "Magistrado de la sala regional con {n} años en el cargo.",
+    "Elaboré más de {m} sentencias y resoluciones en juicios de amparo.",
+    "Profesor titular de la asignatura de derecho constitucional en la Universidad Nacional.",
+    "Doctorado en derecho por el Instituto de Investigaciones Jurídicas.",
+    "Maestría en derechos humanos con perspectiva de género.",
+    "Licenciatura en derecho por la Escuela Libre de Derecho.",
+    "Autor del libro sobre control de convencionalidad y de un artículo en revista indexada.",
+    "Ponencia en el congreso nacional sobre independencia judicial y debido proceso.",
+    "Coordinador del programa de capacitación judicial y formación continua.",
+    "Director del proyecto de transparencia judicial y estadística judicial.",
+    "Participé en la evaluación y seguimiento de protocolos de acceso a la justicia.",
+    "Fui asesor legislativo y secretario particular de un diputado local.",
+    "Militante de un partido político durante la campaña electoral.",
+    "Perfil en linkedin y twitter para difusión de actividades académicas.",
+    "Logro obtenido: reconocimiento a la excelencia judicial.",
+    "Especialidad en argumentación jurídica y razonamiento jurídico.",
+    "Investigador en análisis de jurisprudencia y técnica jurisdiccional.",
+]
+
+def generar_nombre(rng):
+    """Genera un nombre completo aleatorio."""
+    return f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+
+def generar_cv(semilla=0, num_oraciones=60):
+    """
+    Genera el texto de un CV sintético.
+    
+    Args:
+        semilla (int): Semilla para que el texto sea reproducible
+        num_oraciones (int): Número de oraciones del CV
+        
+    Returns:
+        str: Texto del CV
+    """
+    rng = random.Random(semilla)
+    oraciones = [f"Currículum de {generar_nombre(rng)}."]
+    for _ in range(num_oraciones):
+        frase = rng.choice(FRASES)
+        oraciones.append(frase.format(
+            anio=rng.randint(1990, 2020),
+            n=rng.randint(1, 25),
+            m=rng.randint(50, 900)
+        ))
+    return " ".join(oraciones)
+
+def generar_cvs(cantidad, num_oraciones=60, semilla=0):
+    """Genera una lista de textos de CV sintéticos reproducibles."""
+    return [generar_cv(semilla + i, num_oraciones) for i in range(cantidad)]
+
+def escribir_pdf(ruta, texto, caracteres_por_linea=95, lineas_por_pagina=60):
+    """
+    Escribe un PDF mínimo con el texto dado, sin dependencias externas.
+    Usa la fuente Helvetica con codificación WinAnsi, así que los acentos
+    del español se extraen correctamente.
+    
+    Args:
+        ruta (str): Ruta del PDF a crear
+        texto (str): Texto del documento
+        caracteres_por_linea (int): Ancho máximo de cada línea
+        lineas_por_pagina (int): Líneas por página
+    """
+    lineas = textwrap.wrap(texto, caracteres_por_linea) or [""]
+    paginas = [lineas[i:i + lineas_por_pagina] for i in range(0, len(lineas), lineas_por_pagina)]
+
+    def escapar(linea):
+        linea = linea.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        return linea.encode("cp1252", errors="replace")
+
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Árbol de páginas, se completa al final
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+    ids_paginas = []
+    for pagina in paginas:
+        contenido = b"BT /F1 9 Tf 12 TL 40 760 Td " + b" T* ".join(
+            b"(" + escapar(linea) + b") Tj" for linea in pagina
+        ) + b" ET"
+        objetos.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(contenido), contenido))
+        objetos.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objetos))
+        )
+        ids_paginas.append(len(objetos))
+    objetos[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in ids_paginas), len(ids_paginas)
+    )
+
+    salida = bytearray(b"%PDF-1.4\n")
+    posiciones = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posiciones.append(len(salida))
+        salida += b"%d 0 obj\n%s\nendobj\n" % (numero, objeto)
+    inicio_xref = len(salida)
+    salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    salida += b"".join(b"%010d 00000 n \n" % posicion for posicion in posiciones)
+    salida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, inicio_xref)
+
+    with open(ruta, "wb") as f:
+        f.write(salida)
+
+def generar_corpus(directorio, cantidad, num_oraciones=60, semilla=0, prefijo="Candidatos_JD"):
+    """
+    Genera un corpus sintético: un PDF por candidato y la lista .xlsx que
+    apunta a ellos, con el mismo formato que los archivos del INE. Si el
+    directorio ya tiene un corpus con los mismos parámetros, se reutiliza.
+    
+    Args:
+        directorio (str): Carpeta de salida; se crean `pdfs/` y `raw/` dentro
+        cantidad (int): Número de candidatos
+        num_oraciones (int): Oraciones por CV
+        semilla (int): Semilla del primer CV
+        prefijo (str): Prefijo del archivo .xlsx
+        
+    Returns:
+        dict: Rutas 'pdfs', 'raw' y 'lista' (archivo .xlsx)
+    """
+    import pandas as pd
+    
+    rutas = {
+        "pdfs": os.path.join(directorio, "pdfs"),
+        "raw": os.path.join(directorio, "raw"),
+        "lista": os.path.join(directorio, "raw", f"{prefijo}_01-01-2025.xlsx")
+    }
+    parametros = {"cantidad": cantidad, "num_oraciones": num_oraciones, "semilla": semilla}
+    marca = os.path.join(directorio, "corpus.json")
+    if os.path.exists(marca) and os.path.exists(rutas["lista"]):
+        with open(marca, "r", encoding="utf-8") as f:
+            if json.load(f) == parametros:
+                return rutas
+    
+    os.makedirs(rutas["pdfs"], exist_ok=True)
+    os.makedirs(rutas["raw"], exist_ok=True)
+    filas = []
+    for i in range(cantidad):
+        nombre_pdf = f"cv_{i:05d}.pdf"
+        escribir_pdf(os.path.join(rutas["pdfs"], nombre_pdf), generar_cv(semilla + i, num_oraciones))
+        filas.append({
+            "Poder": random.Random(semilla + i).choice(["Judicial", "Ejecutivo", "Legislativo"]),
+            "Nombre": generar_nombre(random.Random(-(semilla + i) - 1)) + f" {i}",
+            "URL": f"http://127.0.0.1/cvs/{nombre_pdf}"
+        })
+    pd.DataFrame(filas).to_excel(rutas["lista"], index=False)
+    
+    with open(marca, "w", encoding="utf-8") as f:
+        json.dump(parametros, f)
+    return rutas
@@ -1,14 +1,22 @@
 import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import requests
-from PyPDF2 import PdfReader
-import io
 import re
 from datetime import datetime
 import unicodedata
 import logging
-from src.utils import configurar_logging, crear_estructura_directorios
-from src.evaluador import procesar_seccion # Importar solo procesar_seccion
+from src.utils import configurar_logging, crear_estructura_directorios, hash_archivo
+from src.evaluador import procesar_seccion, evaluar_seccion, ubicar_pdf
+from src.evaluador import analizar_experiencia as analizar_experiencia_cv
+from src.cache_texto import obtener_cache_texto
+from src.descargas import obtener_descargador
+from src.indice_pdfs import obtener_indice_pdfs
+from src.palabras_clave import contar_palabras_clave
+from src.puntaje import puntuar_caracteristicas
+from src.salida import leer_resultados
+from src.nlp_analyzer import inicializar_worker, VARIABLE_OFFLINE
+from src.metricas import obtener_metricas
 from src.config import (
     archivos_entrada, 
     archivos_salida, 
@@ -18,9 +26,20 @@ from src.config import (
     PROCESSED_DATA_DIR,
     PDF_DIR,
     RESULTS_DIR,
-    LOGS_DIR
+    LOGS_DIR,
+    FORMATO_RESULTADOS,
+    EXPORTAR_EXCEL,
+    LOG_NIVEL,
+    METRICAS_ARCHIVO,
+    METRICAS_PROMETHEUS,
+    PERFIL_ANALISIS,
+    PERFILES_PUNTAJE,
+    PERFIL_PUNTAJE
 ) # Importar configuraciones necesarias
 
+# Nivel de formación numérico de los resultados de analizar_experiencia
+NIVELES_FORMACION = {"ninguno": 0, "especialidad": 0, "licenciatura": 1, "maestría": 2, "doctorado": 3}
+
 def slugify(value, allow_unicode=False):
     """
     Convierte una cadena a un formato amigable para URL/nombre de archivo.
@@ -91,77 +110,30 @@ def descargar_pdf(url, nombre_candidato):
     Descarga un PDF desde una URL, lo guarda y extrae su texto.
     Si el PDF ya existe localmente, lo lee en lugar de descargarlo.
     
+    Usa las mismas descargas, índice de PDFs y caché de texto que
+    evaluar_seccion.
+    
     Args:
         url (str): URL del PDF
-        nombre_candidato (str): Nombre del candidato para el archivo
+        nombre_candidato (str): Nombre del candidato, con el que se registra en el índice
         
     Returns:
         str: Texto extraído del PDF, o None si falla.
     """
-    # Crear carpeta para PDFs si no existe
-    carpeta_pdfs = os.path.join('data', 'pdfs')
-    os.makedirs(carpeta_pdfs, exist_ok=True)
-    
-    # Generar nombre de archivo limpio y ruta potencial
-    nombre_archivo_limpio = slugify(nombre_candidato)
-    if not nombre_archivo_limpio:
-        # Usar un nombre genérico si el nombre del candidato está vacío después de slugify
-        nombre_archivo_limpio = "pdf_descargado"
-        
-    ruta_pdf_base = os.path.join(carpeta_pdfs, f"{nombre_archivo_limpio}.pdf")
-    ruta_pdf = ruta_pdf_base
-    contador = 1
-
-    # Verificar si el archivo ya existe (con o sin sufijo numérico de corridas anteriores)
-    # Buscamos el archivo que coincida con el nombre base o base_N
-    archivos_existentes = [f for f in os.listdir(carpeta_pdfs) if f.startswith(nombre_archivo_limpio) and f.endswith('.pdf')]
-    
-    if archivos_existentes:
-        # Si encontramos algún archivo que coincida, asumimos que es el descargado previamente
-        # Podríamos añadir lógica más sofisticada aquí si fuera necesario (ej. verificar URL dentro del PDF)
-        # Pero por ahora, tomamos el primero que coincida como el archivo ya descargado.
-        archivo_local_existente = os.path.join(carpeta_pdfs, archivos_existentes[0])
-        print(f"Archivo PDF encontrado localmente para {nombre_candidato}: {archivos_existentes[0]}. Leyendo...")
-        try:
-            with open(archivo_local_existente, 'rb') as f:
-                pdf_reader = PdfReader(f)
-                texto = ""
-                for pagina in pdf_reader.pages:
-                    texto += pagina.extract_text() or "" # Manejar páginas vacías
-            return texto
-        except Exception as e:
-            print(f"Error al leer el archivo PDF local {archivo_local_existente}: {str(e)}. Intentando descargar de nuevo...")
-            # Si falla la lectura del archivo local, intentamos descargar
-            pass # Continuar al bloque de descarga
-    
-    # Si el archivo no se encontró localmente o falló la lectura, descargar
-    print(f"Descargando PDF para {nombre_candidato} desde {url}")
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            # Determinar la ruta final del archivo manejando duplicados
-            # Esta parte asegura que si hay un archivo local (quizás de una corrida anterior
-            # que falló después de descargar pero antes de guardar correctamente), o si 
-            # se genera un duplicado en esta misma corrida, se maneje.
-            while os.path.exists(ruta_pdf):
-                 ruta_pdf = os.path.join(carpeta_pdfs, f"{nombre_archivo_limpio}_{contador}.pdf")
-                 contador += 1
-
-            with open(ruta_pdf, 'wb') as f:
-                f.write(response.content)
-            
-            print(f"PDF descargado y guardado como: {os.path.basename(ruta_pdf)}")
-
-            # Extraer texto del PDF recién descargado
-            pdf_reader = PdfReader(io.BytesIO(response.content))
-            texto = ""
-            for pagina in pdf_reader.pages:
-                texto += pagina.extract_text() or "" # Manejar páginas vacías
-            
-            return texto
-        else:
-            print(f"Error al descargar PDF para {nombre_candidato}: Código de estado {response.status_code}")
-            return None
+        indice = obtener_indice_pdfs()
+        archivo_pdf, hash_pdf = ubicar_pdf(url, indice)
+        validadores = None
+        if not os.path.exists(archivo_pdf):
+            resultado = obtener_descargador().descargar(url, archivo_pdf)
+            if not resultado["ok"]:
+                print(f"Error al descargar PDF para {nombre_candidato}: {resultado['error']}")
+                return None
+            validadores = {"etag": resultado["etag"], "last_modified": resultado["last_modified"]}
+            hash_pdf = None
+        hash_pdf = hash_pdf or hash_archivo(archivo_pdf)
+        indice.registrar(url, archivo_pdf, candidato=nombre_candidato, hash_pdf=hash_pdf, validadores=validadores)
+        return obtener_cache_texto().texto_pdf(archivo_pdf, hash_pdf)
     except Exception as e:
         print(f"Error durante la descarga o procesamiento del PDF para {nombre_candidato}: {str(e)}")
         return None
@@ -170,268 +142,237 @@ def analizar_experiencia(texto):
     """
     Analiza la experiencia del candidato en el texto del PDF.
     
+    Usa las mismas palabras clave y patrones que evaluar_seccion (perfil
+    "rapido", sin spaCy).
+    
     Args:
         texto (str): Texto extraído del PDF
         
     Returns:
         dict: Diccionario con los resultados del análisis
     """
-    resultados = {
-        'experiencia_judicial': 0,
-        'experiencia_docente': 0,
-        'experiencia_investigacion': 0,
-        'experiencia_administrativa': 0,
-        'años_experiencia': 0,
-        'formacion_academica': 0,
-        'instituciones_formacion': 0,
-        'palabras_positivas': 0,
-        'palabras_riesgo': 0
-    }
-    
-    # Palabras clave para cada tipo de experiencia
-    palabras_clave = {
-        'experiencia_judicial': ['juez', 'magistrado', 'tribunal', 'sentencia', 'juicio', 'poder judicial'],
-        'experiencia_docente': ['profesor', 'catedrático', 'docente', 'maestro', 'enseñanza', 'universidad', 'instituto'],
-        'experiencia_investigacion': ['investigador', 'investigación', 'publicación', 'artículo', 'estudio', 'tesis'],
-        'experiencia_administrativa': ['director', 'coordinador', 'administrativo', 'gestión', 'gerencia', 'secretario', 'jefe']
+    conteos = contar_palabras_clave(texto.lower())
+    exp = analizar_experiencia_cv(texto, conteos=conteos, perfil="rapido")
+    return {
+        'experiencia_judicial': exp['experiencia_judicial'],
+        'experiencia_docente': exp['experiencia_docente'],
+        'experiencia_investigacion': exp['experiencia_investigacion'],
+        'experiencia_administrativa': exp['experiencia_administrativa'],
+        'años_experiencia': exp['años_experiencia'],
+        'formacion_academica': NIVELES_FORMACION.get(exp['formacion']['nivel_maximo'], 0),
+        'instituciones_formacion': exp['formacion']['instituciones'],
+        'palabras_positivas': conteos['palabras_positivas'],
+        'palabras_riesgo': conteos['palabras_riesgo']
     }
-    
-    # Palabras positivas y de riesgo
-    palabras_positivas = ['excelente', 'destacado', 'reconocido', 'experto', 'especialista', 'trayectoria impecable', 'amplia experiencia']
-    palabras_riesgo = ['controversia', 'irregularidad', 'sanción', 'investigación penal', 'queja', 'denuncia', 'conflicto de interés']
-    
-    # Analizar texto
-    texto = texto.lower()
-    
-    # Contar ocurrencias de palabras clave (usando word boundaries más robustas)
-    for tipo, palabras in palabras_clave.items():
-        for palabra in palabras:
-            # Usar regex para encontrar la palabra completa, ignorando puntuación alrededor
-            resultados[tipo] += len(re.findall(r'[^\w]' + re.escape(palabra) + r'[^\w]', texto))
-    
-    # Contar palabras positivas y de riesgo (usando word boundaries más robustas)
-    for palabra in palabras_positivas:
-        resultados['palabras_positivas'] += len(re.findall(r'[^\w]' + re.escape(palabra) + r'[^\w]', texto))
-    
-    for palabra in palabras_riesgo:
-        resultados['palabras_riesgo'] += len(re.findall(r'[^\w]' + re.escape(palabra) + r'[^\w]', texto))
-
-    # Calcular años de experiencia (intentar ser más flexible)
-    años_encontrados = re.findall(r'(\d+)\s*(?:años|años de experiencia)', texto)
-    if años_encontrados:
-        resultados['años_experiencia'] = max(map(int, años_encontrados))
-
-    # Análisis básico de formación académica (ejemplo: buscar palabras clave como 'Licenciatura', 'Maestría', 'Doctorado')
-    if re.search(r'doctorado|dr\.', texto):
-        resultados['formacion_academica'] = 3 # Doctorado
-    elif re.search(r'maestría|mcía\.', texto):
-        resultados['formacion_academica'] = 2 # Maestría
-    elif re.search(r'licenciatura|lic\.', texto):
-        resultados['formacion_academica'] = 1 # Licenciatura
-
-    # Análisis básico de instituciones (ejemplo: buscar nombres de universidades conocidas, muy simplificado)
-    instituciones_conocidas = ['unam', 'itez', 'itam', 'colegio de mexico']
-    for inst in instituciones_conocidas:
-        if inst in texto:
-            resultados['instituciones_formacion'] += 1 # Contar cuántas instituciones conocidas se mencionan
-    
-    return resultados
 
 def calcular_puntaje(resultados):
     """
-    Calcula el puntaje total del candidato.
+    Calcula el puntaje total del candidato con el perfil de puntaje "ine".
     
     Args:
-        resultados (dict): Resultados del análisis
+        resultados (dict): Resultados de analizar_experiencia
         
     Returns:
         dict: Puntaje total y clasificación
     """
-    puntaje = 0
-    
-    # Ponderación de la experiencia (ajustando valores)
-    puntaje += min(resultados['experiencia_judicial'] * 6, 30) # Judicial más peso
-    puntaje += min(resultados['experiencia_docente'] * 3, 15)
-    puntaje += min(resultados['experiencia_investigacion'] * 4, 20) # Investigación más peso
-    puntaje += min(resultados['experiencia_administrativa'] * 2, 10)
-    
-    # Años de Experiencia (ajustando)
-    puntaje += min(resultados['años_experiencia'] * 2.5, 25) # Años de experiencia con más peso
-    
-    # Formación Académica (ponderación por nivel)
-    puntaje += resultados['formacion_academica'] * 5 # 5 puntos por nivel (Lic: 5, Maestría: 10, Doctorado: 15)
-    
-    # Instituciones de Formación (ponderación por conteo simple)
-    puntaje += min(resultados['instituciones_formacion'] * 3, 10) # Hasta 10 puntos por instituciones
+    niveles = {nivel: nombre for nombre, nivel in NIVELES_FORMACION.items() if nombre != "especialidad"}
+    caracteristicas = pd.DataFrame([{
+        "experiencia_judicial": resultados['experiencia_judicial'],
+        "experiencia_docente": resultados['experiencia_docente'],
+        "experiencia_investigacion": resultados['experiencia_investigacion'],
+        "experiencia_administrativa": resultados['experiencia_administrativa'],
+        "años_experiencia": resultados['años_experiencia'],
+        "nivel_formacion": niveles.get(resultados['formacion_academica'], "ninguno"),
+        "instituciones_formacion": resultados['instituciones_formacion'],
+        "conteo_positivas": resultados['palabras_positivas'],
+        "conteo_riesgos": resultados['palabras_riesgo'],
+        "calidad_texto": 0
+    }])
+    puntaje = puntuar_caracteristicas(caracteristicas, perfil_puntaje="ine").iloc[0]
+    return {
+        'puntaje_total': round(float(puntaje['Puntaje Total']), 2), # Redondear puntaje
+        'clasificacion': puntaje['Aptitud']
+    }
 
-    # Palabras Positivas (ajustando)
-    puntaje += min(resultados['palabras_positivas'] * 4, 15) # Más peso a palabras positivas
-    
-    # Penalización por Palabras de Riesgo (ajustando penalización)
-    puntaje -= resultados['palabras_riesgo'] * 5 # Mayor penalización por palabras de riesgo
+def _lista_candidatos(tipo_candidato, df):
+    """
+    Identifica las columnas de nombre y URL de un tipo de candidato.
     
-    # Asegurar que el puntaje no sea negativo
-    puntaje = max(0, puntaje)
+    Returns:
+        pd.DataFrame: Candidatos con las columnas 'Poder' (el tipo), 'Nombre'
+            y 'URL', como las que usa evaluar_seccion, o None si no se
+            pudieron identificar las columnas
+    """
+    columnas_disponibles = df.columns.tolist()
+    print(f"Columnas disponibles en {tipo_candidato}: {columnas_disponibles}")
+
+    # Intentar identificar las columnas de Nombre y URL de forma flexible
+    nombre_col = None
+    url_col = None
+
+    # Buscar columna de nombre
+    for col in columnas_disponibles:
+        if 'persona' in col.lower() or 'nombre' in col.lower():
+            nombre_col = col
+            break # Tomar la primera coincidencia
+
+    # Buscar columna de URL
+    for col in columnas_disponibles:
+        # Verificar si el nombre de la columna contiene 'url' o 'curriculum' o si alguna celda en las primeras filas contiene 'http'
+        if 'url' in col.lower() or 'curriculum' in col.lower() or (df[col].head().astype(str).str.startswith('http')).any():
+             url_col = col
+             break # Tomar la primera coincidencia
 
-    # Clasificación (ajustando umbrales)
-    if resultados['palabras_riesgo'] > 2:
-        clasificacion = "No Apto" # Más de 2 palabras de riesgo lo marca como No Apto
-    elif puntaje >= 80 and resultados['palabras_riesgo'] == 0:
-        clasificacion = "Apto"
-    elif puntaje >= 60 and resultados['palabras_riesgo'] <= 2:
-        clasificacion = "Observado"
-    else:
-        clasificacion = "No Apto"
+    if not nombre_col or not url_col:
+        print(f"Error: No se pudieron identificar las columnas 'Nombre' o 'URL' en {tipo_candidato}")
+        print(f"Columnas esperadas: una columna para el nombre (ej. 'Persona C') y una columna con URLs (ej. 'Curriculum' o similar)")
+        return None
+
+    print(f"Columna de Nombre identificada: '{nombre_col}'")
+    print(f"Columna de URL identificada: '{url_col}'")
     
-    return {
-        'puntaje_total': round(puntaje, 2), # Redondear puntaje
-        'clasificacion': clasificacion
-    }
+    # Mostrar primeros registros para verificar datos
+    print("\nPrimeros registros para verificación:")
+    print(df[[nombre_col, url_col]].head().to_string())
+    
+    return pd.DataFrame({'Poder': tipo_candidato, 'Nombre': df[nombre_col], 'URL': df[url_col]})
 
-def analizar_candidatos(datos):
+def analizar_candidatos(datos, formato=FORMATO_RESULTADOS, exportar_excel=EXPORTAR_EXCEL,
+                        perfil=PERFIL_ANALISIS, perfil_puntaje="ine", executor=None):
     """
     Analiza los datos de los candidatos y muestra un resumen.
     
+    Los candidatos se evalúan con el mismo núcleo que las secciones
+    (src.evaluador.evaluar_seccion): comparten descargas, caché de texto y
+    análisis, y se puntúan con el perfil de puntaje indicado. Cada resultado
+    se escribe en cuanto termina su candidato, de modo que una interrupción
+    conserva los resultados parciales.
+    
     Args:
         datos (dict): Diccionario con los datos de cada tipo de candidato
+        formato (str): Formato de resultados ("csv", "jsonl" o "parquet")
+        exportar_excel (bool): Exportar además a .xlsx al terminar
+        perfil (str): Perfil del análisis NLP
+        perfil_puntaje (str): Perfil de PERFILES_PUNTAJE en config
+        executor (ProcessPoolExecutor, opcional): Pool de procesos
+            inicializado con inicializar_worker
     """
     print("\n=== ANÁLISIS DE CANDIDATOS ===\n")
     
-    resultados_totales = []
-    
+    listas = []
     for tipo_candidato, df in datos.items():
         print(f"\nAnalizando {tipo_candidato}...")
-        
-        columnas_disponibles = df.columns.tolist()
-        print(f"Columnas disponibles en {tipo_candidato}: {columnas_disponibles}")
-
-        # Intentar identificar las columnas de Nombre y URL de forma flexible
-        nombre_col = None
-        url_col = None
-
-        # Buscar columna de nombre
-        for col in columnas_disponibles:
-            if 'persona' in col.lower() or 'nombre' in col.lower():
-                nombre_col = col
-                break # Tomar la primera coincidencia
-
-        # Buscar columna de URL
-        for col in columnas_disponibles:
-            # Verificar si el nombre de la columna contiene 'url' o 'curriculum' o si alguna celda en las primeras filas contiene 'http'
-            if 'url' in col.lower() or 'curriculum' in col.lower() or (df[col].head().astype(str).str.startswith('http')).any():
-                 url_col = col
-                 break # Tomar la primera coincidencia
-
-        if not nombre_col or not url_col:
-            print(f"Error: No se pudieron identificar las columnas 'Nombre' o 'URL' en {tipo_candidato}")
-            print(f"Columnas esperadas: una columna para el nombre (ej. 'Persona C') y una columna con URLs (ej. 'Curriculum' o similar)")
-            continue
-
-        print(f"Columna de Nombre identificada: '{nombre_col}'")
-        print(f"Columna de URL identificada: '{url_col}'")
-        
-        # Mostrar primeros registros para verificar datos
-        print("\nPrimeros registros para verificación:")
-        try:
-            print(df[[nombre_col, url_col]].head().to_string())
-        except KeyError as e:
-            print(f"Error al mostrar primeros registros: Columna no encontrada {e}. Columnas disponibles: {columnas_disponibles}")
-            continue
-        
-        total_candidatos_tipo = len(df)
-        candidatos_procesados_tipo = 0
-
-        for index, row in df.iterrows():
-            nombre = row.get(nombre_col, 'N/A')
-            url = row.get(url_col, '')
-            
-            # print(f"DEBUG: Procesando fila {index} - Nombre: {nombre}, URL: {url}") # Debug print
-
-            if not url or not isinstance(url, str) or not url.startswith('http'):
-                # print(f"Advertencia: URL inválida o faltante para el candidato {nombre} (fila {index}) - {url}")
-                continue
-            
-            # print(f"\nProcesando candidato: {nombre} de {tipo_candidato}")
-            # print(f"URL: {url}")
-            
-            # Descargar y analizar PDF
-            texto = descargar_pdf(url, nombre)
-            if texto:
-                # Analizar experiencia
-                resultados = analizar_experiencia(texto)
-                
-                # Calcular puntaje
-                puntaje = calcular_puntaje(resultados)
-                
-                # Agregar resultados
-                resultados_totales.append({
-                    'Tipo': tipo_candidato,
-                    'Nombre': nombre,
-                    'Puntaje Total': puntaje['puntaje_total'],
-                    'Clasificación': puntaje['clasificacion'],
-                    'Puntaje Experiencia Judicial': resultados['experiencia_judicial'] * 6, # Ajustar según la lógica de puntaje real si es diferente
-                    'Puntaje Experiencia Docente': resultados['experiencia_docente'] * 3, # Ajustar
-                    'Puntaje Experiencia Investigación': resultados['experiencia_investigacion'] * 4, # Ajustar
-                    'Puntaje Experiencia Administrativa': resultados['experiencia_administrativa'] * 2, # Ajustar
-                    'Puntaje Años de Experiencia': resultados['años_experiencia'] * 2.5, # Ajustar
-                    'Puntaje Formación Académica': resultados['formacion_academica'] * 5, # Ajustar
-                    'Puntaje Instituciones': resultados['instituciones_formacion'] * 3, # Ajustar
-                    'Puntaje Palabras Positivas': resultados['palabras_positivas'] * 4, # Ajustar
-                    'Puntaje Palabras Riesgo': resultados['palabras_riesgo'] * -5, # Ajustar
-                    'Conteo Palabras Riesgo': resultados['palabras_riesgo'],
-                    'Conteo Palabras Positivas': resultados['palabras_positivas'],
-                    'Palabras Riesgo': resultados['palabras_riesgo'] # Mantener columna original de conteo de riesgo
-                })
-                
-                print(f" -> {nombre}: Puntaje={puntaje['puntaje_total']}, Clasificación={puntaje['clasificacion']}")
-                candidatos_procesados_tipo += 1
-
-            else:
-                # print(f"Error: No se pudo procesar el PDF para {nombre} (fila {index})")
-                pass # Continuar con el siguiente candidato si falla la descarga o procesamiento del PDF
-
-        print(f"\nTerminado análisis de {tipo_candidato}. Candidatos procesados: {candidatos_procesados_tipo}/{total_candidatos_tipo}")
-
-    if not resultados_totales:
+        lista = _lista_candidatos(tipo_candidato, df)
+        if lista is not None:
+            listas.append(lista)
+    
+    resultados = pd.DataFrame()
+    if listas:
+        carpeta_resultados = os.path.join('data', 'resultados')
+        fecha = datetime.now().strftime('%Y%m%d_%H%M%S')
+        ruta = evaluar_seccion("INE", pd.concat(listas, ignore_index=True),
+                               os.path.join(carpeta_resultados, f'resultados_{fecha}'),
+                               executor=executor, formato=formato, exportar_excel=exportar_excel,
+                               perfil=perfil, perfil_puntaje=perfil_puntaje)
+        resultados = leer_resultados(ruta)
+    
+    if resultados.empty:
         print("\nNo se pudo analizar ningún candidato. Esto puede deberse a:")
         print("1. Los archivos Excel no tienen las columnas correctas para Nombre y URL.")
         print("2. Las URLs en los archivos no son válidas o no se pudo acceder a ellas.")
         print("3. No se pudo descargar o leer el contenido de los PDFs.")
         return
     
-    # Crear DataFrame con resultados
-    df_resultados = pd.DataFrame(resultados_totales)
-    
-    # Guardar resultados
-    carpeta_resultados = os.path.join('data', 'resultados')
-    os.makedirs(carpeta_resultados, exist_ok=True)
-    
-    fecha = datetime.now().strftime('%Y%m%d_%H%M%S')
-    archivo_resultados = os.path.join(carpeta_resultados, f'resultados_{fecha}.xlsx')
-    
-    try:
-        df_resultados.to_excel(archivo_resultados, index=False)
-        print(f"\n Resultados guardados exitosamente en: {archivo_resultados}")
-    except Exception as e:
-        print(f"Error al guardar el archivo de resultados {archivo_resultados}: {str(e)}")
-
+    print(f"\n Resultados guardados exitosamente en: {ruta}")
     
     # Mostrar resumen
     print("\n=== RESUMEN DE RESULTADOS ===")
-    print(f"\nTotal de candidatos analizados con éxito: {len(resultados_totales)}")
+    print(f"\nTotal de candidatos analizados con éxito: {len(resultados)}")
     
-    if len(resultados_totales) > 0:
-        print("\nClasificación por tipo:")
-        try:
-            print(df_resultados.groupby(['Tipo', 'Clasificación']).size().unstack(fill_value=0))
-        except KeyError as e:
-            print(f"Error al generar resumen por tipo: {e}")
-            print("Asegúrate de que la columna 'Tipo' y 'Clasificación' existan en los resultados.")
-    else:
-        print("No hay resultados para mostrar en el resumen.")
+    print("\nClasificación por tipo:")
+    # Con el perfil "ine" las columnas conservan sus nombres originales, Tipo y Clasificación
+    columnas = PERFILES_PUNTAJE[perfil_puntaje].get("columnas", {})
+    tipo, clasificacion = columnas.get("Poder", "Poder"), columnas.get("Aptitud", "Aptitud")
+    print(resultados.groupby([tipo, clasificacion]).size().unstack(fill_value=0))
+
+def parsear_argumentos(argv=None):
+    """Define y lee los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Evaluador de perfiles judiciales")
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Vacía la caché de texto extraído y vuelve a procesar todos los PDFs"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Solo evalúa candidatos nuevos o con cambios desde la última ejecución"
+    )
+    parser.add_argument(
+        "--reanudar", "--resume",
+        dest="reanudar",
+        action="store_true",
+        help="Continúa la ejecución interrumpida: no vuelve a evaluar a los candidatos ya completados"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Número de procesos para extraer y puntuar candidatos en paralelo (por defecto 1)"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="No descarga modelos ni recursos de NLP; falla de inmediato si falta alguno"
+    )
+    parser.add_argument(
+        "--formato",
+        choices=["csv", "jsonl", "parquet"],
+        default=FORMATO_RESULTADOS,
+        help=f"Formato de los archivos de resultados (por defecto {FORMATO_RESULTADOS})"
+    )
+    parser.add_argument(
+        "--sin-excel",
+        action="store_true",
+        help="No exporta los resultados a Excel al terminar cada sección"
+    )
+    parser.add_argument(
+        "--perfil",
+        choices=["rapido", "estandar", "completo"],
+        default=PERFIL_ANALISIS,
+        help=f"Perfil del análisis NLP de cada CV (por defecto {PERFIL_ANALISIS}); ver README"
+    )
+    parser.add_argument(
+        "--puntaje",
+        choices=list(PERFILES_PUNTAJE),
+        default=PERFIL_PUNTAJE,
+        help=f"Perfil de puntaje: pesos, topes y criterios de aptitud (por defecto {PERFIL_PUNTAJE}); ver README"
+    )
+    parser.add_argument(
+        "--log-nivel",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default=LOG_NIVEL,
+        help=f"Nivel de detalle del registro (por defecto {LOG_NIVEL}; DEBUG registra cada candidato)"
+    )
+    parser.add_argument(
+        "--metricas",
+        default=METRICAS_ARCHIVO,
+        help="Archivo JSON donde se guarda el reporte de tiempos y contadores por etapa"
+    )
+    parser.add_argument(
+        "--prometheus",
+        default=METRICAS_PROMETHEUS,
+        help="Archivo .prom donde se guardan las métricas en formato Prometheus (opcional)"
+    )
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     """Función principal para ejecutar el evaluador."""
+    args = parsear_argumentos(argv)
+    if args.offline:
+        # Variable de entorno para que también la hereden los procesos del pool
+        os.environ[VARIABLE_OFFLINE] = "1"
+    
     # Definir la estructura de directorios necesaria
     directorios = {
         RAW_DATA_DIR: "Datos sin procesar",
@@ -443,17 +384,50 @@ def main():
     
     crear_estructura_directorios(directorios) # Asegurar que los directorios existan
     log_file = os.path.join(LOG_DIR, "evaluador.log")
-    configurar_logging(log_file) # Configurar logging
+    configurar_logging(log_file, nivel=args.log_nivel) # Configurar logging
+    metricas = obtener_metricas()
+    metricas.reiniciar()
 
-    # Iterar sobre las secciones y procesar cada una
-    for seccion, archivo_entrada in archivos_entrada.items():
-        archivo_salida = archivos_salida.get(seccion)
-        if not archivo_salida:
-            print(f"Advertencia: No se encontró archivo de salida para la sección {seccion}")
-            continue
+    if args.rebuild_cache:
+        obtener_cache_texto().limpiar()
 
-        # Llamar a la función procesar_seccion para cada sección
-        procesar_seccion(seccion, os.path.join(BASE_DIR, archivo_entrada), os.path.join(BASE_DIR, archivo_salida), log_file)
+    # Un solo pool de procesos para todas las secciones: cada worker carga spaCy una vez
+    executor = None
+    if args.workers > 1:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=inicializar_worker,
+                                       initargs=(args.perfil,))
+
+    try:
+        # Iterar sobre las secciones y procesar cada una
+        for seccion, archivo_entrada in archivos_entrada.items():
+            archivo_salida = archivos_salida.get(seccion)
+            if not archivo_salida:
+                print(f"Advertencia: No se encontró archivo de salida para la sección {seccion}")
+                continue
+
+            # Llamar a la función procesar_seccion para cada sección
+            procesar_seccion(seccion, os.path.join(BASE_DIR, archivo_entrada), os.path.join(BASE_DIR, archivo_salida), log_file,
+                             incremental=args.incremental, executor=executor,
+                             formato=args.formato, exportar_excel=EXPORTAR_EXCEL and not args.sin_excel,
+                             perfil=args.perfil, reanudar=args.reanudar, perfil_puntaje=args.puntaje)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        guardar_metricas(metricas, args)
+
+def guardar_metricas(metricas, args):
+    """Guarda el reporte de métricas de la ejecución y registra su resumen."""
+    logging.info(f"Tiempo por etapa: {metricas.resumen()}")
+    try:
+        if args.metricas:
+            metricas.guardar_json(args.metricas, workers=args.workers, incremental=args.incremental,
+                                  reanudar=args.reanudar, formato=args.formato, perfil=args.perfil,
+                                  puntaje=args.puntaje)
+            logging.info(f"Reporte de métricas guardado en {args.metricas}")
+        if args.prometheus:
+            metricas.guardar_prometheus(args.prometheus)
+    except OSError as e:
+        logging.error(f"No se pudo guardar el reporte de métricas: {e}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,9 +6,14 @@ from .evaluador import (
     analizar_experiencia,
     calcular_puntaje,
     evaluar_aptitud,
-    procesar_seccion
+    evaluar_seccion,
+    procesar_seccion,
+    puntuar_seccion,
+    repuntuar_seccion
 )
 
+from .evaluador_async import evaluar_async
+
 from .utils import (
     extraer_años_experiencia,
     analizar_formacion,
@@ -0,0 +1,242 @@
+"""
+Almacén persistente de características por candidato.
+Guarda en Parquet, particionado por sección, todo lo que se extrae de cada
+CV (conteos de palabras clave, años, formación, entidades, competencias y
+sentimiento), de modo que el puntaje, la aptitud y los reportes se pueden
+recalcular sin volver a leer los PDFs ni ejecutar spaCy.
+
+Cada ejecución agrega un archivo nuevo a la partición de su sección; al leer
+se conserva la fila más reciente de cada candidato.
+"""
+
+import os
+import uuid
+import logging
+import tempfile
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from .config import ALMACEN_CARACTERISTICAS_DIR
+
+# Columnas del almacén, en orden: (nombre, tipo de Arrow)
+COLUMNAS = [
+    ("nombre", "string"),
+    ("poder", "string"),
+    ("url", "string"),
+    ("hash_pdf", "string"),
+    ("hash_config", "string"),
+    ("version", "string"),
+    ("fecha", "timestamp"),
+    ("redes_sociales", "bool"),
+    ("experiencia_judicial", "int64"),
+    ("experiencia_docente", "int64"),
+    ("experiencia_investigacion", "int64"),
+    ("experiencia_administrativa", "int64"),
+    ("años_experiencia", "float64"),
+    ("nivel_formacion", "string"),
+    ("instituciones_formacion", "int64"),
+    ("calidad_experiencia", "string"),
+    ("calidad_texto", "float64"),
+    ("palabras_positivas", "int64"),
+    ("palabras_riesgo", "int64"),
+    ("conteo_positivas", "int64"),
+    ("conteo_riesgos", "int64"),
+    ("organizaciones", "list"),
+    ("num_personas", "int64"),
+    ("num_lugares", "int64"),
+    ("num_fechas", "int64"),
+    ("competencias_tecnicas", "list"),
+    ("competencias_blandas", "list"),
+    ("competencias_idiomas", "list"),
+    ("sentimiento_compuesto", "float64"),
+    ("sentimiento_positivo", "float64"),
+    ("sentimiento_negativo", "float64"),
+    ("sentimiento_neutral", "float64")
+]
+
+def pyarrow_disponible():
+    """Indica si pyarrow está instalado."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _esquema():
+    """Construye el esquema de Arrow del almacén (sin la columna de partición)."""
+    import pyarrow as pa
+
+    tipos = {
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us"),
+        "bool": pa.bool_(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "list": pa.list_(pa.string())
+    }
+    return pa.schema([(nombre, tipos[tipo]) for nombre, tipo in COLUMNAS])
+
+def _normalizar(fila):
+    """Convierte los valores de una fila a los tipos del esquema."""
+    normalizada = {}
+    for nombre, tipo in COLUMNAS:
+        valor = fila.get(nombre)
+        if valor is None or (not isinstance(valor, (list, tuple)) and pd.isna(valor)):
+            valor = None
+        elif tipo == "string":
+            valor = str(valor)
+        elif tipo == "list":
+            valor = [str(v) for v in valor]
+        normalizada[nombre] = valor
+    return normalizada
+
+class AlmacenCaracteristicas:
+    def __init__(self, directorio=ALMACEN_CARACTERISTICAS_DIR):
+        """
+        Inicializa el almacén.
+
+        Args:
+            directorio (str): Carpeta raíz; cada sección se guarda en
+                `seccion=<nombre>/` dentro de ella
+        """
+        self.directorio = directorio
+        self._lock = threading.Lock()
+
+    def _particion(self, seccion):
+        """Devuelve la carpeta de la partición de una sección."""
+        return os.path.join(self.directorio, f"seccion={seccion}")
+
+    def agregar(self, seccion, filas):
+        """
+        Agrega las características de varios candidatos a una sección.
+
+        Args:
+            seccion (str): Nombre de la sección
+            filas (list): Diccionarios con las columnas de COLUMNAS; las que
+                falten se guardan como nulas
+
+        Returns:
+            str: Ruta del archivo escrito, o None si no había filas
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not filas:
+            return None
+
+        fecha = datetime.now()
+        tabla = pa.Table.from_pylist(
+            [_normalizar({"fecha": fecha, **fila}) for fila in filas],
+            schema=_esquema()
+        )
+
+        carpeta = self._particion(seccion)
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, f"parte-{fecha:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+        fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+        os.close(fd)
+        with self._lock:
+            pq.write_table(tabla, temporal)
+            os.replace(temporal, ruta)
+        logging.info(f"Características guardadas: {ruta} ({len(filas)} candidatos)")
+        return ruta
+
+    def secciones(self):
+        """Devuelve los nombres de las secciones con datos en el almacén."""
+        if not os.path.isdir(self.directorio):
+            return []
+        return sorted(
+            carpeta.split("=", 1)[1] for carpeta in os.listdir(self.directorio)
+            if carpeta.startswith("seccion=")
+        )
+
+    def leer(self, secciones=None, solo_recientes=True):
+        """
+        Lee las características guardadas.
+
+        Args:
+            secciones (list, opcional): Secciones a leer; por defecto todas
+            solo_recientes (bool): Conservar solo la fila más reciente de cada
+                candidato en cada sección
+
+        Returns:
+            pandas.DataFrame: Una fila por candidato con la columna 'seccion'
+                y las columnas de COLUMNAS
+        """
+        import pyarrow.parquet as pq
+
+        partes = []
+        for seccion in secciones or self.secciones():
+            carpeta = self._particion(seccion)
+            if not os.path.isdir(carpeta):
+                continue
+            archivos = sorted(
+                os.path.join(carpeta, archivo) for archivo in os.listdir(carpeta)
+                if archivo.endswith(".parquet")
+            )
+            for archivo in archivos:
+                df = pq.read_table(archivo, schema=_esquema()).to_pandas()
+                df.insert(0, "seccion", seccion)
+                partes.append(df)
+
+        if not partes:
+            return pd.DataFrame(columns=["seccion"] + [nombre for nombre, _ in COLUMNAS])
+
+        df = pd.concat(partes, ignore_index=True)
+        if solo_recientes:
+            df = (df.sort_values("fecha", kind="stable")
+                    .drop_duplicates(["seccion", "poder", "nombre"], keep="last")
+                    .sort_index()
+                    .reset_index(drop=True))
+        return df
+
+    def compactar(self, seccion):
+        """
+        Reescribe la partición de una sección en un solo archivo con la fila
+        más reciente de cada candidato.
+
+        Args:
+            seccion (str): Nombre de la sección
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        carpeta = self._particion(seccion)
+        if not os.path.isdir(carpeta):
+            return
+        with self._lock:
+            anteriores = [os.path.join(carpeta, a) for a in os.listdir(carpeta) if a.endswith(".parquet")]
+            df = self.leer([seccion]).drop(columns="seccion")
+            tabla = pa.Table.from_pandas(df, schema=_esquema(), preserve_index=False)
+
+            ruta = os.path.join(carpeta, f"parte-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+            fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+            os.close(fd)
+            pq.write_table(tabla, temporal)
+            os.replace(temporal, ruta)
+            for anterior in anteriores:
+                os.remove(anterior)
+        logging.info(f"Partición compactada: {carpeta} ({len(df)} candidatos, {len(anteriores)} archivos)")
+
+_almacen = None
+_lock_almacen = threading.Lock()
+
+def obtener_almacen():
+    """
+    Devuelve el almacén de características compartido del proceso.
+
+    Returns:
+        AlmacenCaracteristicas: Almacén con la configuración por defecto, o
+            None si pyarrow no está instalado
+    """
+    global _almacen
+    with _lock_almacen:
+        if _almacen is None:
+            if pyarrow_disponible():
+                _almacen = AlmacenCaracteristicas()
+            else:
+                logging.warning("pyarrow no está instalado; no se guardarán las características")
+                _almacen = False
+    return _almacen or None
@@ -0,0 +1,128 @@
+"""
+Bitácora de avance de una sección.
+Registra en un archivo JSONL de solo anexado el resultado de cada candidato
+en cuanto termina (características o error), para que una ejecución
+interrumpida pueda reanudarse sin volver a evaluar a los candidatos ya
+completados.
+
+Cada línea es un registro independiente: una línea incompleta, como la que
+deja un proceso terminado a mitad de una escritura, se ignora al leer.
+"""
+
+import os
+import json
+import logging
+import threading
+
+from .config import PUNTOS_CONTROL_DIR, BITACORA_FSYNC_CADA, VERSION_PUNTAJE
+
+def ruta_bitacora(seccion, directorio=PUNTOS_CONTROL_DIR):
+    """Devuelve la ruta de la bitácora de una sección."""
+    return os.path.join(directorio, f"bitacora_{seccion}.jsonl")
+
+def leer_bitacora(seccion, directorio=PUNTOS_CONTROL_DIR):
+    """
+    Lee la bitácora de la última ejecución de una sección.
+
+    Args:
+        seccion (str): Nombre de la sección
+        directorio (str): Carpeta de las bitácoras
+
+    Returns:
+        tuple: (completados, fallos): entradas de los candidatos evaluados
+            sin error, con el formato del manifiesto (ver
+            incremental.crear_entrada), y número de intentos fallidos por
+            candidato. Ambos por clave de candidato (poder y nombre). Un error registrado
+            después de un punto de control lo descarta, para que el
+            candidato se vuelva a evaluar.
+    """
+    completados, fallos = {}, {}
+    ruta = ruta_bitacora(seccion, directorio)
+    if not os.path.exists(ruta):
+        return completados, fallos
+
+    descartadas = 0
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                descartadas += 1
+                continue
+            nombre = registro["nombre"]
+            if registro["estado"] == "ok":
+                completados[nombre] = {clave: registro[clave]
+                                       for clave in ("url", "hash_pdf", "hash_config", "version", "resultado")}
+            else:
+                completados.pop(nombre, None)
+                fallos[nombre] = fallos.get(nombre, 0) + 1
+    if descartadas:
+        logging.warning(f"Bitácora {ruta}: {descartadas} líneas incompletas descartadas")
+    return completados, fallos
+
+class BitacoraSeccion:
+    def __init__(self, seccion, reanudar=False, directorio=PUNTOS_CONTROL_DIR, fsync_cada=BITACORA_FSYNC_CADA):
+        """
+        Abre la bitácora de una sección.
+
+        Args:
+            seccion (str): Nombre de la sección
+            reanudar (bool): Si es True se agregan registros a la bitácora
+                existente; si no, se empieza una nueva
+            directorio (str): Carpeta de las bitácoras
+            fsync_cada (int): Registros entre cada sincronización con el disco
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta = ruta_bitacora(seccion, directorio)
+        self.fsync_cada = fsync_cada
+        self._pendientes = 0
+        self._lock = threading.Lock()
+        self._archivo = open(self.ruta, "a" if reanudar else "w", encoding="utf-8")
+        # Una línea cortada por una interrupción no debe unirse al siguiente registro
+        if reanudar and self._archivo.tell() > 0:
+            with open(self.ruta, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._archivo.write("\n")
+
+    def _escribir(self, registro):
+        """Agrega un registro y lo vuelca al sistema operativo."""
+        linea = json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._archivo.write(linea)
+            self._archivo.flush()
+            self._pendientes += 1
+            if self._pendientes >= self.fsync_cada:
+                os.fsync(self._archivo.fileno())
+                self._pendientes = 0
+
+    def registrar_completado(self, nombre, url, hash_pdf, resultado, hash_config):
+        """Registra las características de un candidato evaluado sin error."""
+        self._escribir({
+            "nombre": nombre,
+            "estado": "ok",
+            "url": url,
+            "hash_pdf": hash_pdf,
+            "hash_config": hash_config,
+            "version": VERSION_PUNTAJE,
+            "resultado": resultado
+        })
+
+    def registrar_error(self, nombre, url, error):
+        """Registra un intento fallido de evaluar a un candidato."""
+        self._escribir({"nombre": nombre, "estado": "error", "url": url, "error": error})
+
+    def cerrar(self):
+        """Sincroniza con el disco y cierra la bitácora."""
+        with self._lock:
+            if self._archivo.closed:
+                return
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,177 @@
+"""
+Caché persistente del texto extraído de los PDFs.
+Las entradas se identifican por el hash del contenido del PDF y la versión
+del extractor, de modo que un PDF sin cambios no vuelve a procesarse.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+
+from .config import CACHE_TEXTO_DIR, CACHE_TEXTO_MAX_BYTES, EXTRACCION_MAX_PAGINAS, EXTRACCION_MAX_CARACTERES
+from .extraccion import extraer_texto, obtener_extractor
+from .metricas import obtener_metricas
+from .utils import hash_archivo
+
+# Cambiar el sufijo invalida la caché cuando cambia la forma de extraer el texto
+SUFIJO_VERSION = "2"
+
+def version_extractor(max_paginas=EXTRACCION_MAX_PAGINAS, max_caracteres=EXTRACCION_MAX_CARACTERES):
+    """Devuelve la versión del extractor configurado, usada en la clave de caché."""
+    return (f"{obtener_extractor().version}-p{max_paginas or 'todas'}"
+            f"-c{max_caracteres or 'todos'}-{SUFIJO_VERSION}")
+
+class CacheTexto:
+    def __init__(self, directorio=CACHE_TEXTO_DIR, max_bytes=CACHE_TEXTO_MAX_BYTES,
+                 version=None, max_paginas=EXTRACCION_MAX_PAGINAS,
+                 max_caracteres=EXTRACCION_MAX_CARACTERES):
+        """
+        Inicializa la caché.
+
+        Args:
+            directorio (str): Carpeta donde se guardan los textos
+            max_bytes (int): Tamaño máximo de la caché; al superarlo se
+                eliminan las entradas usadas hace más tiempo
+            version (str, opcional): Versión del extractor que forma parte de la
+                clave; por defecto, la del backend configurado
+            max_paginas (int, opcional): Páginas máximas a extraer por PDF
+            max_caracteres (int, opcional): Caracteres máximos del texto de un PDF
+        """
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.max_paginas = max_paginas
+        self.max_caracteres = max_caracteres
+        self.version = version or version_extractor(max_paginas, max_caracteres)
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directorio, exist_ok=True)
+        self._tamano = sum(os.path.getsize(ruta) for ruta in self._entradas())
+
+    def _entradas(self):
+        """Recorre las rutas de todas las entradas de la caché."""
+        for raiz, _, archivos in os.walk(self.directorio):
+            for archivo in archivos:
+                if archivo.endswith(".txt"):
+                    yield os.path.join(raiz, archivo)
+
+    def _ruta(self, hash_pdf):
+        """Devuelve la ruta de la entrada para un hash de PDF."""
+        clave = hashlib.sha256(f"{hash_pdf}:{self.version}".encode()).hexdigest()
+        return os.path.join(self.directorio, clave[:2], clave + ".txt")
+
+    def obtener(self, hash_pdf):
+        """
+        Busca el texto de un PDF en la caché.
+
+        Args:
+            hash_pdf (str): Hash SHA-256 del contenido del PDF
+
+        Returns:
+            str: Texto guardado, o None si no está en la caché
+        """
+        ruta = self._ruta(hash_pdf)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                texto = f.read()
+            # Actualizar la fecha de acceso para el desalojo por antigüedad
+            os.utime(ruta)
+        except OSError:
+            # Entrada ausente, o desalojada por otro proceso entre la lectura
+            # y la actualización de la fecha: se vuelve a extraer
+            self.fallos += 1
+            obtener_metricas().incrementar("cache_texto_fallos")
+            return None
+        self.aciertos += 1
+        obtener_metricas().incrementar("cache_texto_aciertos")
+        return texto
+
+    def guardar(self, hash_pdf, texto):
+        """Guarda el texto de un PDF en la caché de forma atómica."""
+        ruta = self._ruta(hash_pdf)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(texto)
+        anterior = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        os.replace(temporal, ruta)
+
+        with self._lock:
+            self._tamano += os.path.getsize(ruta) - anterior
+            if self._tamano > self.max_bytes:
+                self._desalojar()
+
+    def _desalojar(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta quedar bajo el límite.
+        Las entradas que otro proceso elimina mientras tanto se ignoran.
+        """
+        entradas = []
+        for ruta in self._entradas():
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+        entradas.sort()
+        self._tamano = sum(tamano for _, tamano, _ in entradas)
+        objetivo = self.max_bytes * 0.9
+        eliminadas = 0
+        for _, tamano, ruta in entradas:
+            if self._tamano <= objetivo:
+                break
+            try:
+                os.remove(ruta)
+                eliminadas += 1
+            except OSError:
+                pass
+            self._tamano -= tamano
+        logging.info(f"Caché de texto: {eliminadas} entradas desalojadas")
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché."""
+        with self._lock:
+            for ruta in list(self._entradas()):
+                os.remove(ruta)
+            self._tamano = 0
+        logging.info(f"Caché de texto vaciada: {self.directorio}")
+
+    def texto_pdf(self, ruta_pdf, hash_pdf=None):
+        """
+        Devuelve el texto de un PDF usando la caché cuando es posible.
+
+        Args:
+            ruta_pdf (str): Ruta del archivo PDF
+            hash_pdf (str, opcional): Hash ya calculado del PDF
+
+        Returns:
+            str: Texto extraído del PDF
+        """
+        if hash_pdf is None:
+            hash_pdf = hash_archivo(ruta_pdf)
+        texto = self.obtener(hash_pdf)
+        if texto is None:
+            extraccion = extraer_texto(ruta_pdf, max_paginas=self.max_paginas, max_caracteres=self.max_caracteres)
+            logging.debug(f"Texto extraído de {ruta_pdf}: {extraccion['paginas']} páginas "
+                          f"en {extraccion['segundos']:.2f}s ({extraccion['backend']})")
+            texto = extraccion["texto"]
+            self.guardar(hash_pdf, texto)
+        return texto
+
+_cache = None
+_lock_cache = threading.Lock()
+
+def obtener_cache_texto():
+    """
+    Devuelve la caché de texto compartida del proceso, creándola si es necesario.
+
+    Returns:
+        CacheTexto: Caché con la configuración por defecto
+    """
+    global _cache
+    with _lock_cache:
+        if _cache is None:
+            _cache = CacheTexto()
+    return _cache
@@ -165,6 +165,213 @@ RESULTS_DIR = os.path.join(OUTPUT_DIR, "resultados")
 LOGS_DIR = os.path.join(OUTPUT_DIR, "logs")
 LOG_DIR = LOGS_DIR  # Alias para mantener compatibilidad
 
+# Registro y métricas de ejecución
+LOG_NIVEL = "INFO"              # Con "DEBUG" se registra cada candidato (más lento en secciones grandes)
+LOG_PROGRESO_CADA = 50          # Candidatos entre cada mensaje de progreso
+METRICAS_ARCHIVO = os.path.join(LOGS_DIR, "metricas.json")  # Reporte JSON de la última ejecución
+METRICAS_PROMETHEUS = None      # Archivo .prom opcional para node_exporter (None = no se genera)
+
+# Caché de texto extraído de los PDFs
+CACHE_TEXTO_DIR = os.path.join(PROCESSED_DATA_DIR, "cache_texto")
+CACHE_TEXTO_MAX_BYTES = 512 * 1024 * 1024  # Tamaño máximo antes de desalojar entradas antiguas
+
+# Índice de PDFs descargados (URL y candidato -> ruta local, hash, tamaño y fecha)
+INDICE_PDFS_ARCHIVO = os.path.join(PROCESSED_DATA_DIR, "indice_pdfs.json")
+INDICE_PDFS_GUARDAR_CADA = 100  # Cambios tras los cuales el índice se guarda automáticamente
+
+# Evaluación incremental
+MANIFIESTOS_DIR = os.path.join(PROCESSED_DATA_DIR, "manifiestos")
+VERSION_PUNTAJE = "5"  # Incrementar al cambiar las características guardadas para invalidar resultados previos
+
+# Puntos de control: bitácora por sección con el resultado de cada candidato,
+# para reanudar una ejecución interrumpida (--reanudar)
+PUNTOS_CONTROL_DIR = os.path.join(PROCESSED_DATA_DIR, "puntos_control")
+BITACORA_FSYNC_CADA = 50        # Registros entre cada sincronización con el disco
+REANUDAR_MAX_INTENTOS = 3       # Intentos fallidos tras los cuales un candidato ya no se reintenta
+
+# Almacén de características por candidato (Parquet particionado por sección)
+ALMACEN_CARACTERISTICAS_DIR = os.path.join(PROCESSED_DATA_DIR, "caracteristicas")
+
+# Tabla de puntaje: columna de salida -> (característica, peso, tope).
+# Cada subpuntaje es min(característica * peso, tope); un tope None no limita.
+# Cambiar pesos o topes no obliga a volver a leer los PDFs: las
+# características se guardan en el manifiesto y en el almacén de características.
+TABLA_PUNTAJE = {
+    "Puntaje Judicial": ("experiencia_judicial", 3.0, 30),
+    "Puntaje Docente": ("experiencia_docente", 2.0, 20),
+    "Puntaje Investigación": ("experiencia_investigacion", 1.5, 15),
+    "Puntaje Administrativa": ("experiencia_administrativa", 1.0, 10),
+    "Puntaje Años": ("años_experiencia", 2.0, 20),
+    "Puntaje Formación": ("puntos_formacion", 1.0, None),
+    "Puntaje Instituciones": ("instituciones_formacion", 2.0, 10),
+    "Puntaje Positivas": ("conteo_positivas", 1.5, 15),
+    "Puntaje Riesgos": ("conteo_riesgos", -2.0, None),
+    "Puntaje Calidad": ("calidad_texto", 1.0, 20)
+}
+
+# Puntos por nivel máximo de formación académica
+PUNTOS_FORMACION = {
+    "doctorado": 20,
+    "maestría": 15,
+    "licenciatura": 10,
+    "especialidad": 5,
+    "ninguno": 0
+}
+
+# Límites del puntaje total
+PUNTAJE_MINIMO = 0
+PUNTAJE_MAXIMO = 100
+
+# Criterios de aptitud en orden de prioridad:
+# (aptitud, niveles de formación admitidos (None = cualquiera), mínimo de
+#  experiencia judicial, máximo de riesgos, puntaje total mínimo)
+CRITERIOS_APTITUD = [
+    ("Apto", ("doctorado",), 8, 0, 0),
+    ("Observado", ("maestría", "doctorado"), 5, 0, 0)
+]
+APTITUD_POR_DEFECTO = "No Apto"
+
+# Riesgos que se suman a quien no menciona ninguna red social en su CV.
+# El conteo guardado por candidato ya la incluye; un perfil de puntaje puede
+# usar otra con "penalizacion_sin_redes".
+PENALIZACION_SIN_REDES = 1
+
+# Perfiles de puntaje con nombre. Todos se calculan a partir de las mismas
+# características por candidato, así que cambiar de perfil no obliga a volver
+# a descargar, leer ni analizar los PDFs (ver src.repuntuar_seccion).
+#   "judicial": tabla y criterios anteriores (por defecto).
+#   "ine":      pesos y umbrales del antiguo analizar_candidatos de
+#               evaluador_ine.py: sin tope de 100, aptitud por puntaje total,
+#               sin penalización por redes sociales y con sus nombres de
+#               columna ("Tipo" y "Clasificación").
+# Claves opcionales: "penalizacion_sin_redes" (por defecto
+# PENALIZACION_SIN_REDES) y "columnas" (renombra columnas de la salida).
+PERFILES_PUNTAJE = {
+    "judicial": {
+        "tabla": TABLA_PUNTAJE,
+        "puntos_formacion": PUNTOS_FORMACION,
+        "minimo": PUNTAJE_MINIMO,
+        "maximo": PUNTAJE_MAXIMO,
+        "criterios": CRITERIOS_APTITUD,
+        "aptitud_por_defecto": APTITUD_POR_DEFECTO
+    },
+    "ine": {
+        "tabla": {
+            "Puntaje Experiencia Judicial": ("experiencia_judicial", 6.0, 30),
+            "Puntaje Experiencia Docente": ("experiencia_docente", 3.0, 15),
+            "Puntaje Experiencia Investigación": ("experiencia_investigacion", 4.0, 20),
+            "Puntaje Experiencia Administrativa": ("experiencia_administrativa", 2.0, 10),
+            "Puntaje Años de Experiencia": ("años_experiencia", 2.5, 25),
+            "Puntaje Formación Académica": ("puntos_formacion", 1.0, None),
+            "Puntaje Instituciones": ("instituciones_formacion", 3.0, 10),
+            "Puntaje Palabras Positivas": ("conteo_positivas", 4.0, 15),
+            "Puntaje Palabras Riesgo": ("conteo_riesgos", -5.0, None)
+        },
+        "puntos_formacion": {
+            "doctorado": 15,
+            "maestría": 10,
+            "licenciatura": 5,
+            "especialidad": 0,
+            "ninguno": 0
+        },
+        "minimo": 0,
+        "maximo": None,
+        "criterios": [
+            ("Apto", None, 0, 0, 80),
+            ("Observado", None, 0, 2, 60)
+        ],
+        "aptitud_por_defecto": "No Apto",
+        "penalizacion_sin_redes": 0,
+        "columnas": {"Poder": "Tipo", "Aptitud": "Clasificación"}
+    }
+}
+PERFIL_PUNTAJE = "judicial"
+
+# Subanálisis que ejecuta NLPAnalyzer. Al cargar spaCy se excluyen los
+# componentes que ninguno de ellos necesita (ver COMPONENTES_SUBANALISIS en nlp_analyzer)
+NLP_SUBANALISIS = ["entidades", "experiencia", "formacion", "competencias", "calidad_texto", "sentimiento"]
+
+# Segmentación en oraciones del perfil "completo", calculada una vez por CV y
+# compartida por los subanálisis:
+#   "parser":      límites de oración del parser de spaCy (por defecto).
+#   "sentencizer": componente sentencizer de spaCy, en un pipeline aparte
+#                  sobre el texto original, sin cargar el parser.
+#   "reglas":      expresión regular sobre la puntuación del texto original.
+# "sentencizer" y "reglas" son más rápidos, pero sus oraciones no coinciden
+# con las del parser, así que cambian la coherencia, los logros y el
+# sentimiento por oración y con ellos el Puntaje Calidad. Por eso no son el
+# valor por defecto: cambiar de segmentación invalida los resultados guardados
+# y daría otros puntajes a los mismos CV.
+# Los perfiles que no ejecutan el parser usan siempre las reglas.
+NLP_ORACIONES = "parser"
+
+# Perfil del análisis NLP de cada CV:
+#   "completo": spaCy con los componentes de NLP_SUBANALISIS y sentimiento
+#               VADER del texto y resumido de sus oraciones.
+#   "estandar": igual, pero el sentimiento se calcula solo para el texto
+#               completo; omite además parser, lematizador y morfología y
+#               separa las oraciones por reglas.
+#   "rapido":   sin spaCy ni VADER; la calidad del texto se calcula con una
+#               tokenización por espacios. Sin entidades ni sentimiento.
+# Diferencias de puntaje y velocidad medidas: ver README y benchmarks/bench_analizador.py
+PERFIL_ANALISIS = "completo"
+
+# Sentimiento por oración (perfil "completo"): VADER analiza como máximo
+# SENTIMIENTO_MAX_ORACIONES oraciones por texto (o por ventana), tomadas a
+# intervalos regulares si hay más (None = todas), y de ellas se guarda solo
+# un resumen del puntaje compuesto (media, mínimo y máximo)
+SENTIMIENTO_MAX_ORACIONES = 200
+
+# Procesamiento por lotes con spaCy (nlp.pipe)
+NLP_BATCH_SIZE = 32
+NLP_N_PROCESS = 1
+
+# Los textos de más de NLP_VENTANA_CARACTERES caracteres se analizan por
+# ventanas de ese tamaño, solapadas NLP_VENTANA_SOLAPAMIENTO caracteres, y
+# sus resultados se combinan. Acota la memoria de spaCy por documento.
+NLP_VENTANA_CARACTERES = 100_000
+NLP_VENTANA_SOLAPAMIENTO = 200
+
+# Memoria máxima de cada worker del pool de candidatos, en MB de espacio de
+# direcciones (None = sin límite; requiere el módulo resource de Unix). Un
+# candidato que la supere falla con MemoryError sin detener al worker.
+WORKER_MAX_MEMORIA_MB = None
+
+# Elementos máximos en cada cola entre etapas del pipeline de una sección
+PIPELINE_TAMANO_COLA = 64
+
+# Candidatos máximos que el pipeline adelanta respecto al último resultado
+# entregado en orden. Acota el búfer de reordenamiento cuando una descarga
+# temprana se demora y las posteriores ya terminaron.
+PIPELINE_VENTANA_REORDEN = 256
+
+# Descarga de PDFs
+DESCARGA_WORKERS = 8          # Descargas simultáneas en total
+DESCARGA_MAX_POR_HOST = 4     # Descargas simultáneas por servidor
+DESCARGA_TIMEOUT = (10, 60)   # Segundos de espera (conexión, lectura)
+DESCARGA_REINTENTOS = 3       # Reintentos ante errores de red o 5xx
+DESCARGA_BACKOFF = 1.0        # Espera base entre reintentos (se duplica)
+DESCARGA_MAX_EDAD = 24 * 3600 # Segundos antes de revalidar un PDF local con el servidor (None = nunca)
+
+# Extracción de texto de PDFs
+EXTRACTOR_PDF = "auto"             # "auto", "pymupdf" o "pypdf2"
+EXTRACCION_MAX_PAGINAS = None      # Páginas máximas a leer por CV (None = todas)
+EXTRACCION_MAX_CARACTERES = 2_000_000  # Caracteres máximos del texto de un CV (None = sin límite)
+EXTRACCION_WORKERS = min(4, os.cpu_count() or 1)  # Procesos para las páginas de un CV largo
+EXTRACCION_PAGINAS_PARALELO = 20   # Páginas a partir de las cuales se extrae en paralelo
+EXTRACCION_PAGINAS_RANGO = 25      # Páginas máximas por tarea del pool de páginas
+EXTRACCION_LENTA_SEGUNDOS = 5.0    # Se registra una advertencia si un CV tarda más
+
+# Evaluación asíncrona (src/evaluador_async.py)
+ASYNC_CONCURRENCIA = 16           # Candidatos en curso a la vez, en todas las secciones
+ASYNC_PLAZO_CANDIDATO = 300.0     # Segundos máximos por candidato, con descarga (None = sin plazo)
+
+# Escritura de resultados
+FORMATO_RESULTADOS = "csv"        # "csv", "jsonl" o "parquet"
+EXPORTAR_EXCEL = True             # Exportar además a .xlsx al terminar cada sección
+ESCRITURA_LOTE = 64               # Candidatos que se puntúan y escriben a la vez
+PARQUET_FILAS_POR_PARTE = 5000    # Filas por archivo en la salida Parquet
+
 # Configuración de archivos
 archivos_entrada = {
     "SCJN": os.path.join(RAW_DATA_DIR, "Candidatos_MSCJN"),
@@ -0,0 +1,307 @@
+"""
+Descarga concurrente de los PDFs de los candidatos.
+Usa una sesión HTTP con conexiones reutilizables, límites de concurrencia
+por host, reintentos con espera exponencial y escrituras parciales reanudables.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    DESCARGA_WORKERS,
+    DESCARGA_MAX_POR_HOST,
+    DESCARGA_TIMEOUT,
+    DESCARGA_REINTENTOS,
+    DESCARGA_BACKOFF,
+    LOG_PROGRESO_CADA
+)
+from .metricas import obtener_metricas
+
+# Códigos HTTP que vale la pena reintentar
+CODIGOS_REINTENTABLES = {408, 425, 429, 500, 502, 503, 504}
+
+TAMANO_BLOQUE = 64 * 1024
+
+class DescargadorPDF:
+    def __init__(self, workers=DESCARGA_WORKERS, max_por_host=DESCARGA_MAX_POR_HOST,
+                 timeout=DESCARGA_TIMEOUT, reintentos=DESCARGA_REINTENTOS,
+                 backoff=DESCARGA_BACKOFF, sesion=None):
+        """
+        Inicializa el descargador.
+
+        Args:
+            workers (int): Número máximo de descargas simultáneas
+            max_por_host (int): Número máximo de descargas simultáneas por host
+            timeout (tuple): Tiempo máximo (conexión, lectura) en segundos
+            reintentos (int): Reintentos ante errores de red o respuestas 5xx/429
+            backoff (float): Espera base en segundos; se duplica en cada reintento
+            sesion (requests.Session, opcional): Sesión HTTP a utilizar
+        """
+        self.workers = workers
+        self.max_por_host = max_por_host
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.backoff = backoff
+
+        if sesion is None:
+            sesion = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            sesion.mount("http://", adaptador)
+            sesion.mount("https://", adaptador)
+        self.sesion = sesion
+
+        self._semaforos = {}
+        self._lock = threading.Lock()
+        self.progreso = {"total": 0, "completadas": 0, "fallidas": 0}
+
+    def _semaforo_host(self, url):
+        """Devuelve el semáforo que limita las descargas simultáneas al host de la URL."""
+        host = urlparse(url).netloc
+        with self._lock:
+            semaforo = self._semaforos.get(host)
+            if semaforo is None:
+                semaforo = threading.BoundedSemaphore(self.max_por_host)
+                self._semaforos[host] = semaforo
+        return semaforo
+
+    def _espera(self, intento):
+        """Calcula la espera antes del siguiente reintento."""
+        return self.backoff * (2 ** intento) * (1 + random.random() * 0.1)
+
+    def descargar(self, url, destino, validadores=None):
+        """
+        Descarga una URL a un archivo local.
+
+        El contenido se escribe en `destino + ".part"` y solo se mueve a
+        `destino` cuando la descarga termina. Si existe un archivo parcial de
+        un intento anterior, se solicita el resto con una cabecera Range
+        condicionada (If-Range) al ETag o Last-Modified de la respuesta que
+        lo inició; si no se conoce ninguno, se descarga desde el inicio.
+        Los errores de red y las conexiones cortadas a mitad del contenido se
+        reintentan; los demás errores de requests (URL inválida, demasiadas
+        redirecciones) terminan la descarga como fallida.
+
+        Con validadores, la petición es condicional (If-None-Match /
+        If-Modified-Since): si el servidor responde 304, el archivo local se
+        conserva y no se transfiere el contenido.
+
+        Args:
+            url (str): URL del PDF
+            destino (str): Ruta final del archivo
+            validadores (dict, opcional): 'etag' y/o 'last_modified' de la
+                copia local
+
+        Returns:
+            dict: Resultado con las claves 'url', 'destino', 'ok', 'bytes',
+                'modificado', 'etag', 'last_modified' y 'error'
+        """
+        resultado = {"url": url, "destino": destino, "ok": False, "bytes": 0, "modificado": True,
+                     "etag": None, "last_modified": None, "error": None}
+        parcial = destino + ".part"
+        metricas = obtener_metricas()
+
+        with self._semaforo_host(url), metricas.cronometro("descarga"):
+            for intento in range(self.reintentos + 1):
+                try:
+                    bytes_descargados, cabeceras = self._descargar_parcial(url, parcial, validadores or {})
+                    resultado["etag"] = cabeceras.get("ETag")
+                    resultado["last_modified"] = cabeceras.get("Last-Modified")
+                    if bytes_descargados is None:
+                        resultado["modificado"] = False
+                    else:
+                        resultado["bytes"] = bytes_descargados
+                        os.replace(parcial, destino)
+                        borrar_validador_parcial(parcial)
+                    resultado["ok"] = True
+                    resultado["error"] = None
+                    break
+                except requests.HTTPError as e:
+                    resultado["error"] = str(e)
+                    codigo = e.response.status_code if e.response is not None else None
+                    if codigo not in CODIGOS_REINTENTABLES:
+                        break
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    resultado["error"] = str(e) or type(e).__name__
+                except requests.RequestException as e:
+                    resultado["error"] = str(e) or type(e).__name__
+                    break
+                except OSError as e:
+                    resultado["error"] = str(e)
+                    break
+
+                if intento < self.reintentos:
+                    metricas.incrementar("descarga_reintentos")
+                    espera = self._espera(intento)
+                    logging.warning(f"Reintentando {url} en {espera:.1f}s ({resultado['error']})")
+                    time.sleep(espera)
+
+        with self._lock:
+            self.progreso["completadas" if resultado["ok"] else "fallidas"] += 1
+            hechas = self.progreso["completadas"] + self.progreso["fallidas"]
+            total = self.progreso["total"] or hechas
+
+        if not resultado["ok"]:
+            metricas.incrementar("descarga_errores")
+        elif not resultado["modificado"]:
+            metricas.incrementar("descarga_no_modificados")
+        else:
+            metricas.incrementar("descarga_completadas")
+
+        if resultado["ok"] and not resultado["modificado"]:
+            logging.debug(f"Sin cambios {os.path.basename(destino)} ({hechas}/{total})")
+        elif resultado["ok"]:
+            logging.debug(f"Descargado {os.path.basename(destino)} ({hechas}/{total})")
+        else:
+            logging.error(f"Error al descargar {url}: {resultado['error']} ({hechas}/{total})")
+        if hechas % LOG_PROGRESO_CADA == 0 or hechas == total:
+            logging.info(f"Descargas: {hechas}/{total}")
+        return resultado
+
+    def _descargar_parcial(self, url, parcial, validadores):
+        """
+        Descarga (o reanuda) la URL en el archivo parcial.
+
+        Returns:
+            tuple: (bytes totales, cabeceras de la respuesta); los bytes son
+                None si el servidor respondió 304 (sin cambios)
+        """
+        existentes = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+        validador_parcial = leer_validador_parcial(parcial) if existentes else None
+        if existentes and validador_parcial is None:
+            # Sin validador no se puede saber si el recurso cambió: se reinicia
+            logging.debug(f"Se descarta {parcial}: no hay validador para reanudarlo")
+            os.remove(parcial)
+            existentes = 0
+        cabeceras = {}
+        if existentes:
+            cabeceras["Range"] = f"bytes={existentes}-"
+            # Si el recurso cambió desde el intento anterior, el servidor envía el contenido completo
+            cabeceras["If-Range"] = validador_parcial
+        else:
+            if validadores.get("etag"):
+                cabeceras["If-None-Match"] = validadores["etag"]
+            if validadores.get("last_modified"):
+                cabeceras["If-Modified-Since"] = validadores["last_modified"]
+
+        with self.sesion.get(url, headers=cabeceras, timeout=self.timeout, stream=True) as r:
+            if r.status_code == 304:
+                return None, r.headers
+            if r.status_code == 416:
+                # El archivo parcial ya contiene el recurso completo
+                return existentes, r.headers
+            r.raise_for_status()
+
+            # Si el servidor ignora Range, se descarga desde el inicio
+            modo = "ab" if r.status_code == 206 else "wb"
+            if modo == "wb":
+                existentes = 0
+                guardar_validador_parcial(parcial, r.headers)
+
+            recibidos = 0
+            try:
+                with open(parcial, modo) as f:
+                    for bloque in r.iter_content(chunk_size=TAMANO_BLOQUE):
+                        f.write(bloque)
+                        recibidos += len(bloque)
+            finally:
+                obtener_metricas().incrementar("descarga_bytes", recibidos)
+            return existentes + recibidos, r.headers
+
+    def registrar_pendientes(self, cantidad):
+        """Suma descargas al total que se muestra en el progreso."""
+        with self._lock:
+            self.progreso["total"] += cantidad
+
+    def descargar_todos(self, tareas):
+        """
+        Descarga varias URLs en paralelo.
+
+        Args:
+            tareas (list): Pares (url, destino)
+
+        Returns:
+            list: Resultados de descargar(), en el mismo orden que las tareas
+        """
+        tareas = list(tareas)
+        self.registrar_pendientes(len(tareas))
+        if not tareas:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda t: self.descargar(*t), tareas))
+
+    def revalidar_todos(self, entradas):
+        """
+        Revalida en paralelo copias locales con peticiones condicionales.
+
+        Args:
+            entradas (list): Entradas del índice de PDFs ('url', 'ruta',
+                'etag', 'last_modified')
+
+        Returns:
+            list: Resultados de descargar(), en el mismo orden que las entradas
+        """
+        entradas = list(entradas)
+        self.registrar_pendientes(len(entradas))
+        if not entradas:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda e: self.descargar(e["url"], e["ruta"], validadores=e), entradas))
+
+def ruta_validador_parcial(parcial):
+    """Ruta del archivo con el validador de la respuesta que inició un archivo parcial."""
+    return parcial + ".validador"
+
+def leer_validador_parcial(parcial):
+    """Devuelve el validador guardado para un archivo parcial, o None si no hay."""
+    try:
+        with open(ruta_validador_parcial(parcial), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def guardar_validador_parcial(parcial, cabeceras):
+    """
+    Guarda junto al archivo parcial el validador que sirve como If-Range: el
+    ETag fuerte o, si no hay, Last-Modified. Un ETag débil (W/) no sirve
+    para If-Range.
+    """
+    etag = cabeceras.get("ETag")
+    validador = etag if etag and not etag.startswith("W/") else cabeceras.get("Last-Modified")
+    if validador:
+        with open(ruta_validador_parcial(parcial), "w", encoding="utf-8") as f:
+            f.write(validador)
+    else:
+        borrar_validador_parcial(parcial)
+
+def borrar_validador_parcial(parcial):
+    """Elimina el validador de un archivo parcial, si existe."""
+    try:
+        os.remove(ruta_validador_parcial(parcial))
+    except FileNotFoundError:
+        pass
+
+_descargador = None
+_lock_descargador = threading.Lock()
+
+def obtener_descargador():
+    """
+    Devuelve el descargador compartido del proceso, creándolo si es necesario.
+
+    Returns:
+        DescargadorPDF: Descargador con la configuración por defecto
+    """
+    global _descargador
+    with _lock_descargador:
+        if _descargador is None:
+            _descargador = DescargadorPDF()
+    return _descargador
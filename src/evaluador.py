@@ -4,13 +4,14 @@ Contiene la lógica principal de análisis de candidatos.
 """
 
 import os
+import heapq
 import pandas as pd
-import requests
-from PyPDF2 import PdfReader
 import re
 from urllib.parse import urlparse
 import logging
 from datetime import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
 from .config import *
 from .utils import (
@@ -19,36 +20,79 @@ from .utils import (
     configurar_logging,
     mostrar_banner,
     crear_estructura_directorios,
-    mover_archivos_existentes
+    mover_archivos_existentes,
+    hash_archivo
+)
+from .incremental import (
+    cargar_manifiesto,
+    guardar_manifiesto,
+    crear_entrada,
+    entrada_vigente,
+    hash_configuracion
+)
+from .bitacora import BitacoraSeccion, leer_bitacora
+from .nlp_analyzer import obtener_analizador, inicializar_worker, analizar_rapido
+from .pipeline import PipelineSeccion
+from .cache_texto import obtener_cache_texto
+from .palabras_clave import contar_palabras_clave
+from .patrones import menciones_cv
+from .almacen_caracteristicas import obtener_almacen
+from .indice_pdfs import obtener_indice_pdfs
+from .descargas import obtener_descargador
+from .metricas import obtener_metricas
+from .salida import abrir_escritor, exportar_excel as exportar_excel_resultados
+from .puntaje import (
+    CARACTERISTICAS,
+    caracteristicas_candidato,
+    clasificar_aptitud,
+    obtener_perfil_puntaje,
+    puntuar_caracteristicas
 )
-from .nlp_analyzer import NLPAnalyzer
 
-def analizar_experiencia(texto):
-    """Analiza la experiencia mencionada en el texto."""
-    # Inicializar analizador NLP
-    nlp_analyzer = NLPAnalyzer()
+def analizar_experiencia(texto, resultados_nlp=None, conteos=None, perfil=PERFIL_ANALISIS):
+    """
+    Analiza la experiencia mencionada en el texto.
     
-    # Realizar análisis NLP
-    resultados_nlp = nlp_analyzer.analizar_texto(texto)
+    Args:
+        texto (str): Texto del CV
+        resultados_nlp (dict, opcional): Resultado previo de NLPAnalyzer para
+            este texto (p. ej. obtenido con analizar_lote). Si no se indica,
+            el análisis NLP se realiza aquí.
+        conteos (dict, opcional): Resultado previo de contar_palabras_clave
+            sobre el texto en minúsculas.
+        perfil (str): Perfil del análisis NLP: "rapido", "estandar" o
+            "completo" (ver PERFIL_ANALISIS en config)
+    """
+    # Realizar análisis NLP; el perfil rápido no carga spaCy ni NLTK
+    if resultados_nlp is None:
+        if perfil == "rapido":
+            resultados_nlp = analizar_rapido(texto)
+        else:
+            resultados_nlp = obtener_analizador().analizar_texto(texto, perfil)
     
-    # Análisis tradicional
+    # Análisis tradicional: una sola pasada para todas las listas de palabras clave
     texto = texto.lower()
-    exp_judicial = sum(texto.count(p) for p in experiencia_judicial)
-    exp_administrativa = sum(texto.count(p) for p in experiencia_administrativa)
-    exp_docente = sum(texto.count(p) for p in experiencia_docente)
-    exp_investigacion = sum(texto.count(p) for p in experiencia_investigacion)
+    if conteos is None:
+        conteos = contar_palabras_clave(texto)
+    exp_judicial = conteos["experiencia_judicial"]
+    exp_administrativa = conteos["experiencia_administrativa"]
+    exp_docente = conteos["experiencia_docente"]
+    exp_investigacion = conteos["experiencia_investigacion"]
+    
+    # Años de experiencia, grados e instituciones en una sola pasada
+    menciones = menciones_cv(texto)
     
     # Extraer años de experiencia
     años_experiencia = min(
         max(
-            extraer_años_experiencia(texto),
+            extraer_años_experiencia(texto, menciones),
             resultados_nlp['experiencia']['años']
         ),
         10  # Limitar a máximo 10 años
     )
     
     # Analizar formación
-    formacion = analizar_formacion(texto)
+    formacion = analizar_formacion(texto, menciones)
     
     # Evaluar la calidad de la experiencia
     calidad_experiencia = "Alta" if (exp_judicial >= 5 or exp_docente >= 5) and años_experiencia >= 5 else \
@@ -81,96 +125,338 @@ def analizar_experiencia(texto):
         "sentimiento": resultados_nlp['sentimiento']['general']
     }
 
-def calcular_puntaje(exp, conteo_positivas, conteo_riesgos):
-    """Calcula el puntaje total del candidato."""
-    # Pesos para cada categoría
-    pesos = {
-        "experiencia_judicial": 3.0,      # Experiencia judicial es lo más importante
-        "experiencia_docente": 2.0,       # Experiencia docente es muy relevante
-        "experiencia_investigacion": 1.5,  # Investigación es importante
-        "experiencia_administrativa": 1.0, # Experiencia administrativa es básica
-        "años_experiencia": 2.0,          # Años de experiencia son muy importantes
-        "formacion": 2.0,                 # Formación académica es muy importante
-        "palabras_positivas": 1.5,        # Palabras positivas son importantes
-        "palabras_riesgo": -2.0,          # Palabras de riesgo penalizan
-        "calidad_texto": 1.0              # Calidad del texto es importante
-    }
-    
-    # Calcular puntaje base
-    puntaje = 0
-    
-    # Puntaje por experiencia judicial (máximo 30 puntos)
-    puntaje += min(exp["experiencia_judicial"] * pesos["experiencia_judicial"], 30)
+def calcular_puntaje(exp, conteo_positivas, conteo_riesgos, perfil_puntaje=PERFIL_PUNTAJE):
+    """Calcula el puntaje total del candidato con el perfil de puntaje indicado."""
+    caracteristicas = pd.DataFrame([caracteristicas_candidato(exp, conteo_positivas, conteo_riesgos)])
+    return float(puntuar_caracteristicas(caracteristicas, perfil_puntaje=perfil_puntaje)["Puntaje Total"].iloc[0])
+
+def evaluar_aptitud(exp, conteo_riesgos, perfil_puntaje=PERFIL_PUNTAJE, puntaje_total=None, conteo_positivas=0):
+    """
+    Evalúa la aptitud del candidato basado en formación y experiencia judicial, usando conteos pre-calculados.
+    Si el perfil tiene criterios con puntaje mínimo y no se indica puntaje_total, este se
+    calcula con calcular_puntaje a partir de exp, conteo_positivas y conteo_riesgos.
+    """
+    perfil = obtener_perfil_puntaje(perfil_puntaje)
+    if puntaje_total is None and any(criterio[4] for criterio in perfil["criterios"]):
+        puntaje_total = calcular_puntaje(exp, conteo_positivas, conteo_riesgos, perfil_puntaje)
+    aptitud = clasificar_aptitud(
+        [exp["formacion"]["nivel_maximo"]], [exp["experiencia_judicial"]], [conteo_riesgos],
+        criterios=perfil["criterios"],
+        puntaje_total=[puntaje_total] if puntaje_total is not None else None,
+        aptitud_por_defecto=perfil["aptitud_por_defecto"]
+    )[0]
+    logging.debug(f"Resultado Aptitud: {aptitud}")
+    return aptitud
+
+def clave_candidato(poder, nombre):
+    """
+    Clave de un candidato en el manifiesto y la bitácora de una sección. Incluye
+    el poder (o tipo de candidato) porque un mismo nombre puede aparecer en
+    varios dentro de una sección.
+    """
+    return f"{poder}/{nombre}"
+
+def _extraer_candidato(tarea):
+    """Lee el texto del PDF de un candidato y cuenta sus palabras clave."""
+    nombre = tarea["nombre"]
+    archivo_pdf = tarea["archivo_pdf"]
     
-    # Puntaje por experiencia docente (máximo 20 puntos)
-    puntaje += min(exp["experiencia_docente"] * pesos["experiencia_docente"], 20)
+    logging.debug(f"Procesando candidato {tarea['idx'] + 1}/{tarea['total']}: {nombre}")
+    metricas = obtener_metricas()
     
-    # Puntaje por experiencia en investigación (máximo 15 puntos)
-    puntaje += min(exp["experiencia_investigacion"] * pesos["experiencia_investigacion"], 15)
+    # Leer texto del PDF. Un error se propaga para que el candidato quede
+    # registrado con error y no se guarde un puntaje calculado sin texto
+    try:
+        hash_pdf = tarea.get("hash_pdf") or hash_archivo(archivo_pdf)
+        texto = obtener_cache_texto().texto_pdf(archivo_pdf, hash_pdf).lower()
+    except Exception as e:
+        logging.error(f"Error al leer {archivo_pdf}: {e}")
+        metricas.incrementar("extraccion_errores")
+        raise
     
-    # Puntaje por experiencia administrativa (máximo 10 puntos)
-    puntaje += min(exp["experiencia_administrativa"] * pesos["experiencia_administrativa"], 10)
+    with metricas.cronometro("palabras_clave"):
+        # Detectar redes sociales
+        redes_detectadas = bool(re.search(r"(facebook|instagram|tiktok|x\.com|twitter|youtube|linkedin)", texto))
+        
+        # Evaluar palabras clave (todas las categorías en una sola pasada)
+        conteos = contar_palabras_clave(texto)
+    conteo_positivas = conteos["palabras_positivas"]
+    conteo_riesgos = conteos["palabras_riesgo"]
     
-    # Puntaje por años de experiencia (máximo 20 puntos)
-    # Limitar años de experiencia a un máximo de 10 años para el cálculo
-    años_limite = min(exp["años_experiencia"], 10)
-    años_puntaje = min(años_limite * pesos["años_experiencia"], 20)
-    puntaje += años_puntaje
+    # Penalización si no hay redes
+    if not redes_detectadas:
+        conteo_riesgos += PENALIZACION_SIN_REDES
     
-    # Puntaje por formación académica
-    formacion_pesos = {
-        "doctorado": 20,
-        "maestría": 15,
-        "licenciatura": 10,
-        "especialidad": 5,
-        "ninguno": 0
+    return {
+        "hash_pdf": hash_pdf,
+        "texto": texto,
+        "redes_detectadas": redes_detectadas,
+        "conteos": conteos,
+        "conteo_positivas": conteo_positivas,
+        "conteo_riesgos": conteo_riesgos
     }
-    puntaje += formacion_pesos.get(exp["formacion"]["nivel_maximo"], 0)
-    
-    # Puntaje por instituciones de formación (máximo 10 puntos)
-    puntaje += min(exp["formacion"]["instituciones"] * 2, 10)
-    
-    # Puntaje por palabras positivas (máximo 15 puntos)
-    puntaje += min(conteo_positivas * pesos["palabras_positivas"], 15)
+
+def _caracterizar_candidato(tarea, candidato, resultados_nlp):
+    """
+    Reúne las características de un candidato ya extraído; el puntaje se
+    calcula después para toda la sección con puntuar_seccion.
+    """
+    exp = analizar_experiencia(candidato["texto"], resultados_nlp, candidato["conteos"])
+    entidades = exp["entidades"]
+    competencias = exp["competencias"]
+    sentimiento = exp["sentimiento"]
+    return {
+        "poder": tarea["poder"],
+        "nombre": tarea["nombre"],
+        "url": tarea["url"],
+        "redes_sociales": candidato["redes_detectadas"],
+        **caracteristicas_candidato(exp, candidato["conteo_positivas"], candidato["conteo_riesgos"]),
+        "calidad_experiencia": exp["calidad_experiencia"],
+        "palabras_positivas": candidato["conteos"]["palabras_positivas"],
+        "palabras_riesgo": candidato["conteos"]["palabras_riesgo"],
+        "organizaciones": entidades["organizaciones"],
+        "num_personas": len(entidades["personas"]),
+        "num_lugares": len(entidades["lugares"]),
+        "num_fechas": len(entidades["fechas"]),
+        "competencias_tecnicas": competencias["técnicas"],
+        "competencias_blandas": competencias["blandas"],
+        "competencias_idiomas": competencias["idiomas"],
+        "sentimiento_compuesto": sentimiento["compound"],
+        "sentimiento_positivo": sentimiento["pos"],
+        "sentimiento_negativo": sentimiento["neg"],
+        "sentimiento_neutral": sentimiento["neu"]
+    }
+
+def puntuar_seccion(filas, tabla=None, puntos_formacion=None, perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Calcula los puntajes de una sección completa a partir de sus características.
     
-    # Penalización por palabras de riesgo
-    puntaje += conteo_riesgos * pesos["palabras_riesgo"]
+    Args:
+        filas (list | pandas.DataFrame): Características de _caracterizar_candidato
+            (o leídas del almacén), en el orden de salida
+        tabla (dict, opcional): Columna de salida -> (característica, peso,
+            tope); por defecto la del perfil de puntaje
+        puntos_formacion (dict, opcional): Puntos por nivel máximo de
+            formación; por defecto los del perfil de puntaje
+        perfil_puntaje (str): Perfil de PERFILES_PUNTAJE en config
+        
+    Returns:
+        pandas.DataFrame: Una fila por candidato con puntajes, aptitud y conteos
+    """
+    caracteristicas = pd.DataFrame(filas, columns=["poder", "nombre", "url", "redes_sociales"] + CARACTERISTICAS)
+    caracteristicas = caracteristicas.reset_index(drop=True)
+    perfil = obtener_perfil_puntaje(perfil_puntaje)
+    if tabla is None:
+        tabla = perfil["tabla"]
+    # El conteo guardado incluye PENALIZACION_SIN_REDES; el perfil puede usar otra
+    ajuste = perfil.get("penalizacion_sin_redes", PENALIZACION_SIN_REDES) - PENALIZACION_SIN_REDES
+    if ajuste:
+        sin_redes = ~caracteristicas["redes_sociales"].astype(bool)
+        caracteristicas["conteo_riesgos"] = caracteristicas["conteo_riesgos"] + ajuste * sin_redes.astype(int)
+    puntajes = puntuar_caracteristicas(caracteristicas, tabla, puntos_formacion, perfil_puntaje)
+    df = pd.concat([caracteristicas, puntajes], axis=1).rename(columns={
+        "poder": "Poder",
+        "nombre": "Nombre",
+        "url": "URL",
+        "conteo_riesgos": "Conteo Palabras Riesgo",
+        "conteo_positivas": "Conteo Palabras Positivas"
+    })
+    df["Redes Sociales"] = df["redes_sociales"].map({True: "Sí", False: "No"})
+    columnas = ["Poder", "Nombre", "URL", "Puntaje Total", "Aptitud"] + list(tabla) + [
+        "Conteo Palabras Riesgo", "Conteo Palabras Positivas", "Redes Sociales"
+    ]
+    return df[columnas].rename(columns=perfil.get("columnas", {}))
+
+def repuntuar_seccion(seccion, tabla=None, puntos_formacion=None, perfil_puntaje=PERFIL_PUNTAJE, candidatos=None):
+    """
+    Vuelve a puntuar una sección con otros pesos u otro perfil de puntaje sin
+    leer ningún PDF, usando el almacén de características (o el manifiesto si
+    pyarrow no está instalado). Solo se puntúan los candidatos actuales de la
+    sección: el almacén conserva también a los que ya salieron de la lista.
     
-    # Puntaje por calidad del texto (máximo 20 puntos)
-    puntaje += min(exp["calidad_texto"] * pesos["calidad_texto"], 20)
+    Args:
+        seccion (str): Nombre de la sección
+        tabla (dict, opcional): Columna de salida -> (característica, peso, tope)
+        puntos_formacion (dict, opcional): Puntos por nivel máximo de formación
+        perfil_puntaje (str): Perfil de PERFILES_PUNTAJE en config
+        candidatos (pandas.DataFrame o iterable, opcional): Candidatos actuales,
+            como DataFrame con las columnas 'Poder' y 'Nombre' (p. ej. de
+            leer_lista_seccion) o como claves de clave_candidato. Por defecto,
+            los del manifiesto de la última ejecución de la sección
+        
+    Returns:
+        pandas.DataFrame: Resultados de la sección
+    """
+    manifiesto = cargar_manifiesto(seccion)
+    if candidatos is None:
+        claves = set(manifiesto)
+    elif isinstance(candidatos, pd.DataFrame):
+        claves = {clave_candidato(poder, nombre) for poder, nombre in zip(candidatos["Poder"], candidatos["Nombre"])}
+    else:
+        claves = set(candidatos)
     
-    # Asegurar que el puntaje no sea negativo y no exceda 100
-    return max(0, min(puntaje, 100))
+    almacen = obtener_almacen()
+    if almacen is not None:
+        filas = almacen.leer([seccion])
+        actuales = pd.Series([clave_candidato(poder, nombre) for poder, nombre in zip(filas["poder"], filas["nombre"])],
+                             index=filas.index, dtype=object).isin(claves)
+        filas = filas[(filas["version"] == VERSION_PUNTAJE) & actuales]
+    else:
+        filas = [entrada["resultado"] for clave, entrada in manifiesto.items()
+                 if entrada.get("version") == VERSION_PUNTAJE and clave in claves]
+    return puntuar_seccion(filas, tabla, puntos_formacion, perfil_puntaje)
 
-def evaluar_aptitud(exp, conteo_riesgos):
-    """Evalúa la aptitud del candidato basado en formación y experiencia judicial, usando conteos pre-calculados."""
-    # --- Lógica de Evaluación de Aptitud (Formación y Experiencia Judicial) ---
-    nivel_formacion = exp["formacion"]["nivel_maximo"]
-    exp_judicial = exp["experiencia_judicial"]
+def _analizar_lote_seguro(textos, n_process, perfil=PERFIL_ANALISIS):
+    """
+    Analiza un lote con nlp.pipe. Si el lote falla, repite el análisis
+    documento por documento para que el error afecte solo a su candidato.
+    """
+    if perfil == "rapido":
+        analizar_texto = analizar_rapido
+    else:
+        analizador = obtener_analizador()
+        analizar_texto = partial(analizador.analizar_texto, perfil=perfil)
+        try:
+            return analizador.analizar_lote(textos, batch_size=NLP_BATCH_SIZE, n_process=n_process, perfil=perfil)
+        except Exception as e:
+            logging.warning(f"Fallo el análisis por lotes, se analizará documento por documento: {e}")
+    
+    resultados = []
+    for texto in textos:
+        try:
+            resultados.append(analizar_texto(texto))
+        except Exception as e:
+            resultados.append(e)
+    return resultados
 
-    logging.debug(f"Evaluando aptitud: Nivel Formación={nivel_formacion}, Exp Judicial Conteo={exp_judicial}, Riesgo Conteo={conteo_riesgos}")
+def extraer_candidato_seguro(tarea):
+    """
+    Extrae un candidato sin propagar errores.
+    
+    Returns:
+        tuple: (candidato, error); candidato es None si hubo error
+    """
+    if not os.path.exists(tarea["archivo_pdf"]):
+        return None, "PDF no disponible (la descarga falló)"
+    try:
+        return _extraer_candidato(tarea), None
+    except Exception as e:
+        return None, str(e)
 
-    aptitud = "No Apto"
+def puntuar_lote(extraidos, n_process=NLP_N_PROCESS, perfil=PERFIL_ANALISIS):
+    """
+    Analiza con nlp.pipe un lote de candidatos ya extraídos y reúne sus
+    características. El puntaje se calcula después, para toda la sección,
+    con puntuar_seccion.
+    
+    Un error en un candidato no interrumpe el resto del lote.
+    
+    Args:
+        extraidos (list): Tuplas (tarea, candidato, error) como las que
+            devuelve extraer_candidato_seguro junto a su tarea
+        n_process (int): Procesos que usa spaCy para el lote
+        perfil (str): Perfil del análisis NLP
+        
+    Returns:
+        list: Por cada candidato, en el mismo orden, un diccionario con
+            'resultado' (características), 'hash_pdf' y 'error' (None si no hubo error)
+    """
+    salidas = [
+        {"resultado": None, "hash_pdf": candidato["hash_pdf"] if candidato else None, "error": error}
+        for _, candidato, error in extraidos
+    ]
+    validos = [(i, tarea, candidato) for i, (tarea, candidato, error) in enumerate(extraidos) if error is None]
+    
+    # Análisis NLP del lote completo con nlp.pipe
+    analisis_nlp = _analizar_lote_seguro([candidato["texto"] for _, _, candidato in validos], n_process, perfil)
+    
+    for (i, tarea, candidato), resultados_nlp in zip(validos, analisis_nlp):
+        try:
+            if isinstance(resultados_nlp, Exception):
+                raise resultados_nlp
+            salidas[i]["resultado"] = _caracterizar_candidato(tarea, candidato, resultados_nlp)
+        except Exception as e:
+            salidas[i]["error"] = str(e)
+    
+    return salidas
 
-    # Criterio para Apto - Más estricto
-    # Nivel Doctorado, >= 8 judicial, 0 riesgos
-    if nivel_formacion == "doctorado" and exp_judicial >= 8 and conteo_riesgos == 0:
-        aptitud = "Apto"
-    # Criterio para Observado - Más estricto
-    # Nivel Maestría o superior, >= 5 judicial, 0 riesgos
-    elif nivel_formacion in ["maestría", "doctorado"] and exp_judicial >= 5 and conteo_riesgos == 0:
-        aptitud = "Observado"
+def evaluar_candidatos(tareas, n_process=NLP_N_PROCESS, perfil=PERFIL_ANALISIS):
+    """
+    Extrae, analiza y puntúa una lista de candidatos cuyos PDFs ya están descargados.
+    
+    Args:
+        tareas (list): Diccionarios con 'idx', 'total', 'poder', 'nombre',
+            'url' y 'archivo_pdf'
+        n_process (int): Procesos que usa spaCy para el lote
+        perfil (str): Perfil del análisis NLP
+        
+    Returns:
+        list: Salidas de puntuar_lote, en el mismo orden que las tareas
+    """
+    return puntuar_lote([(tarea,) + extraer_candidato_seguro(tarea) for tarea in tareas], n_process, perfil)
 
-    logging.debug(f"Resultado Aptitud: {aptitud}")
-    return aptitud
+def evaluar_candidatos_en_worker(tareas, perfil=PERFIL_ANALISIS):
+    """
+    Evalúa un lote de candidatos en un worker del pool de procesos.
+    
+    Returns:
+        tuple: (salidas de evaluar_candidatos, métricas acumuladas por el
+            worker desde el lote anterior)
+    """
+    return evaluar_candidatos(tareas, n_process=1, perfil=perfil), obtener_metricas().extraer()
 
-def procesar_seccion(seccion, archivo_entrada, archivo_salida, log_file):
-    """Procesa una sección específica de candidatos."""
-    logging.info(f"Procesando sección: {seccion}")
+def revalidar_pdfs(urls, max_edad=DESCARGA_MAX_EDAD, indice=None, descargador=None):
+    """
+    Revalida con peticiones condicionales las copias locales de los PDFs
+    cuya última validación es más antigua que max_edad. Solo se transfieren
+    los PDFs que cambiaron en el servidor; esos se reemplazan y se vuelven a
+    indexar con su nuevo hash, de modo que las cachés de texto y
+    características se invalidan solo para ellos.
+    
+    Args:
+        urls (iterable): URLs de los PDFs
+        max_edad (float): Segundos de vigencia de una validación; None para no revalidar
+        indice (IndicePDF, opcional): Índice a usar; por defecto el compartido
+        descargador (DescargadorPDF, opcional): Descargador a usar; por defecto el compartido
+        
+    Returns:
+        int: Número de PDFs que cambiaron
+    """
+    if indice is None:
+        indice = obtener_indice_pdfs()
+    if descargador is None:
+        descargador = obtener_descargador()
+    entradas = indice.por_revalidar(urls, max_edad)
+    if not entradas:
+        return 0
     
-    # Asegurar que el archivo de salida tenga extensión .xlsx
-    archivo_salida = os.path.splitext(archivo_salida)[0] + '.xlsx'
+    cambiados = 0
+    with obtener_metricas().cronometro("revalidacion"):
+        resultados = descargador.revalidar_todos(entradas)
+    for entrada, resultado in zip(entradas, resultados):
+        if not resultado["ok"]:
+            # Sin respuesta del servidor se conserva la copia local
+            continue
+        if resultado["modificado"]:
+            indice.registrar(entrada["url"], entrada["ruta"], validadores=resultado)
+            cambiados += 1
+        else:
+            indice.marcar_validado(entrada["url"])
+    logging.info(f"Revalidación: {len(entradas)} PDFs consultados, {cambiados} con cambios")
+    return cambiados
+
+def leer_lista_seccion(archivo_entrada):
+    """
+    Carga la lista de candidatos de una sección.
     
+    Args:
+        archivo_entrada (str): Ruta con el prefijo del archivo .xlsx; si hay
+            varios archivos con ese prefijo se usa el más reciente
+        
+    Returns:
+        pd.DataFrame: Candidatos con las columnas 'Poder', 'Nombre' y 'URL',
+            o None si no se encontró o no se pudo leer el archivo
+    """
     # Obtener el directorio y el prefijo del archivo
     directorio = os.path.dirname(archivo_entrada)
     prefijo = os.path.basename(archivo_entrada).replace('.xlsx', '')
@@ -184,7 +470,7 @@ def procesar_seccion(seccion, archivo_entrada, archivo_salida, log_file):
     
     if not archivos_coincidentes:
         logging.error(f"No se encontraron archivos con prefijo {prefijo} en {directorio}")
-        return
+        return None
     
     # Usar el archivo más reciente si hay múltiples coincidencias
     archivo_entrada = max(archivos_coincidentes, key=os.path.getctime)
@@ -192,150 +478,262 @@ def procesar_seccion(seccion, archivo_entrada, archivo_salida, log_file):
     
     # Cargar Excel
     try:
-        df = pd.read_excel(archivo_entrada)
+        with obtener_metricas().cronometro("carga_excel"):
+            df = pd.read_excel(archivo_entrada)
         df.columns = [col.strip() for col in df.columns]
-        df = df.rename(columns={df.columns[0]: "Poder", df.columns[1]: "Nombre", df.columns[2]: "URL"})
+        return df.rename(columns={df.columns[0]: "Poder", df.columns[1]: "Nombre", df.columns[2]: "URL"})
     except Exception as e:
         logging.error(f"Error al cargar {archivo_entrada}: {e}")
+        return None
+
+def ubicar_pdf(url_pdf, indice):
+    """
+    Devuelve la ruta local del PDF de una URL y su hash, si ya se conoce.
+    El índice evita volver a calcular el hash de los PDFs que no cambiaron.
+    
+    Returns:
+        tuple: (ruta del PDF, hash o None)
+    """
+    pdf_indexado = indice.buscar(url_pdf)
+    if pdf_indexado is not None:
+        obtener_metricas().incrementar("indice_pdfs_aciertos")
+        return pdf_indexado["ruta"], pdf_indexado["hash"]
+    obtener_metricas().incrementar("indice_pdfs_fallos")
+    return os.path.join(PDF_DIR, os.path.basename(urlparse(url_pdf).path)), None
+
+def escribir_lote(escritor, lote, perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Puntúa un lote de características y escribe sus filas.
+    
+    Args:
+        escritor: Escritor de resultados (ver salida.abrir_escritor)
+        lote (list): Características de los candidatos, en orden de salida
+        perfil_puntaje (str): Perfil de PERFILES_PUNTAJE en config
+    """
+    metricas = obtener_metricas()
+    with metricas.cronometro("puntaje"):
+        filas = puntuar_seccion(lote, perfil_puntaje=perfil_puntaje).to_dict("records")
+    with metricas.cronometro("escritura"):
+        escritor.escribir_filas(filas)
+    metricas.incrementar("filas_escritas", len(filas))
+
+def procesar_seccion(seccion, archivo_entrada, archivo_salida, log_file, incremental=False,
+                     workers=1, executor=None, formato=FORMATO_RESULTADOS, exportar_excel=EXPORTAR_EXCEL,
+                     perfil=PERFIL_ANALISIS, reanudar=False, max_intentos=REANUDAR_MAX_INTENTOS,
+                     perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Procesa una sección específica de candidatos: lee su lista de
+    candidatos y la evalúa con evaluar_seccion.
+    
+    Returns:
+        str: Ruta del archivo de resultados, o None si no se pudo leer la entrada
+    """
+    logging.info(f"Procesando sección: {seccion}")
+    
+    df = leer_lista_seccion(archivo_entrada)
+    if df is None:
         return
     
-    # Resultados
-    resultados = []
+    return evaluar_seccion(seccion, df, archivo_salida, incremental=incremental, workers=workers,
+                           executor=executor, formato=formato, exportar_excel=exportar_excel,
+                           perfil=perfil, reanudar=reanudar, max_intentos=max_intentos,
+                           perfil_puntaje=perfil_puntaje)
+
+def evaluar_seccion(seccion, df, archivo_salida, incremental=False, workers=1, executor=None,
+                    formato=FORMATO_RESULTADOS, exportar_excel=EXPORTAR_EXCEL, perfil=PERFIL_ANALISIS,
+                    reanudar=False, max_intentos=REANUDAR_MAX_INTENTOS, perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Evalúa los candidatos de una sección. Es el núcleo común de todos los
+    puntos de entrada: descarga en PDF_DIR con el índice de PDFs, la caché de
+    texto y el análisis NLP compartidos, y puntaje con un perfil con nombre.
+    
+    Los resultados se puntúan y escriben en lotes a medida que terminan los
+    candidatos, en el formato indicado ("csv", "jsonl" o "parquet"). Con
+    exportar_excel=True, al final se genera además un .xlsx con una hoja
+    para la sección.
+    
+    Con incremental=True se reutilizan los resultados del manifiesto de la
+    ejecución anterior para los candidatos cuya URL, PDF, configuración de
+    palabras clave y versión de puntaje no cambiaron.
+    
+    Con workers > 1 la extracción y el puntaje se reparten entre procesos.
+    Se puede pasar un ProcessPoolExecutor ya creado (inicializado con
+    inicializar_worker) para reutilizar sus workers en varias secciones.
+    
+    El perfil ("rapido", "estandar" o "completo") elige cuánto análisis NLP
+    se hace por candidato; ver PERFIL_ANALISIS en config. El perfil de
+    puntaje ("judicial" o "ine") elige pesos, topes y criterios de aptitud;
+    ver PERFILES_PUNTAJE en config. Las características guardadas no
+    dependen de él.
+    
+    El resultado de cada candidato se registra en la bitácora de la sección
+    en cuanto termina. Con reanudar=True se continúa la ejecución anterior:
+    los candidatos ya completados (con la misma URL, PDF y configuración) no
+    se vuelven a evaluar y los que fallaron se reintentan hasta acumular
+    max_intentos fallos. El archivo de resultados es el mismo que el de una
+    ejecución sin interrupciones.
+    
+    Args:
+        seccion (str): Nombre de la sección (manifiesto, bitácora y almacén)
+        df (pd.DataFrame): Candidatos con las columnas 'Poder', 'Nombre' y 'URL'
+        archivo_salida (str): Ruta base del archivo de resultados
+        
+    Returns:
+        str: Ruta del archivo de resultados
+    """
+    obtener_perfil_puntaje(perfil_puntaje)  # Falla antes de evaluar si el perfil no existe
+    metricas = obtener_metricas()
+    
     total_candidatos = len(df)
     
     logging.info(f"Total de candidatos a procesar: {total_candidatos}")
     
+    manifiesto_previo = cargar_manifiesto(seccion) if incremental else {}
+    completados_previos, fallos_previos = leer_bitacora(seccion) if reanudar else ({}, {})
+    if reanudar:
+        logging.info(f"Reanudando {seccion}: {len(completados_previos)} candidatos completados en la bitácora")
+    manifiesto = {}
+    hash_config = hash_configuracion(perfil)
+    reutilizados = []
+    evaluados = []
+    indice = obtener_indice_pdfs()
+    
+    # Consultar al servidor solo por las copias locales cuya validación expiró
+    revalidar_pdfs(url for url in df["URL"] if isinstance(url, str) and url.lower().endswith(".pdf"))
+    
+    # Seleccionar los candidatos a evaluar
+    tareas = []
     for idx, row in df.iterrows():
         nombre = row["Nombre"]
         url_pdf = row["URL"]
-        poder = row["Poder"]
-        
-        logging.info(f"Procesando candidato {idx + 1}/{total_candidatos}: {nombre}")
+        clave = clave_candidato(row["Poder"], nombre)
         
         if not isinstance(url_pdf, str) or not url_pdf.lower().endswith(".pdf"):
             logging.warning(f"URL inválida para {nombre}")
+            metricas.incrementar("urls_invalidas")
             continue
         
-        archivo_pdf = os.path.join(PDF_DIR, os.path.basename(urlparse(url_pdf).path))
+        archivo_pdf, hash_pdf = ubicar_pdf(url_pdf, indice)
         
-        # Descargar PDF si no existe
-        if not os.path.exists(archivo_pdf):
-            logging.info(f"Descargando PDF de {nombre}...")
-            try:
-                r = requests.get(url_pdf)
-                with open(archivo_pdf, "wb") as f:
-                    f.write(r.content)
-            except Exception as e:
-                logging.error(f"Error al descargar {url_pdf}: {e}")
+        # Reutilizar el resultado de la ejecución interrumpida o de la anterior
+        # si ninguna entrada del candidato cambió
+        reutilizado = False
+        for entrada, de_bitacora in ((completados_previos.get(clave), True),
+                                     (manifiesto_previo.get(clave), False)):
+            if not entrada_vigente(entrada, url_pdf, hash_config) or not os.path.exists(archivo_pdf):
                 continue
-        else:
-            logging.info(f"PDF ya existe: {archivo_pdf}")
-        
-        # Leer texto del PDF
-        try:
-            reader = PdfReader(archivo_pdf)
-            texto = "".join(page.extract_text() or "" for page in reader.pages).lower()
-        except Exception as e:
-            logging.error(f"Error al leer {archivo_pdf}: {e}")
-            texto = ""
-        
-        # Detectar redes sociales
-        redes_detectadas = bool(re.search(r"(facebook|instagram|tiktok|x\.com|twitter|youtube|linkedin)", texto))
-        
-        # Evaluar palabras clave
-        conteo_positivas = sum(texto.count(p) for p in palabras_positivas)
-        conteo_riesgos = sum(texto.count(p) for p in palabras_riesgo)
-        
-        # Penalización si no hay redes
-        if not redes_detectadas:
-            conteo_riesgos += 1 # Penalización
-        
-        # Análisis de experiencia
-        exp = analizar_experiencia(texto)
-        
-        # Calcular puntajes individuales
-        puntaje_judicial = min(exp["experiencia_judicial"] * 3.0, 30)
-        puntaje_docente = min(exp["experiencia_docente"] * 2.0, 20)
-        puntaje_investigacion = min(exp["experiencia_investigacion"] * 1.5, 15)
-        puntaje_administrativa = min(exp["experiencia_administrativa"] * 1.0, 10)
-        puntaje_años = min(exp["años_experiencia"] * 2.0, 20)
-        
-        # Puntaje por formación académica
-        formacion_pesos = {
-            "doctorado": 20,
-            "maestría": 15,
-            "licenciatura": 10,
-            "especialidad": 5,
-            "ninguno": 0
-        }
-        puntaje_formacion = formacion_pesos.get(exp["formacion"]["nivel_maximo"], 0)
-        
-        # Puntaje por instituciones de formación
-        puntaje_instituciones = min(exp["formacion"]["instituciones"] * 2, 10)
-        
-        # Puntaje por palabras positivas
-        puntaje_positivas = min(conteo_positivas * 1.5, 15)
-        
-        # Penalización por palabras de riesgo
-        puntaje_riesgos = conteo_riesgos * -2.0
-        
-        # Puntaje por calidad del texto
-        puntaje_calidad = min(exp["calidad_texto"] * 1.0, 20)
-        
-        # Calcular puntaje total
-        puntaje_total = (
-            puntaje_judicial +
-            puntaje_docente +
-            puntaje_investigacion +
-            puntaje_administrativa +
-            puntaje_años +
-            puntaje_formacion +
-            puntaje_instituciones +
-            puntaje_positivas +
-            puntaje_riesgos +
-            puntaje_calidad
-        )
-        
-        # Asegurar que el puntaje no sea negativo y no exceda 100
-        puntaje_total = max(0, min(puntaje_total, 100))
+            hash_pdf = hash_pdf or hash_archivo(archivo_pdf)
+            if hash_pdf == entrada["hash_pdf"]:
+                reutilizados.append((idx, entrada["resultado"]))
+                manifiesto[clave] = entrada
+                indice.registrar(url_pdf, archivo_pdf, candidato=f"{seccion}/{clave}", hash_pdf=hash_pdf)
+                if de_bitacora:
+                    # Evaluado en esta ejecución lógica: va también al almacén
+                    evaluados.append({**entrada["resultado"], "hash_pdf": hash_pdf,
+                                      "hash_config": hash_config, "version": VERSION_PUNTAJE})
+                reutilizado = True
+                break
+        if reutilizado:
+            continue
         
-        # Evaluar aptitud
-        aptitud = evaluar_aptitud(exp, conteo_riesgos)
+        if fallos_previos.get(clave, 0) >= max_intentos:
+            logging.warning(f"Se omite a {nombre}: falló {fallos_previos[clave]} veces")
+            metricas.incrementar("candidatos_omitidos")
+            continue
         
-        # Agregar resultados
-        resultados.append({
-            "Poder": poder,
-            "Nombre": nombre,
-            "URL": url_pdf,
-            "Puntaje Total": puntaje_total,
-            "Aptitud": aptitud,
-            "Puntaje Judicial": puntaje_judicial,
-            "Puntaje Docente": puntaje_docente,
-            "Puntaje Investigación": puntaje_investigacion,
-            "Puntaje Administrativa": puntaje_administrativa,
-            "Puntaje Años": puntaje_años,
-            "Puntaje Formación": puntaje_formacion,
-            "Puntaje Instituciones": puntaje_instituciones,
-            "Puntaje Positivas": puntaje_positivas,
-            "Puntaje Riesgos": puntaje_riesgos,
-            "Puntaje Calidad": puntaje_calidad,
-            "Conteo Palabras Riesgo": conteo_riesgos,
-            "Conteo Palabras Positivas": conteo_positivas,
-            "Redes Sociales": "Sí" if redes_detectadas else "No"
+        tareas.append({
+            "idx": idx,
+            "total": total_candidatos,
+            "poder": row["Poder"],
+            "nombre": nombre,
+            "clave": clave,
+            "url": url_pdf,
+            "archivo_pdf": archivo_pdf,
+            "hash_pdf": hash_pdf
         })
     
-    # Crear DataFrame con resultados
-    df_resultados = pd.DataFrame(resultados)
+    metricas.incrementar("candidatos_reutilizados", len(reutilizados))
+    if incremental:
+        logging.info(f"Modo incremental: {len(reutilizados)} candidatos sin cambios, {len(tareas)} por evaluar")
+    
+    # Descarga, extracción, análisis NLP/puntaje y escritura corren como
+    # etapas simultáneas. Con workers > 1 la extracción y el puntaje se
+    # reparten en lotes entre los procesos del pool.
+    executor_propio = None
+    if executor is None and workers > 1:
+        executor = executor_propio = ProcessPoolExecutor(max_workers=workers, initializer=inicializar_worker,
+                                                         initargs=(perfil,))
+    
+    pipeline = PipelineSeccion(
+        tareas,
+        extraer=extraer_candidato_seguro,
+        puntuar_lote=partial(puntuar_lote, perfil=perfil),
+        evaluar_lote=partial(evaluar_candidatos_en_worker, perfil=perfil),
+        executor=executor
+    )
+    
+    def evaluados_en_orden():
+        """Entrega (idx, características) de los candidatos evaluados sin error."""
+        terminados = 0
+        for tarea, salida in pipeline.ejecutar():
+            terminados += 1
+            if terminados % LOG_PROGRESO_CADA == 0 or terminados == len(tareas):
+                logging.info(f"{seccion}: {terminados}/{len(tareas)} candidatos evaluados")
+            if salida["error"] is not None:
+                logging.error(f"Error al evaluar a {tarea['nombre']}: {salida['error']}")
+                metricas.incrementar("candidatos_error")
+                bitacora.registrar_error(tarea["clave"], tarea["url"], salida["error"])
+                continue
+            # Solo llegan aquí los candidatos cuyo PDF se leyó; una extracción
+            # fallida es un error y se reintenta al reanudar
+            metricas.incrementar("candidatos_evaluados")
+            bitacora.registrar_completado(tarea["clave"], tarea["url"], salida["hash_pdf"],
+                                          salida["resultado"], hash_config)
+            indice.registrar(tarea["url"], tarea["archivo_pdf"], candidato=f"{seccion}/{tarea['clave']}",
+                             hash_pdf=salida["hash_pdf"], validadores=tarea.get("validadores"))
+            manifiesto[tarea["clave"]] = crear_entrada(tarea["url"], salida["hash_pdf"], salida["resultado"], hash_config)
+            evaluados.append({**salida["resultado"], "hash_pdf": salida["hash_pdf"],
+                              "hash_config": hash_config, "version": VERSION_PUNTAJE})
+            yield tarea["idx"], salida["resultado"]
+    
+    # Intercalar los resultados reutilizados y los nuevos en el orden del archivo
+    # de entrada, y puntuar y escribir cada lote en cuanto está completo
+    bitacora = BitacoraSeccion(seccion, reanudar=reanudar)
+    escritor = abrir_escritor(archivo_salida, formato)
     
-    # Guardar resultados en Excel
     try:
-        # Si el archivo ya existe, cargarlo y agregar nueva hoja
-        if os.path.exists(archivo_salida):
-            with pd.ExcelWriter(archivo_salida, engine='openpyxl', mode='a') as writer:
-                df_resultados.to_excel(writer, sheet_name=seccion, index=False)
-        else:
-            # Si no existe, crear nuevo archivo
-            df_resultados.to_excel(archivo_salida, sheet_name=seccion, index=False)
-        logging.info(f"Resultados guardados en hoja '{seccion}' de {archivo_salida}")
-    except Exception as e:
-        logging.error(f"Error al guardar resultados en {archivo_salida}: {e}") 
\ No newline at end of file
+        with escritor:
+            lote = []
+            for _, fila in heapq.merge(reutilizados, evaluados_en_orden(), key=lambda r: r[0]):
+                lote.append(fila)
+                if len(lote) >= ESCRITURA_LOTE:
+                    escribir_lote(escritor, lote, perfil_puntaje)
+                    lote = []
+            if lote:
+                escribir_lote(escritor, lote, perfil_puntaje)
+    finally:
+        if executor_propio is not None:
+            executor_propio.shutdown()
+        bitacora.cerrar()
+        guardar_manifiesto(seccion, manifiesto)
+        indice.guardar()
+        
+        # Guardar las características de los candidatos evaluados en esta ejecución
+        almacen = obtener_almacen()
+        if almacen is not None:
+            try:
+                with metricas.cronometro("almacen_caracteristicas"):
+                    almacen.agregar(seccion, evaluados)
+            except Exception as e:
+                logging.error(f"Error al guardar características de {seccion}: {e}")
+    
+    # Exportación final a Excel, escrita una sola vez
+    if exportar_excel:
+        archivo_excel = os.path.splitext(archivo_salida)[0] + ".xlsx"
+        try:
+            with metricas.cronometro("exportacion_excel"):
+                exportar_excel_resultados(escritor.ruta, archivo_excel, hoja=seccion)
+        except Exception as e:
+            logging.error(f"Error al exportar resultados a {archivo_excel}: {e}")
+    
+    return escritor.ruta
@@ -0,0 +1,390 @@
+"""
+Evaluación asíncrona de secciones con asyncio.
+Pensada para ejecutarse dentro de un bucle de eventos existente (por ejemplo,
+el de un ejecutor de trabajos asíncrono) sin bloquearlo: los PDFs se
+descargan con aiohttp si está instalado (si no, con DescargadorPDF en un
+hilo) y la lectura de listas, la extracción de texto, el análisis NLP y la
+escritura de resultados corren en executors.
+
+A diferencia de procesar_seccion, admite cancelación y un plazo por
+candidato. Cancelar la tarea de evaluar_async detiene las descargas en
+curso y deja de enviar candidatos al executor; el trabajo que un worker ya
+empezó no se interrumpe, pero su resultado se descarta. Los archivos
+parciales (.part) quedan en disco y la próxima descarga los reanuda.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from functools import partial
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import (
+    PERFIL_ANALISIS,
+    PERFIL_PUNTAJE,
+    FORMATO_RESULTADOS,
+    ESCRITURA_LOTE,
+    ASYNC_CONCURRENCIA,
+    ASYNC_PLAZO_CANDIDATO,
+    DESCARGA_MAX_POR_HOST,
+    DESCARGA_TIMEOUT,
+    DESCARGA_REINTENTOS,
+    DESCARGA_BACKOFF,
+    DESCARGA_MAX_EDAD,
+    archivos_entrada,
+    archivos_salida
+)
+from .descargas import (
+    CODIGOS_REINTENTABLES,
+    TAMANO_BLOQUE,
+    obtener_descargador,
+    leer_validador_parcial,
+    guardar_validador_parcial,
+    borrar_validador_parcial
+)
+from .evaluador import (
+    leer_lista_seccion,
+    clave_candidato,
+    ubicar_pdf,
+    evaluar_candidatos,
+    evaluar_candidatos_en_worker,
+    escribir_lote
+)
+from .indice_pdfs import obtener_indice_pdfs
+from .metricas import obtener_metricas
+from .salida import abrir_escritor
+
+def aiohttp_disponible():
+    """Indica si aiohttp está instalado."""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+class DescargadorAsync:
+    def __init__(self, sesion=None, max_por_host=DESCARGA_MAX_POR_HOST, timeout=DESCARGA_TIMEOUT,
+                 reintentos=DESCARGA_REINTENTOS, backoff=DESCARGA_BACKOFF):
+        """
+        Descargador asíncrono con las mismas reglas que DescargadorPDF
+        (límite por host, reintentos con espera exponencial, archivos .part
+        reanudados con If-Range y revalidación condicional con 304).
+        Se usa como contexto asíncrono: `async with DescargadorAsync() as d`.
+
+        Args:
+            sesion (aiohttp.ClientSession, opcional): Sesión a utilizar; si no
+                se indica y aiohttp está instalado, se crea una propia
+            max_por_host (int): Descargas simultáneas por host
+            timeout (tuple): Tiempo máximo (conexión, lectura) en segundos
+            reintentos (int): Reintentos ante errores de red o respuestas 5xx/429
+            backoff (float): Espera base en segundos; se duplica en cada reintento
+        """
+        self.sesion = sesion
+        self.max_por_host = max_por_host
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self._sesion_propia = False
+        self._semaforos = {}
+
+    async def __aenter__(self):
+        if self.sesion is None and aiohttp_disponible():
+            import aiohttp
+            conexion, lectura = self.timeout
+            self.sesion = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=conexion, sock_read=lectura)
+            )
+            self._sesion_propia = True
+        elif self.sesion is None:
+            logging.info("aiohttp no está instalado; las descargas usarán DescargadorPDF en hilos")
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._sesion_propia:
+            await self.sesion.close()
+
+    def _semaforo_host(self, url):
+        """Devuelve el semáforo que limita las descargas simultáneas al host de la URL."""
+        host = urlparse(url).netloc
+        if host not in self._semaforos:
+            self._semaforos[host] = asyncio.Semaphore(self.max_por_host)
+        return self._semaforos[host]
+
+    async def descargar(self, url, destino, validadores=None):
+        """
+        Descarga una URL a un archivo local, como DescargadorPDF.descargar.
+
+        Args:
+            url (str): URL del PDF
+            destino (str): Ruta final del archivo
+            validadores (dict, opcional): 'etag' y/o 'last_modified' de la
+                copia local; con ellos la petición es condicional
+
+        Returns:
+            dict: Resultado con las claves de DescargadorPDF.descargar
+        """
+        if self.sesion is None:
+            return await asyncio.to_thread(obtener_descargador().descargar, url, destino, validadores)
+
+        import aiohttp
+
+        resultado = {"url": url, "destino": destino, "ok": False, "bytes": 0, "modificado": True,
+                     "etag": None, "last_modified": None, "error": None}
+        parcial = destino + ".part"
+        metricas = obtener_metricas()
+        async with self._semaforo_host(url):
+            inicio = time.perf_counter()
+            for intento in range(self.reintentos + 1):
+                try:
+                    bytes_descargados, cabeceras = await self._descargar_parcial(url, parcial, validadores or {})
+                    resultado["etag"] = cabeceras.get("ETag")
+                    resultado["last_modified"] = cabeceras.get("Last-Modified")
+                    if bytes_descargados is None:
+                        resultado["modificado"] = False
+                    else:
+                        resultado["bytes"] = bytes_descargados
+                        os.replace(parcial, destino)
+                        borrar_validador_parcial(parcial)
+                    resultado.update(ok=True, error=None)
+                    break
+                except aiohttp.ClientResponseError as e:
+                    resultado["error"] = str(e)
+                    if e.status not in CODIGOS_REINTENTABLES:
+                        break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    resultado["error"] = str(e) or type(e).__name__
+                except OSError as e:
+                    resultado["error"] = str(e)
+                    break
+
+                if intento < self.reintentos:
+                    metricas.incrementar("descarga_reintentos")
+                    espera = self.backoff * (2 ** intento) * (1 + random.random() * 0.1)
+                    logging.warning(f"Reintentando {url} en {espera:.1f}s ({resultado['error']})")
+                    await asyncio.sleep(espera)
+            metricas.registrar_tiempo("descarga", time.perf_counter() - inicio)
+
+        if not resultado["ok"]:
+            metricas.incrementar("descarga_errores")
+            logging.error(f"Error al descargar {url}: {resultado['error']}")
+        elif not resultado["modificado"]:
+            metricas.incrementar("descarga_no_modificados")
+        else:
+            metricas.incrementar("descarga_completadas")
+        return resultado
+
+    async def _descargar_parcial(self, url, parcial, validadores):
+        """
+        Descarga (o reanuda) la URL en el archivo parcial.
+
+        Returns:
+            tuple: (bytes totales, cabeceras de la respuesta); los bytes son
+                None si el servidor respondió 304 (sin cambios)
+        """
+        existentes = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+        validador_parcial = leer_validador_parcial(parcial) if existentes else None
+        if existentes and validador_parcial is None:
+            # Sin validador no se puede saber si el recurso cambió: se reinicia
+            logging.debug(f"Se descarta {parcial}: no hay validador para reanudarlo")
+            os.remove(parcial)
+            existentes = 0
+        cabeceras = {}
+        if existentes:
+            cabeceras["Range"] = f"bytes={existentes}-"
+            cabeceras["If-Range"] = validador_parcial
+        else:
+            if validadores.get("etag"):
+                cabeceras["If-None-Match"] = validadores["etag"]
+            if validadores.get("last_modified"):
+                cabeceras["If-Modified-Since"] = validadores["last_modified"]
+        async with self.sesion.get(url, headers=cabeceras) as r:
+            if r.status == 304:
+                return None, r.headers
+            if r.status == 416:
+                # El archivo parcial ya contiene el recurso completo
+                return existentes, r.headers
+            r.raise_for_status()
+
+            # Si el servidor ignora Range, se descarga desde el inicio
+            if r.status != 206:
+                existentes = 0
+                guardar_validador_parcial(parcial, r.headers)
+            recibidos = 0
+            try:
+                with open(parcial, "ab" if existentes else "wb") as f:
+                    async for bloque in r.content.iter_chunked(TAMANO_BLOQUE):
+                        f.write(bloque)
+                        recibidos += len(bloque)
+            finally:
+                obtener_metricas().incrementar("descarga_bytes", recibidos)
+            return existentes + recibidos, r.headers
+
+async def evaluar_async(secciones=None, executor=None, concurrencia=ASYNC_CONCURRENCIA,
+                        plazo=ASYNC_PLAZO_CANDIDATO, perfil=PERFIL_ANALISIS, formato=FORMATO_RESULTADOS,
+                        descargador=None, perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Evalúa secciones de candidatos sin bloquear el bucle de eventos.
+
+    Las secciones se procesan a la vez y un único semáforo limita los
+    candidatos en curso en todas ellas. Cada candidato se descarga si hace
+    falta y se extrae, analiza y caracteriza en el executor; el puntaje y la
+    escritura se hacen al final de cada sección, en el orden de la lista.
+
+    Args:
+        secciones (iterable o dict, opcional): Nombres de sección de
+            archivos_entrada, o diccionario sección -> (archivo de entrada,
+            archivo de salida). Por defecto, todas las secciones
+        executor (Executor, opcional): Executor para extracción y NLP; un
+            ProcessPoolExecutor debe iniciarse con inicializar_worker. Por
+            defecto, el executor de hilos del bucle
+        concurrencia (int): Candidatos en curso a la vez
+        plazo (float, opcional): Segundos máximos por candidato, incluida la
+            descarga; al vencer, el candidato se registra con error
+        perfil (str): Perfil del análisis NLP
+        formato (str): "csv", "jsonl" o "parquet"
+        descargador (DescargadorAsync, opcional): Descargador ya abierto
+        perfil_puntaje (str): Perfil de puntaje de PERFILES_PUNTAJE en config
+
+    Returns:
+        dict: Sección -> ruta del archivo de resultados (None si no se pudo
+            leer la lista de la sección)
+    """
+    if secciones is None:
+        secciones = list(archivos_entrada)
+    if not isinstance(secciones, dict):
+        secciones = {seccion: (archivos_entrada[seccion], archivos_salida[seccion]) for seccion in secciones}
+
+    if descargador is None:
+        async with DescargadorAsync() as descargador:
+            return await evaluar_async(secciones, executor, concurrencia, plazo, perfil, formato, descargador,
+                                       perfil_puntaje)
+
+    evaluacion = _EvaluacionAsync(executor, asyncio.Semaphore(concurrencia), plazo, perfil, descargador,
+                                  perfil_puntaje)
+    rutas = await asyncio.gather(*(
+        evaluacion.evaluar_seccion(seccion, entrada, salida, formato)
+        for seccion, (entrada, salida) in secciones.items()
+    ))
+    await asyncio.to_thread(obtener_indice_pdfs().guardar)
+    return dict(zip(secciones, rutas))
+
+class _EvaluacionAsync:
+    """Estado compartido por las secciones de una llamada a evaluar_async."""
+
+    def __init__(self, executor, semaforo, plazo, perfil, descargador, perfil_puntaje=PERFIL_PUNTAJE):
+        self.executor = executor
+        self.semaforo = semaforo
+        self.plazo = plazo
+        self.perfil = perfil
+        self.descargador = descargador
+        self.perfil_puntaje = perfil_puntaje
+        self.indice = obtener_indice_pdfs()
+
+    async def evaluar_seccion(self, seccion, archivo_entrada, archivo_salida, formato):
+        """Evalúa una sección y devuelve la ruta de sus resultados."""
+        logging.info(f"Procesando sección (asíncrono): {seccion}")
+        metricas = obtener_metricas()
+        df = await asyncio.to_thread(leer_lista_seccion, archivo_entrada)
+        if df is None:
+            return None
+
+        await self._revalidar([url for url in df["URL"] if isinstance(url, str) and url.lower().endswith(".pdf")])
+        tareas = await asyncio.to_thread(self._preparar_tareas, df)
+
+        salidas = await asyncio.gather(*(self.evaluar_candidato(tarea) for tarea in tareas))
+
+        filas = []
+        for tarea, salida in zip(tareas, salidas):
+            if salida["error"] is not None:
+                logging.error(f"Error al evaluar a {tarea['nombre']}: {salida['error']}")
+                metricas.incrementar("candidatos_error")
+                continue
+            metricas.incrementar("candidatos_evaluados")
+            filas.append(salida["resultado"])
+        return await asyncio.to_thread(self._escribir, seccion, tareas, salidas, filas, archivo_salida, formato)
+
+    async def _revalidar(self, urls):
+        """
+        Revalida con peticiones condicionales las copias locales cuya
+        validación expiró, como revalidar_pdfs.
+        """
+        entradas = await asyncio.to_thread(self.indice.por_revalidar, urls, DESCARGA_MAX_EDAD)
+        if not entradas:
+            return
+        with obtener_metricas().cronometro("revalidacion"):
+            resultados = await asyncio.gather(*(
+                self.descargador.descargar(entrada["url"], entrada["ruta"], validadores=entrada)
+                for entrada in entradas
+            ))
+        await asyncio.to_thread(self._registrar_revalidacion, entradas, resultados)
+
+    def _registrar_revalidacion(self, entradas, resultados):
+        """Actualiza el índice con el resultado de la revalidación (en un hilo)."""
+        cambiados = 0
+        for entrada, resultado in zip(entradas, resultados):
+            if not resultado["ok"]:
+                # Sin respuesta del servidor se conserva la copia local
+                continue
+            if resultado["modificado"]:
+                self.indice.registrar(entrada["url"], entrada["ruta"], validadores=resultado)
+                cambiados += 1
+            else:
+                self.indice.marcar_validado(entrada["url"])
+        logging.info(f"Revalidación: {len(entradas)} PDFs consultados, {cambiados} con cambios")
+
+    def _preparar_tareas(self, df):
+        """Ubica el PDF de cada candidato con URL válida (en un hilo)."""
+        metricas = obtener_metricas()
+        tareas = []
+        for idx, row in df.iterrows():
+            url_pdf = row["URL"]
+            if not isinstance(url_pdf, str) or not url_pdf.lower().endswith(".pdf"):
+                logging.warning(f"URL inválida para {row['Nombre']}")
+                metricas.incrementar("urls_invalidas")
+                continue
+            archivo_pdf, hash_pdf = ubicar_pdf(url_pdf, self.indice)
+            tareas.append({"idx": idx, "total": len(df), "poder": row["Poder"], "nombre": row["Nombre"],
+                           "url": url_pdf, "archivo_pdf": archivo_pdf, "hash_pdf": hash_pdf})
+        return tareas
+
+    async def evaluar_candidato(self, tarea):
+        """Evalúa un candidato respetando el semáforo global y el plazo."""
+        async with self.semaforo:
+            try:
+                return await asyncio.wait_for(self._evaluar(tarea), self.plazo)
+            except asyncio.TimeoutError:
+                obtener_metricas().incrementar("candidatos_plazo_excedido")
+                return {"resultado": None, "hash_pdf": None, "error": f"Plazo de {self.plazo}s excedido"}
+
+    async def _evaluar(self, tarea):
+        """Descarga el PDF si hace falta y evalúa al candidato en el executor."""
+        if not os.path.exists(tarea["archivo_pdf"]):
+            resultado = await self.descargador.descargar(tarea["url"], tarea["archivo_pdf"])
+            if resultado["ok"]:
+                tarea["validadores"] = {"etag": resultado["etag"], "last_modified": resultado["last_modified"]}
+
+        bucle = asyncio.get_running_loop()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            salidas, metricas_worker = await bucle.run_in_executor(
+                self.executor, partial(evaluar_candidatos_en_worker, [tarea], perfil=self.perfil)
+            )
+            obtener_metricas().fusionar(metricas_worker)
+        else:
+            salidas = await bucle.run_in_executor(
+                self.executor, partial(evaluar_candidatos, [tarea], n_process=1, perfil=self.perfil)
+            )
+        return salidas[0]
+
+    def _escribir(self, seccion, tareas, salidas, filas, archivo_salida, formato):
+        """Registra los PDFs en el índice y escribe los resultados (en un hilo)."""
+        for tarea, salida in zip(tareas, salidas):
+            if salida["error"] is None:
+                self.indice.registrar(tarea["url"], tarea["archivo_pdf"], candidato=f"{seccion}/{clave_candidato(tarea['poder'], tarea['nombre'])}",
+                                      hash_pdf=salida["hash_pdf"], validadores=tarea.get("validadores"))
+        with abrir_escritor(archivo_salida, formato) as escritor:
+            for inicio in range(0, len(filas), ESCRITURA_LOTE):
+                escribir_lote(escritor, filas[inicio:inicio + ESCRITURA_LOTE], self.perfil_puntaje)
+        return escritor.ruta
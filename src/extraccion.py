@@ -0,0 +1,270 @@
+"""
+Extracción de texto de PDFs con backends intercambiables.
+Todos los backends ofrecen la misma interfaz; se usa PyMuPDF si está
+instalado (más rápido, implementado en C) y PyPDF2 en caso contrario.
+Los documentos largos se reparten por rangos de páginas entre procesos y el
+texto de cada CV se limita a EXTRACCION_MAX_CARACTERES caracteres.
+"""
+
+import time
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import (
+    EXTRACTOR_PDF,
+    EXTRACCION_MAX_PAGINAS,
+    EXTRACCION_MAX_CARACTERES,
+    EXTRACCION_WORKERS,
+    EXTRACCION_PAGINAS_PARALELO,
+    EXTRACCION_PAGINAS_RANGO,
+    EXTRACCION_LENTA_SEGUNDOS
+)
+from .metricas import obtener_metricas
+
+class ExtractorPDF:
+    """Interfaz común de los backends de extracción."""
+
+    nombre = None
+
+    @classmethod
+    def disponible(cls):
+        """Indica si la biblioteca del backend está instalada."""
+        raise NotImplementedError
+
+    @property
+    def version(self):
+        """Identificador del backend y su versión, usado como parte de la clave de caché."""
+        raise NotImplementedError
+
+    def num_paginas(self, ruta_pdf):
+        """Devuelve el número de páginas del PDF."""
+        raise NotImplementedError
+
+    def extraer_paginas(self, ruta_pdf, inicio, fin):
+        """Devuelve el texto de las páginas [inicio, fin) como lista de cadenas."""
+        raise NotImplementedError
+
+    def iterar_paginas(self, ruta_pdf, inicio, fin):
+        """Recorre el texto de las páginas [inicio, fin), extrayéndolas conforme se piden."""
+        for i in range(inicio, fin):
+            yield from self.extraer_paginas(ruta_pdf, i, i + 1)
+
+class ExtractorPyPDF2(ExtractorPDF):
+    nombre = "pypdf2"
+
+    @classmethod
+    def disponible(cls):
+        try:
+            import PyPDF2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @property
+    def version(self):
+        import PyPDF2
+        return f"{self.nombre}-{PyPDF2.__version__}"
+
+    def num_paginas(self, ruta_pdf):
+        from PyPDF2 import PdfReader
+        return len(PdfReader(ruta_pdf).pages)
+
+    def extraer_paginas(self, ruta_pdf, inicio, fin):
+        from PyPDF2 import PdfReader
+        paginas = PdfReader(ruta_pdf).pages
+        return [paginas[i].extract_text() or "" for i in range(inicio, min(fin, len(paginas)))]
+
+    def iterar_paginas(self, ruta_pdf, inicio, fin):
+        from PyPDF2 import PdfReader
+        paginas = PdfReader(ruta_pdf).pages
+        for i in range(inicio, min(fin, len(paginas))):
+            yield paginas[i].extract_text() or ""
+
+class ExtractorPyMuPDF(ExtractorPDF):
+    nombre = "pymupdf"
+
+    @classmethod
+    def disponible(cls):
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @property
+    def version(self):
+        import fitz
+        return f"{self.nombre}-{fitz.VersionBind}"
+
+    def num_paginas(self, ruta_pdf):
+        import fitz
+        with fitz.open(ruta_pdf) as documento:
+            return documento.page_count
+
+    def extraer_paginas(self, ruta_pdf, inicio, fin):
+        import fitz
+        with fitz.open(ruta_pdf) as documento:
+            return [documento[i].get_text() for i in range(inicio, min(fin, documento.page_count))]
+
+    def iterar_paginas(self, ruta_pdf, inicio, fin):
+        import fitz
+        with fitz.open(ruta_pdf) as documento:
+            for i in range(inicio, min(fin, documento.page_count)):
+                yield documento[i].get_text()
+
+# Backends en orden de preferencia para el modo "auto"
+BACKENDS = {
+    ExtractorPyMuPDF.nombre: ExtractorPyMuPDF,
+    ExtractorPyPDF2.nombre: ExtractorPyPDF2
+}
+
+_extractores = {}
+
+def obtener_extractor(nombre=EXTRACTOR_PDF):
+    """
+    Devuelve el backend de extracción solicitado.
+
+    Args:
+        nombre (str): Nombre del backend o "auto" para el primero disponible
+
+    Returns:
+        ExtractorPDF: Instancia del backend
+
+    Raises:
+        ValueError: Si el backend no existe o no está instalado
+    """
+    if nombre not in _extractores:
+        if nombre == "auto":
+            clase = next((c for c in BACKENDS.values() if c.disponible()), None)
+            if clase is None:
+                raise ValueError("No hay ningún backend de extracción de PDF instalado")
+        elif nombre in BACKENDS and BACKENDS[nombre].disponible():
+            clase = BACKENDS[nombre]
+        else:
+            raise ValueError(f"Backend de extracción no disponible: {nombre}")
+        _extractores[nombre] = clase()
+    return _extractores[nombre]
+
+def _extraer_rango(nombre_backend, ruta_pdf, inicio, fin):
+    """Extrae un rango de páginas; se ejecuta en los procesos del pool de páginas."""
+    return obtener_extractor(nombre_backend).extraer_paginas(ruta_pdf, inicio, fin)
+
+_pool_paginas = None
+_lock_pool = threading.Lock()
+
+def _obtener_pool_paginas():
+    """Crea, la primera vez, el pool de procesos para extraer páginas en paralelo."""
+    global _pool_paginas
+    with _lock_pool:
+        if _pool_paginas is None:
+            _pool_paginas = ProcessPoolExecutor(max_workers=EXTRACCION_WORKERS)
+    return _pool_paginas
+
+def _extraer_en_paralelo(extractor, ruta_pdf, total, max_caracteres=None):
+    """
+    Extrae las páginas [0, total) por rangos en el pool de páginas, con como
+    máximo EXTRACCION_WORKERS rangos en curso, y los recoge en orden. Al
+    superar max_caracteres deja de enviar rangos y cancela los pendientes,
+    de modo que la memoria no crece con el número de páginas.
+
+    Returns:
+        list: Texto de las páginas leídas, en orden
+    """
+    tamano = max(1, min(-(-total // EXTRACCION_WORKERS), EXTRACCION_PAGINAS_RANGO))
+    rangos = iter([(i, min(i + tamano, total)) for i in range(0, total, tamano)])
+    pool = _obtener_pool_paginas()
+    en_curso = deque()
+
+    def enviar():
+        rango = next(rangos, None)
+        if rango is not None:
+            en_curso.append(pool.submit(_extraer_rango, extractor.nombre, ruta_pdf, *rango))
+
+    for _ in range(EXTRACCION_WORKERS):
+        enviar()
+    paginas, caracteres = [], 0
+    try:
+        while en_curso:
+            leidas = en_curso.popleft().result()
+            paginas.extend(leidas)
+            caracteres += sum(len(pagina) for pagina in leidas)
+            if max_caracteres is not None and caracteres > max_caracteres:
+                break
+            enviar()
+    finally:
+        for futuro in en_curso:
+            futuro.cancel()
+    return paginas
+
+def extraer_texto(ruta_pdf, max_paginas=EXTRACCION_MAX_PAGINAS, extractor=None,
+                  max_caracteres=EXTRACCION_MAX_CARACTERES):
+    """
+    Extrae el texto de un PDF.
+
+    Si el documento tiene al menos EXTRACCION_PAGINAS_PARALELO páginas, los
+    rangos de páginas se extraen en paralelo. Esto solo ocurre en el proceso
+    principal; dentro de un worker del pool de candidatos los núcleos ya
+    están ocupados y las páginas se leen una a una. En ambos casos se deja
+    de leer al superar max_caracteres.
+
+    Args:
+        ruta_pdf (str): Ruta del archivo PDF
+        max_paginas (int, opcional): Número máximo de páginas a leer
+        extractor (ExtractorPDF, opcional): Backend a usar
+        max_caracteres (int, opcional): Caracteres máximos del texto; el
+            resto se descarta
+
+    Returns:
+        dict: 'texto', 'paginas' (leídas), 'backend', 'segundos' y
+            'truncado' (si se alcanzó max_caracteres)
+    """
+    extractor = extractor or obtener_extractor()
+    inicio = time.perf_counter()
+
+    total = extractor.num_paginas(ruta_pdf)
+    if max_paginas is not None:
+        total = min(total, max_paginas)
+
+    paralelo = (
+        EXTRACCION_WORKERS > 1
+        and total >= EXTRACCION_PAGINAS_PARALELO
+        and multiprocessing.parent_process() is None
+    )
+    if paralelo:
+        paginas = _extraer_en_paralelo(extractor, ruta_pdf, total, max_caracteres)
+    else:
+        paginas, caracteres = [], 0
+        for pagina in extractor.iterar_paginas(ruta_pdf, 0, total):
+            paginas.append(pagina)
+            caracteres += len(pagina)
+            if max_caracteres is not None and caracteres > max_caracteres:
+                break
+    total = len(paginas)
+
+    texto = "".join(paginas)
+    del paginas
+    truncado = max_caracteres is not None and len(texto) > max_caracteres
+    if truncado:
+        texto = texto[:max_caracteres]
+
+    segundos = time.perf_counter() - inicio
+    metricas = obtener_metricas()
+    metricas.registrar_tiempo("extraccion", segundos)
+    metricas.incrementar("extraccion_paginas", total)
+    if truncado:
+        metricas.incrementar("extraccion_truncados")
+        logging.warning(f"Texto de {ruta_pdf} truncado a {max_caracteres} caracteres ({total} páginas leídas)")
+    if segundos > EXTRACCION_LENTA_SEGUNDOS:
+        metricas.incrementar("extraccion_lentas")
+        logging.warning(f"Extracción lenta: {ruta_pdf} ({total} páginas, {segundos:.1f}s, {extractor.nombre})")
+
+    return {
+        "texto": texto,
+        "paginas": total,
+        "backend": extractor.nombre,
+        "segundos": segundos,
+        "truncado": truncado
+    }
@@ -0,0 +1,104 @@
+"""
+Evaluación incremental de secciones.
+Guarda por sección un manifiesto con la URL, el hash del PDF, el hash de la
+configuración (palabras clave, extracción y análisis) y la versión del puntaje de cada candidato,
+junto con su resultado, para reutilizarlo cuando nada de eso cambió.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+
+from . import config
+from .config import MANIFIESTOS_DIR, VERSION_PUNTAJE, PERFIL_ANALISIS, NLP_SUBANALISIS, NLP_ORACIONES
+from .cache_texto import obtener_cache_texto
+
+LISTAS_PALABRAS_CLAVE = [
+    "experiencia_judicial",
+    "experiencia_administrativa",
+    "experiencia_docente",
+    "experiencia_investigacion",
+    "palabras_riesgo",
+    "palabras_positivas"
+]
+
+def hash_configuracion(perfil=PERFIL_ANALISIS):
+    """
+    Calcula un hash de las listas de palabras clave usadas para puntuar (y
+    de la penalización por no mencionar redes sociales), de la extracción
+    de texto (backend y su versión, páginas y caracteres máximos, ver
+    cache_texto.version_extractor) y de la configuración del
+    análisis NLP (perfil, subanálisis, segmentación en oraciones, ventanas y
+    oraciones del sentimiento), que cambian las características extraídas.
+    """
+    listas = {nombre: getattr(config, nombre) for nombre in LISTAS_PALABRAS_CLAVE}
+    listas["penalizacion_sin_redes"] = config.PENALIZACION_SIN_REDES
+    nlp = {
+        "perfil_analisis": perfil,
+        "nlp_subanalisis": sorted(NLP_SUBANALISIS),
+        "nlp_oraciones": NLP_ORACIONES,
+        "nlp_ventana_caracteres": config.NLP_VENTANA_CARACTERES,
+        "nlp_ventana_solapamiento": config.NLP_VENTANA_SOLAPAMIENTO,
+        "sentimiento_max_oraciones": config.SENTIMIENTO_MAX_ORACIONES
+    }
+    extraccion = {"extractor": obtener_cache_texto().version}
+    contenido = json.dumps({**listas, **nlp, **extraccion}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+def ruta_manifiesto(seccion):
+    """Devuelve la ruta del manifiesto de una sección."""
+    return os.path.join(MANIFIESTOS_DIR, f"manifiesto_{seccion}.json")
+
+def cargar_manifiesto(seccion):
+    """
+    Carga el manifiesto de la última ejecución de una sección.
+    
+    Args:
+        seccion (str): Nombre de la sección
+        
+    Returns:
+        dict: Entradas por clave de candidato, poder y nombre (vacío si no hay manifiesto)
+    """
+    ruta = ruta_manifiesto(seccion)
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Manifiesto ilegible {ruta}, se procesará la sección completa: {e}")
+        return {}
+
+def guardar_manifiesto(seccion, entradas):
+    """Guarda el manifiesto de una sección de forma atómica."""
+    os.makedirs(MANIFIESTOS_DIR, exist_ok=True)
+    ruta = ruta_manifiesto(seccion)
+    fd, temporal = tempfile.mkstemp(dir=MANIFIESTOS_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(entradas, f, ensure_ascii=False, default=str)
+    os.replace(temporal, ruta)
+    logging.info(f"Manifiesto guardado: {ruta} ({len(entradas)} candidatos)")
+
+def crear_entrada(url, hash_pdf, resultado, hash_config):
+    """Crea la entrada de manifiesto de un candidato evaluado."""
+    return {
+        "url": url,
+        "hash_pdf": hash_pdf,
+        "hash_config": hash_config,
+        "version": VERSION_PUNTAJE,
+        "resultado": resultado
+    }
+
+def entrada_vigente(entrada, url, hash_config):
+    """
+    Indica si una entrada previa sigue siendo válida sin mirar el PDF.
+    El hash del PDF se compara aparte, solo para las entradas que pasan este filtro.
+    """
+    return (
+        entrada is not None
+        and entrada.get("url") == url
+        and entrada.get("hash_config") == hash_config
+        and entrada.get("version") == VERSION_PUNTAJE
+    )
@@ -0,0 +1,217 @@
+"""
+Índice persistente de los PDFs descargados.
+Relaciona la URL de origen y el candidato con la ruta local, el hash del
+contenido, el tamaño, la fecha de descarga y los validadores HTTP (ETag y
+Last-Modified) con los que se revalida la copia local. Se carga una vez por
+ejecución y se guarda de forma atómica, así que buscar un PDF no requiere
+listar la carpeta ni volver a calcular su hash.
+"""
+
+import os
+import json
+import logging
+import time
+import tempfile
+import threading
+from datetime import datetime
+
+from .config import INDICE_PDFS_ARCHIVO, INDICE_PDFS_GUARDAR_CADA
+from .utils import hash_archivo
+
+class IndicePDF:
+    def __init__(self, archivo=INDICE_PDFS_ARCHIVO, guardar_cada=INDICE_PDFS_GUARDAR_CADA):
+        """
+        Carga el índice.
+
+        Args:
+            archivo (str): Ruta del archivo JSON del índice
+            guardar_cada (int): Cambios acumulados tras los cuales se guarda
+                automáticamente; guardar() escribe los cambios restantes
+        """
+        self.archivo = archivo
+        self.guardar_cada = guardar_cada
+        self._lock = threading.RLock()
+        self._pendientes = 0
+        self._por_url = {}
+        self._por_candidato = {}
+        self._por_ruta = {}
+
+        if os.path.exists(archivo):
+            try:
+                with open(archivo, "r", encoding="utf-8") as f:
+                    self._por_url = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Índice de PDFs ilegible {archivo}, se reconstruirá: {e}")
+        for url, entrada in self._por_url.items():
+            self._por_ruta[entrada["ruta"]] = url
+            if entrada.get("candidato") is not None:
+                self._por_candidato[entrada["candidato"]] = url
+
+    def __len__(self):
+        return len(self._por_url)
+
+    @staticmethod
+    def _vigente(entrada):
+        """Comprueba con stat() que el archivo local no cambió desde que se indexó."""
+        try:
+            estado = os.stat(entrada["ruta"])
+        except OSError:
+            return False
+        return estado.st_size == entrada["bytes"] and estado.st_mtime_ns == entrada["mtime_ns"]
+
+    def buscar(self, url):
+        """
+        Busca el PDF descargado de una URL.
+
+        Args:
+            url (str): URL de origen
+
+        Returns:
+            dict: Entrada con 'url', 'candidato', 'ruta', 'hash', 'bytes',
+                'mtime_ns', 'fecha_descarga', 'etag', 'last_modified' y
+                'validado', o None si no está indexado o el archivo local
+                cambió o desapareció
+        """
+        with self._lock:
+            entrada = self._por_url.get(url)
+        if entrada is None or not self._vigente(entrada):
+            return None
+        return entrada
+
+    def buscar_candidato(self, candidato):
+        """
+        Busca el último PDF indexado de un candidato.
+
+        Args:
+            candidato (str): Identificador del candidato
+
+        Returns:
+            dict: Entrada del índice, o None si no existe o no es vigente
+        """
+        with self._lock:
+            url = self._por_candidato.get(candidato)
+        return self.buscar(url) if url is not None else None
+
+    def url_de_ruta(self, ruta):
+        """Devuelve la URL indexada para un archivo local, o None si no está indexado."""
+        with self._lock:
+            return self._por_ruta.get(os.path.abspath(ruta))
+
+    def registrar(self, url, ruta, candidato=None, hash_pdf=None, validadores=None):
+        """
+        Registra o actualiza el PDF local de una URL.
+
+        Args:
+            url (str): URL de origen
+            ruta (str): Ruta del archivo descargado
+            candidato (str, opcional): Identificador del candidato
+            hash_pdf (str, opcional): Hash ya calculado del contenido
+            validadores (dict, opcional): 'etag' y 'last_modified' de la
+                respuesta con la que se acaba de descargar o validar el archivo
+
+        Returns:
+            dict: Entrada registrada
+        """
+        ruta = os.path.abspath(ruta)
+        estado = os.stat(ruta)
+        with self._lock:
+            anterior = self._por_url.get(url)
+        mismo_archivo = (
+            anterior is not None and anterior["ruta"] == ruta
+            and anterior["bytes"] == estado.st_size and anterior["mtime_ns"] == estado.st_mtime_ns
+        )
+        entrada = {
+            "url": url,
+            "candidato": candidato if candidato is not None else (anterior or {}).get("candidato"),
+            "ruta": ruta,
+            "hash": hash_pdf or (anterior["hash"] if mismo_archivo else hash_archivo(ruta)),
+            "bytes": estado.st_size,
+            "mtime_ns": estado.st_mtime_ns,
+            "fecha_descarga": anterior["fecha_descarga"] if mismo_archivo else datetime.now().isoformat(timespec="seconds")
+        }
+        if validadores is not None:
+            entrada.update(etag=validadores.get("etag"), last_modified=validadores.get("last_modified"),
+                           validado=time.time())
+        elif mismo_archivo:
+            entrada.update(etag=anterior.get("etag"), last_modified=anterior.get("last_modified"),
+                           validado=anterior.get("validado"))
+        else:
+            # El archivo cambió sin pasar por el descargador: sus validadores ya no sirven
+            entrada.update(etag=None, last_modified=None, validado=None)
+        if entrada == anterior:
+            return entrada
+
+        with self._lock:
+            if anterior is not None and self._por_ruta.get(anterior["ruta"]) == url:
+                del self._por_ruta[anterior["ruta"]]
+            self._por_url[url] = entrada
+            self._por_ruta[ruta] = url
+            if entrada["candidato"] is not None:
+                self._por_candidato[entrada["candidato"]] = url
+            self._pendientes += 1
+            if self._pendientes >= self.guardar_cada:
+                self.guardar()
+        return entrada
+
+    def marcar_validado(self, url):
+        """Registra que el servidor confirmó (304) que la copia local de la URL sigue vigente."""
+        with self._lock:
+            entrada = self._por_url.get(url)
+            if entrada is None:
+                return
+            entrada["validado"] = time.time()
+            self._pendientes += 1
+            if self._pendientes >= self.guardar_cada:
+                self.guardar()
+
+    def por_revalidar(self, urls, max_edad):
+        """
+        Selecciona las copias locales que deben revalidarse con el servidor.
+
+        Args:
+            urls (iterable): URLs a considerar
+            max_edad (float): Segundos desde la última validación tras los
+                cuales se vuelve a consultar al servidor; None para no revalidar
+
+        Returns:
+            list: Entradas vigentes del índice cuya validación expiró
+        """
+        if max_edad is None:
+            return []
+        limite = time.time() - max_edad
+        entradas = []
+        for url in urls:
+            entrada = self.buscar(url)
+            if entrada is not None and (entrada.get("validado") or 0) < limite:
+                entradas.append(entrada)
+        return entradas
+
+    def guardar(self):
+        """Guarda el índice de forma atómica si tiene cambios sin guardar."""
+        with self._lock:
+            if not self._pendientes:
+                return
+            carpeta = os.path.dirname(self.archivo)
+            os.makedirs(carpeta, exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._por_url, f, ensure_ascii=False)
+            os.replace(temporal, self.archivo)
+            self._pendientes = 0
+        logging.debug(f"Índice de PDFs guardado: {self.archivo} ({len(self._por_url)} PDFs)")
+
+_indice = None
+_lock_indice = threading.Lock()
+
+def obtener_indice_pdfs():
+    """
+    Devuelve el índice de PDFs compartido del proceso, cargándolo si es necesario.
+
+    Returns:
+        IndicePDF: Índice con la configuración por defecto
+    """
+    global _indice
+    with _lock_indice:
+        if _indice is None:
+            _indice = IndicePDF()
+    return _indice
@@ -0,0 +1,243 @@
+"""
+Métricas de ejecución por etapa.
+Acumula tiempos (cronómetros), contadores de bytes, errores y aciertos de
+caché de cada etapa (descarga, extracción, palabras clave, spaCy,
+sentimiento, puntaje y escritura) y genera un reporte JSON y,
+opcionalmente, un archivo de texto con el formato de Prometheus.
+
+Cada proceso tiene su propio acumulador; los workers del pool envían sus
+métricas al proceso principal, que las combina con fusionar().
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# Sufijos de los contadores a partir de los que se calculan tasas de acierto
+SUFIJO_ACIERTOS = "_aciertos"
+SUFIJO_FALLOS = "_fallos"
+
+class Metricas:
+    def __init__(self):
+        """Inicializa un acumulador vacío."""
+        self._lock = threading.Lock()
+        self._tiempos = {}
+        self._contadores = Counter()
+        self.inicio = time.time()
+
+    @contextmanager
+    def cronometro(self, etapa):
+        """
+        Mide el tiempo de un bloque y lo suma a la etapa.
+
+        Args:
+            etapa (str): Nombre de la etapa
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tiempo(etapa, time.perf_counter() - inicio)
+
+    def registrar_tiempo(self, etapa, segundos, llamadas=1):
+        """
+        Suma un tiempo medido a la etapa.
+
+        Args:
+            etapa (str): Nombre de la etapa
+            segundos (float): Tiempo medido
+            llamadas (int): Número de mediciones que representa
+        """
+        with self._lock:
+            tiempo = self._tiempos.get(etapa)
+            if tiempo is None:
+                tiempo = self._tiempos[etapa] = {"segundos": 0.0, "llamadas": 0, "max_segundos": 0.0}
+            tiempo["segundos"] += segundos
+            tiempo["llamadas"] += llamadas
+            tiempo["max_segundos"] = max(tiempo["max_segundos"], segundos / llamadas if llamadas else 0.0)
+
+    def incrementar(self, contador, valor=1):
+        """
+        Suma un valor a un contador.
+
+        Args:
+            contador (str): Nombre del contador (p. ej. 'descarga_bytes')
+            valor (int): Cantidad a sumar
+        """
+        with self._lock:
+            self._contadores[contador] += valor
+
+    def instantanea(self):
+        """
+        Devuelve una copia de las métricas acumuladas.
+
+        Returns:
+            dict: 'tiempos' (etapa -> segundos, llamadas, max_segundos) y
+                'contadores' (nombre -> valor)
+        """
+        with self._lock:
+            return {
+                "tiempos": {etapa: dict(tiempo) for etapa, tiempo in self._tiempos.items()},
+                "contadores": dict(self._contadores)
+            }
+
+    def extraer(self):
+        """Devuelve las métricas acumuladas y las reinicia (para enviarlas desde un worker)."""
+        with self._lock:
+            datos = {"tiempos": self._tiempos, "contadores": dict(self._contadores)}
+            self._tiempos = {}
+            self._contadores = Counter()
+        return datos
+
+    def fusionar(self, datos):
+        """
+        Suma a este acumulador las métricas de otro proceso.
+
+        Args:
+            datos (dict): Resultado de instantanea() o extraer()
+        """
+        if not datos:
+            return
+        with self._lock:
+            for etapa, otro in datos["tiempos"].items():
+                tiempo = self._tiempos.setdefault(etapa, {"segundos": 0.0, "llamadas": 0, "max_segundos": 0.0})
+                tiempo["segundos"] += otro["segundos"]
+                tiempo["llamadas"] += otro["llamadas"]
+                tiempo["max_segundos"] = max(tiempo["max_segundos"], otro["max_segundos"])
+            self._contadores.update(datos["contadores"])
+
+    def reiniciar(self):
+        """Descarta todas las métricas acumuladas."""
+        with self._lock:
+            self._tiempos = {}
+            self._contadores = Counter()
+            self.inicio = time.time()
+
+    def reporte(self, **metadatos):
+        """
+        Construye el reporte de la ejecución.
+
+        Args:
+            **metadatos: Datos adicionales a incluir (secciones, opciones, etc.)
+
+        Returns:
+            dict: Reporte con tiempos por etapa, contadores y tasas de acierto de caché
+        """
+        datos = self.instantanea()
+        for tiempo in datos["tiempos"].values():
+            tiempo["promedio_ms"] = 1000 * tiempo["segundos"] / tiempo["llamadas"] if tiempo["llamadas"] else 0.0
+
+        tasas = {}
+        contadores = datos["contadores"]
+        for nombre in contadores:
+            for sufijo in (SUFIJO_ACIERTOS, SUFIJO_FALLOS):
+                if nombre.endswith(sufijo):
+                    base = nombre[:-len(sufijo)]
+                    aciertos = contadores.get(base + SUFIJO_ACIERTOS, 0)
+                    total = aciertos + contadores.get(base + SUFIJO_FALLOS, 0)
+                    tasas[base] = aciertos / total if total else 0.0
+
+        return {
+            "inicio": datetime.fromtimestamp(self.inicio).isoformat(timespec="seconds"),
+            "duracion_segundos": time.time() - self.inicio,
+            **metadatos,
+            "etapas": datos["tiempos"],
+            "contadores": contadores,
+            "tasas_acierto": tasas
+        }
+
+    def resumen(self):
+        """
+        Resume en una línea el tiempo de cada etapa, de la más lenta a la más rápida.
+
+        Returns:
+            str: Texto como "extraccion 12.3s (400), spacy 8.1s (400), ..."
+        """
+        tiempos = self.instantanea()["tiempos"]
+        orden = sorted(tiempos.items(), key=lambda t: t[1]["segundos"], reverse=True)
+        return ", ".join(f"{etapa} {t['segundos']:.1f}s ({t['llamadas']})" for etapa, t in orden)
+
+    def guardar_json(self, ruta, **metadatos):
+        """
+        Guarda el reporte en JSON de forma atómica.
+
+        Args:
+            ruta (str): Ruta del archivo
+            **metadatos: Datos adicionales para el reporte
+
+        Returns:
+            dict: Reporte guardado
+        """
+        reporte = self.reporte(**metadatos)
+        _escribir_atomico(ruta, json.dumps(reporte, ensure_ascii=False, indent=2, default=str))
+        return reporte
+
+    def guardar_prometheus(self, ruta, prefijo="evaluador"):
+        """
+        Guarda las métricas en el formato de texto de Prometheus, apto para el
+        recolector de archivos de texto de node_exporter.
+
+        Args:
+            ruta (str): Ruta del archivo (.prom)
+            prefijo (str): Prefijo de los nombres de las métricas
+        """
+        reporte = self.reporte()
+        lineas = [
+            f"# HELP {prefijo}_etapa_segundos_total Tiempo acumulado por etapa.",
+            f"# TYPE {prefijo}_etapa_segundos_total counter"
+        ]
+        lineas += [f'{prefijo}_etapa_segundos_total{{etapa="{etapa}"}} {t["segundos"]:.6f}'
+                   for etapa, t in sorted(reporte["etapas"].items())]
+        lineas += [
+            f"# HELP {prefijo}_etapa_llamadas_total Mediciones por etapa.",
+            f"# TYPE {prefijo}_etapa_llamadas_total counter"
+        ]
+        lineas += [f'{prefijo}_etapa_llamadas_total{{etapa="{etapa}"}} {t["llamadas"]}'
+                   for etapa, t in sorted(reporte["etapas"].items())]
+        for nombre, valor in sorted(reporte["contadores"].items()):
+            lineas += [f"# TYPE {prefijo}_{nombre}_total counter", f"{prefijo}_{nombre}_total {valor}"]
+        lineas += [
+            f"# HELP {prefijo}_cache_tasa_acierto Fracción de consultas resueltas por cada caché.",
+            f"# TYPE {prefijo}_cache_tasa_acierto gauge"
+        ]
+        lineas += [f'{prefijo}_cache_tasa_acierto{{cache="{cache}"}} {tasa:.6f}'
+                   for cache, tasa in sorted(reporte["tasas_acierto"].items())]
+        lineas += [f"# TYPE {prefijo}_duracion_segundos gauge",
+                   f"{prefijo}_duracion_segundos {reporte['duracion_segundos']:.3f}"]
+        _escribir_atomico(ruta, "\n".join(lineas) + "\n")
+
+def _escribir_atomico(ruta, contenido):
+    """Escribe un archivo de texto mediante un temporal y os.replace."""
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(carpeta, exist_ok=True)
+    fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+
+# Un acumulador por proceso: los procesos hijos creados por fork no deben
+# volver a reportar las métricas heredadas del padre
+_metricas = None
+_pid_metricas = None
+_lock_metricas = threading.Lock()
+
+def obtener_metricas():
+    """
+    Devuelve el acumulador de métricas del proceso actual, creándolo si es necesario.
+
+    Returns:
+        Metricas: Acumulador compartido por los hilos del proceso
+    """
+    global _metricas, _pid_metricas
+    pid = os.getpid()
+    if _metricas is None or _pid_metricas != pid:
+        with _lock_metricas:
+            if _metricas is None or _pid_metricas != pid:
+                _metricas = Metricas()
+                _pid_metricas = pid
+    return _metricas
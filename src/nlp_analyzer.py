@@ -1,100 +1,739 @@
 """
 Módulo para análisis de lenguaje natural de los CVs.
 Utiliza spaCy y NLTK para análisis semántico y de sentimiento.
+
+spaCy, NLTK y sus recursos se cargan la primera vez que se necesitan, no al
+importar el módulo. En modo sin conexión (variable de entorno
+EVALUADOR_OFFLINE=1) no se intenta descargar nada: si falta un recurso se
+lanza un error indicando cómo instalarlo.
 """
 
-import spacy
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 import re
+import os
+import threading
 from collections import Counter
-from textblob import TextBlob
+from functools import lru_cache
 import logging
 
-# Descargar recursos necesarios de NLTK antes de cargar el modelo spaCy o inicializar la clase
-try:
-    # Intentar descargar 'punkt' sin el argumento language
-    nltk.download('punkt', quiet=True)
-except LookupError:
-    # Si falla la descarga general
-    print("Advertencia: No se pudo descargar el recurso 'punkt' de NLTK.")
-
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon', quiet=True)
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-
-try:
-    nltk.data.find('averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-
-try:
-    nltk.data.find('wordnet')
-except LookupError:
-    nltk.download('wordnet', quiet=True)
-
-# Cargar modelo de spaCy
-try:
-    nlp = spacy.load("es_core_news_sm")
-except OSError:
-    print("Descargando modelo de spaCy...")
-    spacy.cli.download("es_core_news_sm")
-    nlp = spacy.load("es_core_news_sm")
+from .config import (
+    PERFIL_ANALISIS,
+    NLP_SUBANALISIS,
+    NLP_ORACIONES,
+    NLP_VENTANA_CARACTERES,
+    NLP_VENTANA_SOLAPAMIENTO,
+    SENTIMIENTO_MAX_ORACIONES,
+    WORKER_MAX_MEMORIA_MB
+)
+from .metricas import obtener_metricas
+from .utils import limitar_memoria
+from .patrones import PATRONES_GRADOS, PATRONES_COMPETENCIAS, menciones_nlp
+
+MODELO_SPACY = "es_core_news_sm"
+
+# Variable de entorno que activa el modo sin conexión
+VARIABLE_OFFLINE = "EVALUADOR_OFFLINE"
+
+# Recursos de NLTK que usa el analizador: ruta en nltk.data -> paquete a descargar
+RECURSOS_NLTK = {
+    "sentiment/vader_lexicon.zip": "vader_lexicon",
+    "corpora/stopwords": "stopwords"
+}
+
+def modo_offline():
+    """Indica si está activo el modo sin conexión."""
+    return os.environ.get(VARIABLE_OFFLINE, "0") not in ("", "0")
+
+@lru_cache(maxsize=None)
+def asegurar_recursos_nltk():
+    """
+    Verifica que los recursos de NLTK estén instalados y descarga los que falten.
+    
+    Raises:
+        LookupError: Si falta algún recurso y el modo sin conexión está activo
+    """
+    import nltk
+    
+    faltantes = []
+    for ruta, paquete in RECURSOS_NLTK.items():
+        try:
+            nltk.data.find(ruta)
+        except LookupError:
+            faltantes.append(paquete)
+    
+    if faltantes and modo_offline():
+        raise LookupError(
+            f"Faltan recursos de NLTK en modo sin conexión: {', '.join(faltantes)}. "
+            f"Instálelos con: python -m nltk.downloader {' '.join(faltantes)}"
+        )
+    
+    for paquete in faltantes:
+        logging.info(f"Descargando recurso de NLTK: {paquete}")
+        if not nltk.download(paquete, quiet=True):
+            logging.warning(f"No se pudo descargar el recurso '{paquete}' de NLTK.")
+
+# Subanálisis de NLPAnalyzer y los componentes de spaCy que necesita cada uno
+COMPONENTES_SUBANALISIS = {
+    "entidades": {"ner"},
+    "experiencia": {"ner"},     # instituciones (ORG); los logros usan las oraciones
+    "formacion": {"ner"},       # instituciones educativas
+    "competencias": set(),      # expresiones regulares sobre el texto
+    "calidad_texto": set(),     # is_punct e is_stop son atributos léxicos
+    "sentimiento": set()        # VADER
+}
+
+# Subanálisis que usan las oraciones del documento
+SUBANALISIS_CON_ORACIONES = {"experiencia", "calidad_texto", "sentimiento"}
+
+# Subanálisis que usan las menciones de años, grados y competencias, buscadas
+# en una sola pasada con el banco de patrones (ver patrones.menciones_nlp)
+SUBANALISIS_CON_MENCIONES = {"experiencia", "formacion", "competencias"}
+
+# Componentes que marcan los límites de oración con NLP_ORACIONES = "parser"
+COMPONENTES_ORACIONES = {"parser", "senter", "sentencizer"}
+
+# Segmentaciones en oraciones admitidas (ver NLP_ORACIONES en config)
+SEGMENTACIONES = ("parser", "sentencizer", "reglas")
+
+# Componentes del modelo que se excluyen al cargarlo si ningún subanálisis
+# activo los necesita; los demás (p. ej. un entity_ruler) se cargan siempre
+COMPONENTES_OPCIONALES = (
+    "morphologizer", "tagger", "parser", "senter", "sentencizer",
+    "attribute_ruler", "lemmatizer", "ner"
+)
+
+def componentes_necesarios(subanalisis=NLP_SUBANALISIS, oraciones=NLP_ORACIONES):
+    """
+    Calcula los componentes de spaCy que requieren los subanálisis indicados.
+    
+    Args:
+        subanalisis (iterable): Nombres de COMPONENTES_SUBANALISIS
+        oraciones (str): "parser", "sentencizer" o "reglas" (ver NLP_ORACIONES)
+        
+    Returns:
+        set: Nombres de componentes
+        
+    Raises:
+        ValueError: Si un subanálisis o la segmentación no existen
+    """
+    if oraciones not in SEGMENTACIONES:
+        raise ValueError(f"Segmentación en oraciones desconocida: {oraciones}. Opciones: {', '.join(SEGMENTACIONES)}")
+    necesarios = set()
+    for nombre in subanalisis:
+        if nombre not in COMPONENTES_SUBANALISIS:
+            raise ValueError(f"Subanálisis desconocido: {nombre}. Opciones: {', '.join(COMPONENTES_SUBANALISIS)}")
+        necesarios |= COMPONENTES_SUBANALISIS[nombre]
+    if oraciones == "parser" and SUBANALISIS_CON_ORACIONES.intersection(subanalisis):
+        necesarios |= COMPONENTES_ORACIONES
+    return necesarios
+
+@lru_cache(maxsize=None)
+def cargar_modelo(excluir=()):
+    """
+    Carga el modelo de spaCy una sola vez por proceso (y por conjunto de
+    componentes excluidos).
+    
+    Args:
+        excluir (tuple): Componentes del modelo que no se cargan
+    
+    Returns:
+        spacy.Language: Pipeline de spaCy
+        
+    Raises:
+        OSError: Si el modelo no está instalado y el modo sin conexión está activo
+    """
+    import spacy
+    
+    try:
+        nlp = spacy.load(MODELO_SPACY, exclude=list(excluir))
+    except OSError:
+        if modo_offline():
+            raise OSError(
+                f"El modelo de spaCy '{MODELO_SPACY}' no está instalado y el modo sin conexión está activo. "
+                f"Instálelo con: python -m spacy download {MODELO_SPACY}"
+            )
+        print("Descargando modelo de spaCy...")
+        spacy.cli.download(MODELO_SPACY)
+        nlp = spacy.load(MODELO_SPACY, exclude=list(excluir))
+    
+    # Sin componentes que lo escuchen, el tok2vec compartido solo consume tiempo
+    if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    logging.debug(f"Modelo {MODELO_SPACY} cargado con los componentes {nlp.pipe_names}")
+    return nlp
+
+@lru_cache(maxsize=None)
+def cargar_segmentador():
+    """
+    Crea una sola vez por proceso el pipeline con que NLP_ORACIONES =
+    "sentencizer" segmenta en oraciones: el tokenizador del idioma del
+    modelo y el componente sentencizer de spaCy, sin parser ni pesos.
+    Se aplica al texto original, porque el documento del modelo se
+    construye con el texto ya sin puntuación.
+    
+    Returns:
+        spacy.Language: Pipeline de spaCy
+    """
+    import spacy
+    
+    nlp = spacy.blank(MODELO_SPACY.split("_")[0])
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+# Perfiles de análisis, del más rápido al más completo (ver PERFIL_ANALISIS en config)
+PERFILES = ("rapido", "estandar", "completo")
+
+# Componentes de spaCy que no se ejecutan en cada perfil. Los que el modelo
+# no tenga se ignoran; el perfil rápido no usa spaCy.
+COMPONENTES_OMITIDOS = {
+    "estandar": ("parser", "lemmatizer", "morphologizer", "attribute_ruler"),
+    "completo": ()
+}
+
+PALABRAS_LOGRO = ['logro', 'conseguí', 'alcanzado', 'obtenido']
+
+def validar_perfil(perfil):
+    """Lanza ValueError si el perfil de análisis no existe."""
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil de análisis desconocido: {perfil}. Opciones: {', '.join(PERFILES)}")
+
+def limpiar_texto(texto):
+    """Limpia y normaliza el texto."""
+    # Convertir a minúsculas
+    texto = texto.lower()
+    
+    # Eliminar caracteres especiales y números
+    texto = re.sub(r'[^\w\s]', ' ', texto)
+    texto = re.sub(r'\d+', '', texto)
+    
+    # Eliminar espacios múltiples
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    
+    return texto
+
+def dividir_oraciones(texto):
+    """
+    Divide un texto sin limpiar en oraciones según su puntuación.
+    Es la segmentación por reglas (NLP_ORACIONES = "reglas") y la de los
+    perfiles que no ejecutan el parser. Se aplica al texto original porque
+    el documento de spaCy se construye con el texto ya sin puntuación.
+    """
+    return [oracion for oracion in re.split(r'[.!?;]+\s+|\n\s*\n', texto) if oracion.strip()]
+
+def logros_mencionados(oraciones):
+    """Devuelve las oraciones que mencionan logros."""
+    return [oracion for oracion in oraciones if any(palabra in oracion.lower() for palabra in PALABRAS_LOGRO)]
+
+def calificar_calidad(num_palabras, num_oraciones, palabras):
+    """
+    Califica la calidad general del texto.
+    
+    Args:
+        num_palabras (int): Palabras del texto, sin signos de puntuación
+        num_oraciones (int): Oraciones del texto
+        palabras (list): Palabras que no son stop words, en minúsculas
+        
+    Returns:
+        dict: 'longitud', 'complejidad' y 'coherencia'
+    """
+    return _calificar_calidad(num_palabras, num_oraciones, len(set(palabras)), len(palabras))
+
+def _calificar_calidad(num_palabras, num_oraciones, distintas, total):
+    """Califica la calidad a partir de los conteos de palabras (ver calificar_calidad)."""
+    # Calcular diversidad léxica
+    diversidad_lexica = distintas / total if total else 0
+    
+    return {
+        'longitud': 'adecuada' if 100 <= num_palabras <= 2000 else 'inadecuada',
+        'complejidad': 'alta' if diversidad_lexica > 0.6 else 'media' if diversidad_lexica > 0.4 else 'baja',
+        'coherencia': 'alta' if num_oraciones > 5 else 'baja'
+    }
+
+@lru_cache(maxsize=None)
+def stop_words_spacy():
+    """Stop words del español de spaCy, las mismas que usa token.is_stop."""
+    from spacy.lang.es.stop_words import STOP_WORDS
+    return frozenset(STOP_WORDS)
+
+_ESPACIO = re.compile(r"\s")
+
+def ventanas_texto(texto, tamano=NLP_VENTANA_CARACTERES, solapamiento=NLP_VENTANA_SOLAPAMIENTO):
+    """
+    Divide un texto en ventanas de a lo sumo `tamano` caracteres.
+    
+    Cada ventana termina, si es posible, en un salto de línea o un espacio de
+    su segunda mitad, para no partir palabras; la siguiente empieza
+    `solapamiento` caracteres antes, también en un límite de palabra, para
+    que las entidades y oraciones cortadas aparezcan completas en alguna.
+    
+    Args:
+        texto (str): Texto a dividir
+        tamano (int): Caracteres máximos por ventana
+        solapamiento (int): Caracteres compartidos entre ventanas consecutivas
+        
+    Yields:
+        str: Ventanas, en orden
+        
+    Raises:
+        ValueError: Si el solapamiento no es menor que la mitad de la ventana
+    """
+    if not 0 <= solapamiento < tamano // 2:
+        raise ValueError(f"El solapamiento ({solapamiento}) debe ser menor que la mitad de la ventana ({tamano})")
+    longitud = len(texto)
+    inicio = 0
+    while True:
+        fin = min(inicio + tamano, longitud)
+        if fin < longitud:
+            mitad = inicio + tamano // 2
+            corte = texto.rfind("\n", mitad, fin)
+            if corte == -1:
+                corte = texto.rfind(" ", mitad, fin)
+            if corte != -1:
+                fin = corte + 1
+        yield texto[inicio:fin]
+        if fin >= longitud:
+            return
+        espacio = _ESPACIO.search(texto, fin - solapamiento, fin)
+        inicio = espacio.end() if espacio else fin
+
+def combinar_parciales(parciales):
+    """
+    Combina los resultados parciales de las ventanas de un mismo texto.
+    
+    Las listas (entidades, instituciones, logros, competencias) se
+    concatenan, los grados se unen sin repetir, los años se toman como
+    máximo, los conteos de calidad se suman, el sentimiento general se
+    promedia ponderado por la longitud de cada ventana y los resúmenes del
+    sentimiento por oración se combinan (ver combinar_resumenes). Lo que cae
+    en el solapamiento entre ventanas se cuenta en ambas.
+    
+    Args:
+        parciales (list): Resultados de NLPAnalyzer._analizar_ventana
+        
+    Returns:
+        dict: Resultado parcial combinado, para completar_analisis
+    """
+    if len(parciales) == 1:
+        return parciales[0]
+    
+    def unir(clave, campos=None):
+        return {
+            campo: [valor for parcial in parciales for valor in parcial[clave][campo]]
+            for campo in campos or parciales[0][clave]
+        }
+    
+    experiencia = {
+        'años': max(parcial['experiencia']['años'] for parcial in parciales),
+        **unir('experiencia', ('cargos', 'instituciones', 'logros'))
+    }
+    
+    pesos = [parcial['estadisticas']['caracteres'] for parcial in parciales]
+    total = sum(pesos)
+    if total:
+        general = {
+            clave: sum(parcial['sentimiento']['general'][clave] * peso for parcial, peso in zip(parciales, pesos)) / total
+            for clave in parciales[0]['sentimiento']['general']
+        }
+    else:
+        general = sentimiento_vacio()['general']
+    
+    estadisticas = {
+        clave: sum(parcial['estadisticas'][clave] for parcial in parciales)
+        for clave in ('num_palabras', 'num_oraciones', 'palabras_contenido', 'caracteres')
+    }
+    estadisticas['palabras_distintas'] = set().union(*(parcial['estadisticas']['palabras_distintas'] for parcial in parciales))
+    
+    return {
+        'entidades': unir('entidades'),
+        'sentimiento': {
+            'general': general,
+            'oraciones': combinar_resumenes([parcial['sentimiento']['oraciones'] for parcial in parciales])
+        },
+        'experiencia': experiencia,
+        'formacion': {
+            **unir('formacion'),
+            'grados': [grado for grado in PATRONES_GRADOS
+                       if any(grado in parcial['formacion']['grados'] for parcial in parciales)]
+        },
+        'competencias': unir('competencias'),
+        'estadisticas': estadisticas
+    }
+
+def completar_analisis(parcial):
+    """
+    Convierte un resultado parcial en el resultado de analizar_texto,
+    calificando la calidad del texto a partir de sus conteos.
+    """
+    estadisticas = parcial['estadisticas']
+    resultado = {clave: valor for clave, valor in parcial.items() if clave != 'estadisticas'}
+    resultado['calidad_texto'] = _calificar_calidad(
+        estadisticas['num_palabras'], estadisticas['num_oraciones'],
+        len(estadisticas['palabras_distintas']), estadisticas['palabras_contenido']
+    )
+    return resultado
+
+def entidades_vacias():
+    """Resultado de entidades cuando no se ejecuta el reconocimiento de entidades."""
+    return {'organizaciones': [], 'personas': [], 'lugares': [], 'fechas': [], 'otros': []}
+
+def sentimiento_vacio():
+    """Resultado de sentimiento para los perfiles que no ejecutan VADER."""
+    return {'general': {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}, 'oraciones': resumir_compuestos([])}
+
+def muestrear_oraciones(oraciones, maximo=SENTIMIENTO_MAX_ORACIONES):
+    """
+    Toma como máximo `maximo` oraciones a intervalos regulares, de modo que
+    la muestra recorre todo el CV y no solo su comienzo.
+    
+    Args:
+        oraciones (list): Oraciones del documento
+        maximo (int): Número máximo de oraciones (None = todas)
+        
+    Returns:
+        list: Las oraciones seleccionadas, en su orden original
+    """
+    if maximo is None or len(oraciones) <= maximo:
+        return oraciones
+    paso = len(oraciones) / maximo
+    return [oraciones[int(i * paso)] for i in range(maximo)]
+
+def resumir_compuestos(compuestos):
+    """
+    Resume los puntajes compuestos de VADER de las oraciones analizadas.
+    
+    Returns:
+        dict: 'analizadas' (número de oraciones) y 'media', 'minimo' y
+            'maximo' del puntaje compuesto (0.0 si no hay oraciones)
+    """
+    if not compuestos:
+        return {'analizadas': 0, 'media': 0.0, 'minimo': 0.0, 'maximo': 0.0}
+    return {
+        'analizadas': len(compuestos),
+        'media': sum(compuestos) / len(compuestos),
+        'minimo': min(compuestos),
+        'maximo': max(compuestos)
+    }
+
+def combinar_resumenes(resumenes):
+    """
+    Combina los resúmenes de sentimiento por oración de varias ventanas: la
+    media se pondera por el número de oraciones analizadas en cada una.
+    """
+    resumenes = [resumen for resumen in resumenes if resumen['analizadas']]
+    if not resumenes:
+        return resumir_compuestos([])
+    analizadas = sum(resumen['analizadas'] for resumen in resumenes)
+    return {
+        'analizadas': analizadas,
+        'media': sum(resumen['media'] * resumen['analizadas'] for resumen in resumenes) / analizadas,
+        'minimo': min(resumen['minimo'] for resumen in resumenes),
+        'maximo': max(resumen['maximo'] for resumen in resumenes)
+    }
+
+class LoteSentimiento:
+    """
+    Acumula documentos y calcula su sentimiento VADER al resolver el lote.
+    
+    El sentimiento general se calcula siempre; el de cada oración solo para
+    los documentos agregados con sus oraciones, sobre una muestra de como
+    máximo max_oraciones (ver muestrear_oraciones), y se reduce a un resumen
+    del puntaje compuesto. Las oraciones repetidas entre documentos del lote
+    (encabezados y fórmulas comunes de los CVs) se puntúan una sola vez.
+    """
+    
+    def __init__(self, sia, max_oraciones=SENTIMIENTO_MAX_ORACIONES):
+        """
+        Args:
+            sia (SentimentIntensityAnalyzer): Analizador VADER
+            max_oraciones (int): Oraciones analizadas por documento (None = todas)
+        """
+        self.sia = sia
+        self.max_oraciones = max_oraciones
+        self._pendientes = []
+    
+    def __len__(self):
+        return len(self._pendientes)
+    
+    def agregar(self, texto, oraciones=None):
+        """
+        Agrega un documento al lote.
+        
+        Args:
+            texto (str): Texto limpio
+            oraciones (list, opcional): Oraciones ya segmentadas del
+                documento; si no se indican, solo se calcula el sentimiento general
+                
+        Returns:
+            dict: Resultado de sentimiento del documento ('general' y
+                'oraciones'), que se completa al llamar a resolver
+        """
+        resultado = {}
+        self._pendientes.append((resultado, texto, oraciones))
+        return resultado
+    
+    def resolver(self):
+        """Calcula el sentimiento de los documentos pendientes y vacía el lote."""
+        metricas = obtener_metricas()
+        compuestos = {}
+        for resultado, texto, oraciones in self._pendientes:
+            resumen = resumir_compuestos([])
+            if oraciones is not None:
+                muestra = muestrear_oraciones(oraciones, self.max_oraciones)
+                if len(muestra) < len(oraciones):
+                    metricas.incrementar("sentimiento_oraciones_omitidas", len(oraciones) - len(muestra))
+                # Misma limpieza que el texto completo
+                limpias = [limpiar_texto(oracion) for oracion in muestra]
+                for limpia in limpias:
+                    if limpia not in compuestos:
+                        compuestos[limpia] = self.sia.polarity_scores(limpia)['compound']
+                resumen = resumir_compuestos([compuestos[limpia] for limpia in limpias])
+            resultado.update(general=self.sia.polarity_scores(texto), oraciones=resumen)
+        self._pendientes = []
+
+def analizar_rapido(texto):
+    """
+    Análisis del perfil "rapido": sin spaCy ni VADER.
+    
+    Años, formación y competencias se obtienen con el mismo banco de
+    expresiones regulares que en los demás perfiles; la calidad del texto se calcula con
+    una tokenización por espacios y la segmentación de dividir_oraciones.
+    No hay entidades ni sentimiento.
+    
+    Args:
+        texto (str): Texto a analizar
+        
+    Returns:
+        dict: Resultados con la misma estructura que NLPAnalyzer.analizar_texto
+    """
+    with obtener_metricas().cronometro("analisis_rapido"):
+        texto_limpio = limpiar_texto(texto)
+        palabras = texto_limpio.split()
+        oraciones = dividir_oraciones(texto)
+        stop_words = stop_words_spacy()
+        menciones = menciones_nlp(texto_limpio)
+        return {
+            'entidades': entidades_vacias(),
+            'sentimiento': sentimiento_vacio(),
+            'experiencia': {
+                'años': menciones['años'],
+                'cargos': [],
+                'instituciones': [],
+                'logros': logros_mencionados(oraciones)
+            },
+            'formacion': {'grados': menciones['grados'], 'instituciones': [], 'especialidades': []},
+            'competencias': menciones['competencias'],
+            'calidad_texto': calificar_calidad(
+                len(palabras), len(oraciones), [palabra for palabra in palabras if palabra not in stop_words]
+            )
+        }
 
 class NLPAnalyzer:
-    def __init__(self):
-        """Inicializa el analizador NLP."""
+    def __init__(self, modelo=None, subanalisis=NLP_SUBANALISIS, oraciones=NLP_ORACIONES,
+                 ventana=NLP_VENTANA_CARACTERES, solapamiento=NLP_VENTANA_SOLAPAMIENTO,
+                 max_oraciones_sentimiento=SENTIMIENTO_MAX_ORACIONES):
+        """
+        Inicializa el analizador NLP.
+        
+        Args:
+            modelo (spacy.Language, opcional): Pipeline de spaCy a utilizar.
+                Por defecto se reutiliza el modelo compartido del proceso
+                (cargar_modelo), de modo que crear un analizador no vuelve a
+                ejecutar spacy.load.
+            subanalisis (iterable): Subanálisis a ejecutar (ver
+                COMPONENTES_SUBANALISIS); el modelo por defecto se carga solo
+                con los componentes que necesitan
+            oraciones (str): Segmentación en oraciones, "parser",
+                "sentencizer" o "reglas"
+            ventana (int): Caracteres a partir de los cuales un texto se
+                analiza por ventanas (ver ventanas_texto)
+            solapamiento (int): Caracteres compartidos entre ventanas
+            max_oraciones_sentimiento (int): Oraciones por texto o ventana
+                que analiza el sentimiento por oración (None = todas)
+        """
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        from nltk.corpus import stopwords
+        
+        necesarios = componentes_necesarios(subanalisis, oraciones)
+        self.subanalisis = frozenset(subanalisis)
+        self.oraciones = oraciones
+        
+        asegurar_recursos_nltk()
         self.sia = SentimentIntensityAnalyzer()
         self.stop_words = set(stopwords.words('spanish'))
+        if modelo is None:
+            modelo = cargar_modelo(tuple(c for c in COMPONENTES_OPCIONALES if c not in necesarios))
+        self.nlp = modelo
+        # La limpieza no alarga el texto, así que una ventana nunca supera max_length
+        self.ventana = min(ventana, self.nlp.max_length)
+        self.solapamiento = solapamiento
+        self.max_oraciones_sentimiento = max_oraciones_sentimiento
+    
+    def _omitidos(self, perfil):
+        """Componentes del modelo que no se ejecutan con el perfil."""
+        return [nombre for nombre in COMPONENTES_OMITIDOS[perfil] if nombre in self.nlp.pipe_names]
         
-        # Ya intentamos descargar los recursos al inicio del script,
-        # pero aseguramos la carga del modelo de spaCy aquí también.
-        try:
-            self.nlp = spacy.load('es_core_news_sm')
-        except OSError:
-            # Si el modelo no está instalado, descargarlo
-            print("Descargando modelo de spaCy en __init__...")
-            spacy.cli.download('es_core_news_sm')
-            self.nlp = spacy.load('es_core_news_sm')
-        
-    def analizar_texto(self, texto):
+    def analizar_texto(self, texto, perfil=PERFIL_ANALISIS):
         """
         Realiza un análisis completo del texto usando NLP.
         
         Args:
             texto (str): Texto a analizar
+            perfil (str): "rapido", "estandar" o "completo" (ver PERFIL_ANALISIS)
             
         Returns:
             dict: Resultados del análisis
         """
+        validar_perfil(perfil)
+        if perfil == "rapido":
+            return analizar_rapido(texto)
+        if len(texto) > self.ventana:
+            return self._analizar_por_ventanas(texto, perfil)
+        
         # Limpiar y preprocesar texto
         texto_limpio = self._limpiar_texto(texto)
         
         # Análisis con spaCy
-        doc = self.nlp(texto_limpio)
+        with obtener_metricas().cronometro("spacy"):
+            doc = self.nlp(texto_limpio, disable=self._omitidos(perfil))
         
-        # Extraer entidades
-        entidades = self._extraer_entidades(doc)
+        return self._analizar_doc(doc, texto, perfil)
+    
+    def analizar_lote(self, textos, batch_size=32, n_process=1, perfil=PERFIL_ANALISIS):
+        """
+        Analiza un lote de textos procesándolos con nlp.pipe.
         
-        # Análisis de sentimiento
-        # Especificamos el idioma español para sent_tokenize
-        sentimiento = self._analizar_sentimiento(texto_limpio)
+        El sentimiento de los textos que no se dividen en ventanas se calcula
+        por lotes de batch_size documentos (ver LoteSentimiento).
         
-        # Análisis de experiencia
-        experiencia = self._analizar_experiencia(doc)
+        Args:
+            textos (iterable): Textos a analizar
+            batch_size (int): Número de documentos por lote de spaCy
+            n_process (int): Número de procesos que usa spaCy (-1 para todos los núcleos)
+            perfil (str): "rapido", "estandar" o "completo" (ver PERFIL_ANALISIS)
+            
+        Returns:
+            list: Resultados del análisis, uno por texto y en el mismo orden
+                que devolvería analizar_texto
+        """
+        validar_perfil(perfil)
+        textos = list(textos)
+        if perfil == "rapido":
+            return [analizar_rapido(texto) for texto in textos]
+        
+        # Los textos largos se analizan aparte, por ventanas; los demás se
+        # limpian antes, para que el tiempo de spaCy no incluya la limpieza
+        cortos = [self._limpiar_texto(texto) for texto in textos if len(texto) <= self.ventana]
+        docs = self.nlp.pipe(cortos, batch_size=batch_size, n_process=n_process,
+                             disable=self._omitidos(perfil))
+        metricas = obtener_metricas()
+        lote = self._lote_sentimiento()
+        resultados = []
+        for texto in textos:
+            if len(texto) > self.ventana:
+                resultados.append(self._analizar_por_ventanas(texto, perfil))
+                continue
+            # nlp.pipe procesa los documentos conforme se piden
+            with metricas.cronometro("spacy"):
+                doc = next(docs)
+            resultados.append(self._analizar_doc(doc, texto, perfil, lote))
+            if len(lote) >= batch_size:
+                with metricas.cronometro("sentimiento"):
+                    lote.resolver()
+        with metricas.cronometro("sentimiento"):
+            lote.resolver()
+        return resultados
+    
+    def _analizar_por_ventanas(self, texto, perfil):
+        """
+        Analiza un texto largo por ventanas (ver ventanas_texto) y combina sus
+        resultados. spaCy procesa una sola ventana a la vez, de modo que su
+        memoria no crece con la longitud del CV.
+        """
+        metricas = obtener_metricas()
+        omitidos = self._omitidos(perfil)
+        parciales = []
+        for ventana in ventanas_texto(texto, self.ventana, self.solapamiento):
+            ventana_limpia = self._limpiar_texto(ventana)
+            with metricas.cronometro("spacy"):
+                doc = self.nlp(ventana_limpia, disable=omitidos)
+            parciales.append(self._analizar_ventana(doc, ventana, perfil))
+        metricas.incrementar("nlp_textos_divididos")
+        metricas.incrementar("nlp_ventanas", len(parciales))
+        return completar_analisis(combinar_parciales(parciales))
+    
+    def _lote_sentimiento(self):
+        """Crea un lote de sentimiento con la configuración del analizador."""
+        return LoteSentimiento(self.sia, self.max_oraciones_sentimiento)
+    
+    def _analizar_doc(self, doc, texto, perfil="completo", lote=None):
+        """Ejecuta los subanálisis activos sobre un documento de spaCy ya procesado."""
+        return completar_analisis(self._analizar_ventana(doc, texto, perfil, lote))
+    
+    def _analizar_ventana(self, doc, texto, perfil="completo", lote=None):
+        """
+        Ejecuta los subanálisis activos sobre un documento de spaCy ya
+        procesado (un texto completo o una de sus ventanas).
         
-        # Análisis de formación
-        formacion = self._analizar_formacion(doc)
+        Args:
+            doc (spacy.tokens.Doc): Documento del texto limpio
+            texto (str): Texto original, del que se toman las oraciones
+            perfil (str): "estandar" o "completo"
+            lote (LoteSentimiento, opcional): Lote al que se agrega el
+                sentimiento del documento, que queda pendiente hasta que se
+                resuelva; si no se indica, se calcula en el momento
+            
+        Returns:
+            dict: Resultado parcial, con los conteos de calidad del texto en
+                'estadisticas' (ver combinar_parciales y completar_analisis)
+        """
+        metricas = obtener_metricas()
+        activos = self.subanalisis
         
-        # Análisis de competencias
-        competencias = self._analizar_competencias(doc)
+        with metricas.cronometro("analisis_doc"):
+            # Las oraciones se calculan una sola vez y las comparten todos los subanálisis
+            oraciones = self._oraciones(doc, texto, perfil) if activos & SUBANALISIS_CON_ORACIONES else []
+            
+            # Años, grados y competencias en un solo recorrido del texto
+            menciones = menciones_nlp(doc.text) if activos & SUBANALISIS_CON_MENCIONES else None
+            
+            # Extraer entidades
+            entidades = self._extraer_entidades(doc) if "entidades" in activos else entidades_vacias()
+            
+            # Análisis de experiencia
+            if "experiencia" in activos:
+                experiencia = self._analizar_experiencia(doc, oraciones, menciones)
+            else:
+                experiencia = {'años': 0, 'cargos': [], 'instituciones': [], 'logros': []}
+            
+            # Análisis de formación
+            if "formacion" in activos:
+                formacion = self._analizar_formacion(doc, menciones)
+            else:
+                formacion = {'grados': [], 'instituciones': [], 'especialidades': []}
+            
+            # Análisis de competencias
+            if "competencias" in activos:
+                competencias = menciones['competencias']
+            else:
+                competencias = {tipo: [] for tipo in PATRONES_COMPETENCIAS}
+            
+            if "calidad_texto" in activos:
+                estadisticas = self._estadisticas_texto(doc, len(oraciones))
+            else:
+                estadisticas = {'num_palabras': 0, 'num_oraciones': 0, 'palabras_contenido': 0,
+                                'palabras_distintas': set()}
+            estadisticas['caracteres'] = len(doc.text)
+        
+        # Análisis de sentimiento; el resumen por oración solo en el perfil completo
+        if "sentimiento" in activos:
+            propio = lote is None
+            if propio:
+                lote = self._lote_sentimiento()
+            sentimiento = lote.agregar(doc.text, oraciones if perfil == "completo" else None)
+            if propio:
+                with metricas.cronometro("sentimiento"):
+                    lote.resolver()
+        else:
+            sentimiento = sentimiento_vacio()
         
         return {
             'entidades': entidades,
@@ -102,22 +741,25 @@ class NLPAnalyzer:
             'experiencia': experiencia,
             'formacion': formacion,
             'competencias': competencias,
-            'calidad_texto': self._evaluar_calidad_texto(doc)
+            'estadisticas': estadisticas
         }
     
     def _limpiar_texto(self, texto):
         """Limpia y normaliza el texto."""
-        # Convertir a minúsculas
-        texto = texto.lower()
-        
-        # Eliminar caracteres especiales y números
-        texto = re.sub(r'[^\w\s]', ' ', texto)
-        texto = re.sub(r'\d+', '', texto)
-        
-        # Eliminar espacios múltiples
-        texto = re.sub(r'\s+', ' ', texto).strip()
-        
-        return texto
+        return limpiar_texto(texto)
+    
+    def _oraciones(self, doc, texto, perfil="completo"):
+        """
+        Segmenta el documento en oraciones: en el perfil completo, con los
+        límites de oración de spaCy si está configurado el parser y se
+        ejecutó, o con el sentencizer de spaCy sobre el texto original; en
+        los demás casos, por reglas sobre el texto original.
+        """
+        if perfil == "completo" and self.oraciones == "parser" and doc.has_annotation("SENT_START"):
+            return [sent.text for sent in doc.sents]
+        if perfil == "completo" and self.oraciones == "sentencizer":
+            return [sent.text for sent in cargar_segmentador()(texto).sents if sent.text.strip()]
+        return dividir_oraciones(texto)
     
     def _extraer_entidades(self, doc):
         """Extrae entidades nombradas del texto."""
@@ -143,128 +785,83 @@ class NLPAnalyzer:
         
         return entidades
     
-    def _analizar_sentimiento(self, texto):
-        """Analiza el sentimiento general del texto."""
-        scores = self.sia.polarity_scores(texto)
-        
-        # Analizar sentimiento por oraciones
-        # Especificamos el idioma 'spanish' aquí
-        try:
-            oraciones = nltk.sent_tokenize(texto, language='spanish')
-            sentimientos_oraciones = [self.sia.polarity_scores(oracion) for oracion in oraciones]
-        except LookupError as e:
-            logging.error(f"LookupError al tokenizar oraciones en español: {e}")
-            logging.error(f"Texto que causó el error (primeras 500 chars): {texto[:500]}...")
-            oraciones = [texto] # Tratar todo el texto como una sola oración para evitar fallar
-            sentimientos_oraciones = [self.sia.polarity_scores(texto)] # Analizar sentimiento del texto completo
-        except Exception as e:
-            logging.error(f"Error inesperado al tokenizar oraciones: {e}")
-            logging.error(f"Texto que causó el error (primeras 500 chars): {texto[:500]}...")
-            oraciones = [texto] # Tratar todo el texto como una sola oración
-            sentimientos_oraciones = [self.sia.polarity_scores(texto)] # Analizar sentimiento del texto completo
-        
-        return {
-            'general': scores,
-            'por_oracion': sentimientos_oraciones
-        }
-    
-    def _analizar_experiencia(self, doc):
+    def _analizar_experiencia(self, doc, oraciones, menciones):
         """Analiza la experiencia mencionada en el texto."""
-        experiencia = {
-            'años': 0,
+        return {
+            'años': menciones['años'],
             'cargos': [],
-            'instituciones': [],
-            'logros': []
+            # Extraer instituciones
+            'instituciones': [ent.text for ent in doc.ents if ent.label_ == 'ORG'],
+            # Identificar logros
+            'logros': logros_mencionados(oraciones)
         }
-        
-        # Buscar patrones de años de experiencia
-        patrones_años = [
-            r'(\d+)\s*años?\s*de\s*experiencia',
-            r'experiencia\s*de\s*(\d+)\s*años?',
-            r'(\d+)\s*años?\s*en\s*el\s*cargo'
-        ]
-        
-        for patron in patrones_años:
-            matches = re.finditer(patron, doc.text)
-            for match in matches:
-                experiencia['años'] = max(experiencia['años'], int(match.group(1)))
-        
-        # Extraer cargos e instituciones
-        for ent in doc.ents:
-            if ent.label_ == 'ORG':
-                experiencia['instituciones'].append(ent.text)
-        
-        # Identificar logros
-        for sent in doc.sents:
-            if any(palabra in sent.text.lower() for palabra in ['logro', 'conseguí', 'alcanzado', 'obtenido']):
-                experiencia['logros'].append(sent.text)
-        
-        return experiencia
     
-    def _analizar_formacion(self, doc):
+    def _analizar_formacion(self, doc, menciones):
         """Analiza la formación académica mencionada en el texto."""
-        formacion = {
-            'grados': [],
-            'instituciones': [],
+        return {
+            'grados': menciones['grados'],
+            # Extraer instituciones educativas
+            'instituciones': [
+                ent.text for ent in doc.ents
+                if ent.label_ == 'ORG' and any(palabra in ent.text.lower() for palabra in ['universidad', 'instituto', 'escuela'])
+            ],
             'especialidades': []
         }
-        
-        # Patrones de grados académicos
-        patrones_grados = {
-            'doctorado': r'doctorado|doctora?|ph\.d\.?',
-            'maestría': r'maestría|maestro|maestra|m\.a\.?',
-            'licenciatura': r'licenciatura|licenciado|licenciada|lic\.',
-            'especialidad': r'especialidad|especialista'
-        }
-        
-        for grado, patron in patrones_grados.items():
-            if re.search(patron, doc.text.lower()):
-                formacion['grados'].append(grado)
-        
-        # Extraer instituciones educativas
-        for ent in doc.ents:
-            if ent.label_ == 'ORG' and any(palabra in ent.text.lower() for palabra in ['universidad', 'instituto', 'escuela']):
-                formacion['instituciones'].append(ent.text)
-        
-        return formacion
-    
-    def _analizar_competencias(self, doc):
-        """Analiza las competencias y habilidades mencionadas en el texto."""
-        competencias = {
-            'técnicas': [],
-            'blandas': [],
-            'idiomas': []
-        }
-        
-        # Patrones de competencias
-        patrones = {
-            'técnicas': r'programación|análisis|diseño|desarrollo|implementación|gestión',
-            'blandas': r'liderazgo|trabajo en equipo|comunicación|resolución de problemas',
-            'idiomas': r'inglés|español|francés|alemán|italiano|portugués'
-        }
-        
-        for tipo, patron in patrones.items():
-            matches = re.finditer(patron, doc.text.lower())
-            for match in matches:
-                competencias[tipo].append(match.group())
-        
-        return competencias
     
-    def _evaluar_calidad_texto(self, doc):
-        """Evalúa la calidad general del texto."""
+    def _estadisticas_texto(self, doc, num_oraciones):
+        """Cuenta las palabras con las que se califica la calidad del texto."""
         # Calcular métricas básicas
         num_palabras = len([token for token in doc if not token.is_punct])
-        num_oraciones = len(list(doc.sents))
-        
-        # Calcular diversidad léxica
         palabras = [token.text.lower() for token in doc if not token.is_punct and not token.is_stop]
-        diversidad_lexica = len(set(palabras)) / len(palabras) if palabras else 0
-        
-        # Evaluar estructura
-        estructura = {
-            'longitud': 'adecuada' if 100 <= num_palabras <= 2000 else 'inadecuada',
-            'complejidad': 'alta' if diversidad_lexica > 0.6 else 'media' if diversidad_lexica > 0.4 else 'baja',
-            'coherencia': 'alta' if num_oraciones > 5 else 'baja'
+        return {
+            'num_palabras': num_palabras,
+            'num_oraciones': num_oraciones,
+            'palabras_contenido': len(palabras),
+            'palabras_distintas': set(palabras)
         }
-        
-        return estructura 
\ No newline at end of file
+
+# Pool de analizadores: una instancia por proceso.
+# El analizador solo se lee después de construirse, por lo que los hilos
+# de un mismo proceso pueden compartirlo. En cada proceso hijo (fork o spawn)
+# se construye una instancia propia la primera vez que se solicita.
+_analizadores = {}
+_lock_analizadores = threading.Lock()
+
+def obtener_analizador():
+    """
+    Devuelve el NLPAnalyzer compartido del proceso actual, creándolo si es necesario.
+    
+    Returns:
+        NLPAnalyzer: Analizador listo para usarse
+    """
+    pid = os.getpid()
+    analizador = _analizadores.get(pid)
+    if analizador is None:
+        with _lock_analizadores:
+            analizador = _analizadores.get(pid)
+            if analizador is None:
+                # Descartar instancias heredadas de un proceso padre por fork
+                _analizadores.clear()
+                analizador = NLPAnalyzer()
+                _analizadores[pid] = analizador
+                logging.debug(f"NLPAnalyzer inicializado en el proceso {pid}")
+    return analizador
+
+def inicializar_worker(perfil=PERFIL_ANALISIS, max_memoria_mb=WORKER_MAX_MEMORIA_MB):
+    """
+    Precarga el analizador del proceso actual.
+    Pensado como `initializer` de un ProcessPoolExecutor para que cada worker
+    tenga su instancia caliente antes de recibir candidatos. El perfil
+    "rapido" no usa spaCy ni NLTK, así que no se cargan.
+    
+    Args:
+        perfil (str): Perfil de análisis que usarán los workers
+        max_memoria_mb (int, opcional): Memoria máxima del worker (ver
+            WORKER_MAX_MEMORIA_MB en config)
+    """
+    if perfil == "rapido":
+        stop_words_spacy()
+    else:
+        obtener_analizador()
+    if max_memoria_mb:
+        limitar_memoria(max_memoria_mb)
@@ -0,0 +1,132 @@
+"""
+Conteo de palabras clave en una sola pasada sobre el texto.
+Todas las listas de palabras clave se compilan en una única expresión regular
+con forma de trie, de modo que cada CV se recorre una vez en lugar de una vez
+por palabra clave.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+from .config import (
+    experiencia_judicial,
+    experiencia_administrativa,
+    experiencia_docente,
+    experiencia_investigacion,
+    palabras_positivas,
+    palabras_riesgo
+)
+
+# Listas de palabras clave por categoría usadas en el puntaje
+CATEGORIAS = {
+    "experiencia_judicial": experiencia_judicial,
+    "experiencia_administrativa": experiencia_administrativa,
+    "experiencia_docente": experiencia_docente,
+    "experiencia_investigacion": experiencia_investigacion,
+    "palabras_positivas": palabras_positivas,
+    "palabras_riesgo": palabras_riesgo
+}
+
+_CARACTER_PALABRA = re.compile(r"\w")
+
+def _es_palabra(caracter):
+    """Indica si un carácter forma parte de una palabra (\\w)."""
+    return bool(_CARACTER_PALABRA.match(caracter))
+
+def _regex_trie(palabras):
+    """
+    Construye una expresión regular equivalente a la alternancia de las
+    palabras, agrupando prefijos comunes. Los cuantificadores son codiciosos,
+    así que en cada posición se prefiere la palabra más larga.
+    """
+    trie = {}
+    for palabra in palabras:
+        nodo = trie
+        for caracter in palabra:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[""] = True
+
+    def emitir(nodo):
+        terminal = "" in nodo
+        alternativas = [
+            re.escape(caracter) + emitir(hijo)
+            for caracter, hijo in sorted(nodo.items()) if caracter
+        ]
+        if not alternativas:
+            return ""
+        cuerpo = alternativas[0] if len(alternativas) == 1 else "(?:" + "|".join(alternativas) + ")"
+        return "(?:" + cuerpo + ")?" if terminal else cuerpo
+
+    return emitir(trie)
+
+class ContadorPalabrasClave:
+    def __init__(self, categorias=CATEGORIAS):
+        """
+        Compila las listas de palabras clave.
+
+        Args:
+            categorias (dict): Nombre de categoría -> lista de palabras clave.
+                Las palabras deben estar en minúsculas. Una palabra repetida en
+                una lista cuenta tantas veces como aparece en ella.
+        """
+        self.categorias = list(categorias)
+
+        # Veces que cada palabra aparece en cada categoría
+        pesos = {}
+        for indice, palabras in enumerate(categorias.values()):
+            for palabra in palabras:
+                vector = pesos.setdefault(palabra, [0] * len(self.categorias))
+                vector[indice] += 1
+
+        # La expresión regular devuelve la palabra clave más larga que empieza en
+        # cada posición; las palabras clave que son prefijo de ella (p. ej. "juez"
+        # en "juez de distrito") se suman aquí de antemano.
+        self._conteos = {}
+        for palabra in pesos:
+            total = [0] * len(self.categorias)
+            for prefijo, vector in pesos.items():
+                if palabra.startswith(prefijo) and (
+                    len(prefijo) == len(palabra) or not _es_palabra(palabra[len(prefijo)])
+                ):
+                    total = [a + b for a, b in zip(total, vector)]
+            self._conteos[palabra] = total
+
+        # Cada coincidencia debe empezar y terminar en un límite de palabra. La
+        # búsqueda anticipada no consume texto, así que también se encuentran
+        # palabras clave que se solapan con otras.
+        self.patron = re.compile(r"(?<!\w)(?=(" + _regex_trie(pesos) + r")(?!\w))")
+
+    def contar(self, texto):
+        """
+        Cuenta las apariciones de cada categoría en una sola pasada.
+
+        Args:
+            texto (str): Texto en minúsculas
+
+        Returns:
+            dict: Número de coincidencias por categoría
+        """
+        coincidencias = Counter(m.group(1) for m in self.patron.finditer(texto))
+        totales = [0] * len(self.categorias)
+        for palabra, veces in coincidencias.items():
+            for indice, cantidad in enumerate(self._conteos[palabra]):
+                totales[indice] += cantidad * veces
+        return dict(zip(self.categorias, totales))
+
+@lru_cache(maxsize=None)
+def obtener_contador():
+    """Devuelve el contador compilado con las listas de src/config.py."""
+    return ContadorPalabrasClave()
+
+def contar_palabras_clave(texto):
+    """
+    Cuenta las palabras clave de todas las categorías de configuración.
+
+    Args:
+        texto (str): Texto en minúsculas
+
+    Returns:
+        dict: Número de coincidencias por categoría
+    """
+    return obtener_contador().contar(texto)
@@ -0,0 +1,108 @@
+"""
+Banco de expresiones regulares precompiladas para años de experiencia,
+formación académica y competencias.
+Las expresiones se compilan una sola vez al importar el módulo (cada
+categoría como una alternancia de sus variantes, con el valor en un grupo con
+nombre), y una sola llamada por documento devuelve todas las menciones sobre
+el texto ya en minúsculas, sin volver a convertirlo en cada búsqueda.
+
+Las categorías no se unen en una única alternancia: con el módulo re de
+CPython esa expresión pierde la búsqueda rápida por prefijo literal de cada
+patrón y resulta más lenta que recorrer el texto una vez por categoría (ver
+benchmarks/bench_patrones.py). Lo costoso eran los patrones que empiezan con
+un número, que el motor prueba en cada posición del texto; esos se combinan
+en una sola expresión que empieza con \\d, de modo que la búsqueda salta de
+una cifra a la siguiente.
+"""
+
+import re
+
+# Años de experiencia en el texto del CV. El grupo 'valor' es un número de
+# años o, si tiene cuatro cifras, el año de inicio.
+PATRONES_AÑOS_CV = [
+    r'(?P<valor>\d\d*)\s*años?\s*(?:de\s*experiencia|en\s*el\s*cargo|como\s*juez|como\s*magistrado)',
+    r'experiencia\s*de\s*(?P<valor>\d+)\s*años?',
+    r'desde\s*(?:el\s*año\s*|(?=\d{4}\s*a\s*la\s*fecha))(?P<valor>\d{4})'
+]
+AÑO_REFERENCIA = 2024  # Año hasta el que se cuentan los años desde un año de inicio
+
+# Grados académicos e instituciones en el texto del CV (se cuentan)
+PATRONES_GRADOS_CV = {
+    "doctorado": r'doctorado|doctora|doctor',
+    "maestría": r'maestría|maestro|maestra',
+    "licenciatura": r'licenciatura|licenciado|licenciada',
+    "especialidad": r'especialidad|especialista'
+}
+PATRON_INSTITUCIONES_CV = r'universidad|instituto|centro|escuela'
+
+# Patrones del análisis NLP, aplicados al texto limpio (ver nlp_analyzer.limpiar_texto)
+PATRONES_AÑOS = [
+    r'(?P<valor>\d\d*)\s*años?\s*(?:de\s*experiencia|en\s*el\s*cargo)',
+    r'experiencia\s*de\s*(?P<valor>\d+)\s*años?'
+]
+
+PATRONES_GRADOS = {
+    'doctorado': r'doctorado|doctora?|ph\.d\.?',
+    'maestría': r'maestría|maestro|maestra|m\.a\.?',
+    'licenciatura': r'licenciatura|licenciado|licenciada|lic\.',
+    'especialidad': r'especialidad|especialista'
+}
+
+PATRONES_COMPETENCIAS = {
+    'técnicas': r'programación|análisis|diseño|desarrollo|implementación|gestión',
+    'blandas': r'liderazgo|trabajo en equipo|comunicación|resolución de problemas',
+    'idiomas': r'inglés|español|francés|alemán|italiano|portugués'
+}
+
+_AÑOS_CV = [re.compile(patron) for patron in PATRONES_AÑOS_CV]
+_GRADOS_CV = {grado: re.compile(patron) for grado, patron in PATRONES_GRADOS_CV.items()}
+_INSTITUCIONES_CV = re.compile(PATRON_INSTITUCIONES_CV)
+_AÑOS = [re.compile(patron) for patron in PATRONES_AÑOS]
+_GRADOS = {grado: re.compile(patron) for grado, patron in PATRONES_GRADOS.items()}
+_COMPETENCIAS = {tipo: re.compile(patron) for tipo, patron in PATRONES_COMPETENCIAS.items()}
+
+def _max_años(patrones, texto, año_inicio=False):
+    """Devuelve el mayor número de años que capturan los patrones (0 si ninguno)."""
+    años = 0
+    for patron in patrones:
+        for match in patron.finditer(texto):
+            valor = match.group("valor")
+            años = max(años, AÑO_REFERENCIA - int(valor) if año_inicio and len(valor) == 4 else int(valor))
+    return años
+
+def menciones_cv(texto):
+    """
+    Busca años de experiencia, grados académicos e instituciones de un CV.
+
+    Args:
+        texto (str): Texto del CV en minúsculas
+
+    Returns:
+        dict: 'años' (el mayor mencionado, 0 si no hay), 'grados' (número de
+            menciones por grado de PATRONES_GRADOS_CV) e 'instituciones'
+            (número de menciones)
+    """
+    return {
+        "años": _max_años(_AÑOS_CV, texto, año_inicio=True),
+        "grados": {grado: len(patron.findall(texto)) for grado, patron in _GRADOS_CV.items()},
+        "instituciones": len(_INSTITUCIONES_CV.findall(texto))
+    }
+
+def menciones_nlp(texto):
+    """
+    Busca años de experiencia, grados académicos y competencias para el
+    análisis NLP.
+
+    Args:
+        texto (str): Texto limpio (en minúsculas)
+
+    Returns:
+        dict: 'años' (el mayor mencionado, 0 si no hay), 'grados' (grados
+            mencionados, en el orden de PATRONES_GRADOS) y 'competencias'
+            (texto de cada mención, por tipo)
+    """
+    return {
+        "años": _max_años(_AÑOS, texto),
+        "grados": [grado for grado, patron in _GRADOS.items() if patron.search(texto)],
+        "competencias": {tipo: patron.findall(texto) for tipo, patron in _COMPETENCIAS.items()}
+    }
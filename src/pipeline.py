@@ -0,0 +1,294 @@
+"""
+Pipeline por etapas para procesar una sección.
+Descarga, extracción de texto, análisis NLP/puntaje y escritura corren al
+mismo tiempo en hilos separados, conectados por colas acotadas, de modo que
+la red, el lector de PDFs y spaCy trabajan en paralelo y la memoria no crece
+con el número de candidatos. La descarga no se adelanta más de una ventana
+fija al último resultado entregado, así que el búfer de reordenamiento
+también está acotado aunque una descarga temprana se demore.
+"""
+
+import os
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+
+from .config import NLP_BATCH_SIZE, PIPELINE_TAMANO_COLA, PIPELINE_VENTANA_REORDEN
+from .descargas import obtener_descargador
+from .metricas import obtener_metricas
+
+# Marca de fin de flujo entre etapas
+_FIN = object()
+
+# Marca que pide a las etapas procesar sus lotes incompletos (la descarga la
+# envía cuando espera a que avance la ventana de reordenamiento)
+_VACIAR = object()
+
+class PipelineSeccion:
+    def __init__(self, tareas, extraer, puntuar_lote, evaluar_lote=None, executor=None,
+                 descargador=None, tamano_cola=PIPELINE_TAMANO_COLA, tamano_lote=NLP_BATCH_SIZE,
+                 ventana_reorden=PIPELINE_VENTANA_REORDEN):
+        """
+        Prepara el pipeline.
+
+        Args:
+            tareas (list): Candidatos a procesar; cada uno con 'url' y 'archivo_pdf'
+            extraer (callable): tarea -> (candidato, error)
+            puntuar_lote (callable): lista de (tarea, candidato, error) -> salidas
+            evaluar_lote (callable, opcional): lista de tareas -> (salidas,
+                métricas del worker); se ejecuta en `executor` y hace
+                extracción y puntaje en el worker
+            executor (ProcessPoolExecutor, opcional): Pool de procesos
+            descargador (DescargadorPDF, opcional): Descargador a utilizar
+            tamano_cola (int): Elementos máximos en cada cola entre etapas
+            tamano_lote (int): Candidatos por lote de análisis
+            ventana_reorden (int): Candidatos máximos por delante del
+                último resultado entregado
+        """
+        self.tareas = list(tareas)
+        self.extraer = extraer
+        self.puntuar_lote = puntuar_lote
+        self.evaluar_lote = evaluar_lote
+        self.executor = executor
+        self.descargador = descargador or obtener_descargador()
+        self.tamano_cola = tamano_cola
+        self.tamano_lote = tamano_lote
+        self.ventana_reorden = max(1, ventana_reorden)
+        self._error = None
+        # Resultados entregados en orden y descargas en curso, para la ventana
+        self._avance = threading.Condition()
+        self._entregados = 0
+        self._descargando = 0
+
+    def ejecutar(self):
+        """
+        Ejecuta las etapas y entrega los resultados en el orden de las tareas.
+
+        Yields:
+            tuple: (tarea, salida) con la salida de puntuar_lote/evaluar_lote
+        """
+        cola_descargados = queue.Queue(self.tamano_cola)
+        cola_resultados = queue.Queue(self.tamano_cola)
+
+        hilos = [threading.Thread(target=self._ejecutar_etapa, args=(self._descargar, None, cola_descargados),
+                                  name="pipeline-descarga", daemon=True)]
+        if self.executor is not None:
+            # La extracción ocurre en los workers junto con el análisis
+            hilos.append(threading.Thread(target=self._ejecutar_etapa,
+                                          args=(self._evaluar_en_pool, cola_descargados, cola_resultados),
+                                          name="pipeline-pool", daemon=True))
+        else:
+            cola_extraidos = queue.Queue(self.tamano_cola)
+            hilos.append(threading.Thread(target=self._ejecutar_etapa,
+                                          args=(self._extraer, cola_descargados, cola_extraidos),
+                                          name="pipeline-extraccion", daemon=True))
+            hilos.append(threading.Thread(target=self._ejecutar_etapa,
+                                          args=(self._analizar, cola_extraidos, cola_resultados),
+                                          name="pipeline-analisis", daemon=True))
+        for hilo in hilos:
+            hilo.start()
+
+        # Etapa de escritura: reordenar y entregar conforme llegan los resultados
+        pendientes = {}
+        siguiente = 0
+        try:
+            while True:
+                elemento = cola_resultados.get()
+                if elemento is _FIN:
+                    break
+                posicion, tarea, salida = elemento
+                pendientes[posicion] = (tarea, salida)
+                while siguiente in pendientes:
+                    elemento = pendientes.pop(siguiente)
+                    siguiente += 1
+                    with self._avance:
+                        self._entregados = siguiente
+                        self._avance.notify_all()
+                    yield elemento
+        finally:
+            # Liberar a la descarga si el flujo terminó antes (error o cierre)
+            with self._avance:
+                self._entregados = len(self.tareas)
+                self._avance.notify_all()
+
+        for hilo in hilos:
+            hilo.join()
+        if self._error is not None:
+            raise self._error
+
+    def _ejecutar_etapa(self, etapa, entrada, salida):
+        """
+        Ejecuta una etapa y siempre envía la marca de fin a la siguiente.
+        Si la etapa falla, consume el resto de su entrada para no bloquear
+        a las etapas anteriores.
+        """
+        try:
+            etapa(entrada, salida)
+        except Exception as e:
+            logging.error(f"Error en la etapa {threading.current_thread().name}: {e}")
+            self._error = e
+            if entrada is not None:
+                while entrada.get() is not _FIN:
+                    pass
+        finally:
+            salida.put(_FIN)
+
+    def _descargar(self, _, salida):
+        """Etapa de descarga: entrega cada tarea cuando su PDF está disponible."""
+        self.descargador.registrar_pendientes(
+            sum(not os.path.exists(t["archivo_pdf"]) for t in self.tareas)
+        )
+
+        # Limitar las tareas en vuelo para que la etapa no se adelante demasiado
+        en_vuelo = threading.BoundedSemaphore(self.tamano_cola)
+
+        def preparar(posicion, tarea):
+            try:
+                if not os.path.exists(tarea["archivo_pdf"]):
+                    resultado = self.descargador.descargar(tarea["url"], tarea["archivo_pdf"])
+                    if resultado["ok"]:
+                        # Validadores HTTP para revalidar la copia en ejecuciones posteriores
+                        tarea["validadores"] = {"etag": resultado["etag"], "last_modified": resultado["last_modified"]}
+            finally:
+                salida.put((posicion, tarea))
+                en_vuelo.release()
+                with self._avance:
+                    self._descargando -= 1
+                    self._avance.notify_all()
+
+        with ThreadPoolExecutor(max_workers=self.descargador.workers,
+                                thread_name_prefix="pipeline-descarga") as pool:
+            for posicion, tarea in enumerate(self.tareas):
+                self._esperar_ventana(posicion, salida)
+                en_vuelo.acquire()
+                with self._avance:
+                    self._descargando += 1
+                pool.submit(preparar, posicion, tarea)
+
+    def _esperar_ventana(self, posicion, salida):
+        """
+        Espera a que la posición entre en la ventana de reordenamiento. Si
+        las descargas en curso terminan y la ventana sigue llena, pide a las
+        etapas siguientes que procesen sus lotes incompletos, que pueden
+        contener el resultado que la escritura espera.
+        """
+        def dentro():
+            return posicion < self._entregados + self.ventana_reorden
+
+        with self._avance:
+            self._avance.wait_for(lambda: dentro() or self._descargando == 0)
+            if dentro():
+                return
+        salida.put(_VACIAR)
+        with self._avance:
+            self._avance.wait_for(dentro)
+
+    def _extraer(self, entrada, salida):
+        """Etapa de extracción de texto y conteo de palabras clave."""
+        while True:
+            elemento = entrada.get()
+            if elemento is _FIN:
+                return
+            if elemento is _VACIAR:
+                salida.put(_VACIAR)
+                continue
+            posicion, tarea = elemento
+            candidato, error = self.extraer(tarea)
+            salida.put((posicion, tarea, candidato, error))
+
+    def _analizar(self, entrada, salida):
+        """Etapa de análisis NLP y puntaje, en lotes de tamano_lote."""
+        lote = []
+
+        def procesar():
+            salidas = self.puntuar_lote([(tarea, candidato, error) for _, tarea, candidato, error in lote])
+            for (posicion, tarea, _, _), resultado in zip(lote, salidas):
+                salida.put((posicion, tarea, resultado))
+            lote.clear()
+
+        while True:
+            elemento = entrada.get()
+            if elemento is _FIN:
+                break
+            if elemento is _VACIAR:
+                if lote:
+                    procesar()
+                continue
+            lote.append(elemento)
+            if len(lote) >= self.tamano_lote:
+                procesar()
+        if lote:
+            procesar()
+
+    def _evaluar_en_pool(self, entrada, salida):
+        """
+        Etapa que envía lotes de tareas descargadas al pool de procesos.
+
+        Si un lote falla en el pool (un worker murió o su resultado no se
+        pudo transferir), sus candidatos se entregan con error para que se
+        reintenten en la próxima corrida. Si el pool quedó inutilizable, los
+        lotes restantes se extraen y puntúan en este proceso.
+        """
+        max_en_vuelo = 2 * (getattr(self.executor, "_max_workers", None) or os.cpu_count() or 1)
+        en_vuelo = deque()
+        lote = []
+        pool_roto = False
+
+        def recoger():
+            nonlocal pool_roto
+            posiciones, tareas, futuro = en_vuelo.popleft()
+            try:
+                salidas, metricas_worker = futuro.result()
+                obtener_metricas().fusionar(metricas_worker)
+            except Exception as e:
+                logging.error(f"Falló un lote de {len(tareas)} candidatos en el pool de procesos: {e}")
+                if isinstance(e, BrokenExecutor) and not pool_roto:
+                    logging.warning("El pool de procesos quedó inutilizable; se continúa en este proceso")
+                    pool_roto = True
+                salidas = [{"resultado": None, "hash_pdf": None, "error": str(e) or type(e).__name__}
+                           for _ in tareas]
+            for posicion, tarea, resultado in zip(posiciones, tareas, salidas):
+                salida.put((posicion, tarea, resultado))
+
+        def enviar():
+            nonlocal pool_roto
+            posiciones = [posicion for posicion, _ in lote]
+            tareas = [tarea for _, tarea in lote]
+            lote.clear()
+            if not pool_roto:
+                try:
+                    futuro = self.executor.submit(self.evaluar_lote, tareas)
+                except BrokenExecutor as e:
+                    logging.warning(f"El pool de procesos quedó inutilizable ({e}); se continúa en este proceso")
+                    pool_roto = True
+            if pool_roto:
+                # Sin pool: extracción y puntaje en este proceso
+                salidas = self.puntuar_lote([(tarea, *self.extraer(tarea)) for tarea in tareas])
+                for posicion, tarea, resultado in zip(posiciones, tareas, salidas):
+                    salida.put((posicion, tarea, resultado))
+                return
+            en_vuelo.append((posiciones, tareas, futuro))
+            if len(en_vuelo) >= max_en_vuelo:
+                recoger()
+            while en_vuelo and en_vuelo[0][2].done():
+                recoger()
+
+        while True:
+            elemento = entrada.get()
+            if elemento is _FIN:
+                break
+            if elemento is _VACIAR:
+                if lote:
+                    enviar()
+                while en_vuelo:
+                    recoger()
+                continue
+            lote.append(elemento)
+            if len(lote) >= self.tamano_lote:
+                enviar()
+        if lote:
+            enviar()
+        while en_vuelo:
+            recoger()
@@ -0,0 +1,156 @@
+"""
+Puntaje vectorizado de candidatos.
+Los subpuntajes, el total y la aptitud de una sección completa se calculan
+con operaciones sobre columnas a partir de una matriz de características
+(una fila por candidato), siguiendo la tabla de pesos y topes de un perfil
+de puntaje de config.py (PERFILES_PUNTAJE).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    PERFILES_PUNTAJE,
+    PERFIL_PUNTAJE,
+    CRITERIOS_APTITUD,
+    APTITUD_POR_DEFECTO
+)
+
+# Características que se guardan por candidato
+CARACTERISTICAS = [
+    "experiencia_judicial",
+    "experiencia_docente",
+    "experiencia_investigacion",
+    "experiencia_administrativa",
+    "años_experiencia",
+    "nivel_formacion",
+    "instituciones_formacion",
+    "conteo_positivas",
+    "conteo_riesgos",
+    "calidad_texto"
+]
+
+def caracteristicas_candidato(exp, conteo_positivas, conteo_riesgos):
+    """
+    Reúne las características de un candidato que intervienen en el puntaje.
+
+    Args:
+        exp (dict): Resultado de analizar_experiencia
+        conteo_positivas (int): Número de palabras positivas
+        conteo_riesgos (int): Número de palabras de riesgo (con penalizaciones)
+
+    Returns:
+        dict: Valor de cada característica de CARACTERISTICAS
+    """
+    return {
+        "experiencia_judicial": exp["experiencia_judicial"],
+        "experiencia_docente": exp["experiencia_docente"],
+        "experiencia_investigacion": exp["experiencia_investigacion"],
+        "experiencia_administrativa": exp["experiencia_administrativa"],
+        "años_experiencia": exp["años_experiencia"],
+        "nivel_formacion": exp["formacion"]["nivel_maximo"],
+        "instituciones_formacion": exp["formacion"]["instituciones"],
+        "conteo_positivas": conteo_positivas,
+        "conteo_riesgos": conteo_riesgos,
+        "calidad_texto": exp["calidad_texto"]
+    }
+
+def obtener_perfil_puntaje(nombre=PERFIL_PUNTAJE):
+    """
+    Devuelve la configuración de un perfil de puntaje.
+
+    Args:
+        nombre (str): Nombre del perfil en PERFILES_PUNTAJE
+
+    Returns:
+        dict: 'tabla', 'puntos_formacion', 'minimo', 'maximo', 'criterios'
+            y 'aptitud_por_defecto'
+
+    Raises:
+        ValueError: Si el perfil no existe
+    """
+    if nombre not in PERFILES_PUNTAJE:
+        raise ValueError(f"Perfil de puntaje desconocido: {nombre}")
+    return PERFILES_PUNTAJE[nombre]
+
+def clasificar_aptitud(nivel_formacion, experiencia_judicial, conteo_riesgos,
+                       criterios=CRITERIOS_APTITUD, puntaje_total=None,
+                       aptitud_por_defecto=APTITUD_POR_DEFECTO):
+    """
+    Clasifica la aptitud de varios candidatos a la vez.
+
+    Args:
+        nivel_formacion (array): Nivel máximo de formación de cada candidato
+        experiencia_judicial (array): Conteo de experiencia judicial
+        conteo_riesgos (array): Conteo de palabras de riesgo
+        criterios (list): Criterios (aptitud, niveles, mínimo judicial, máximo
+            de riesgos, puntaje mínimo) en orden de prioridad
+        puntaje_total (array, opcional): Puntaje total de cada candidato; sin
+            él no se aplica el puntaje mínimo de los criterios
+        aptitud_por_defecto (str): Aptitud de quien no cumple ningún criterio
+
+    Returns:
+        numpy.ndarray: Aptitud de cada candidato
+    """
+    nivel_formacion = np.asarray(nivel_formacion, dtype=object)
+    experiencia_judicial = np.asarray(experiencia_judicial)
+    conteo_riesgos = np.asarray(conteo_riesgos)
+    todos = np.ones(len(nivel_formacion), dtype=bool)
+    puntaje_total = np.asarray(puntaje_total, dtype=float) if puntaje_total is not None else None
+
+    condiciones = [
+        (np.isin(nivel_formacion, niveles) if niveles is not None else todos)
+        & (experiencia_judicial >= minimo_judicial)
+        & (conteo_riesgos <= maximo_riesgos)
+        & (puntaje_total >= minimo_puntaje if puntaje_total is not None else todos)
+        for _, niveles, minimo_judicial, maximo_riesgos, minimo_puntaje in criterios
+    ]
+    aptitudes = [criterio[0] for criterio in criterios]
+    return np.select(condiciones, aptitudes, default=aptitud_por_defecto).astype(object)
+
+def puntuar_caracteristicas(caracteristicas, tabla=None, puntos_formacion=None, perfil_puntaje=PERFIL_PUNTAJE):
+    """
+    Calcula subpuntajes, puntaje total y aptitud de todos los candidatos.
+
+    Args:
+        caracteristicas (pandas.DataFrame): Una fila por candidato y una
+            columna por cada elemento de CARACTERISTICAS
+        tabla (dict, opcional): Columna de salida -> (característica, peso,
+            tope); por defecto la del perfil
+        puntos_formacion (dict, opcional): Puntos por nivel máximo de
+            formación; por defecto los del perfil
+        perfil_puntaje (str): Perfil de PERFILES_PUNTAJE con la tabla, los
+            límites del total y los criterios de aptitud
+
+    Returns:
+        pandas.DataFrame: 'Puntaje Total', 'Aptitud' y una columna por
+            subpuntaje de la tabla, con el mismo índice que la entrada
+    """
+    perfil = obtener_perfil_puntaje(perfil_puntaje)
+    tabla = tabla if tabla is not None else perfil["tabla"]
+    puntos_formacion = puntos_formacion if puntos_formacion is not None else perfil["puntos_formacion"]
+    valores = caracteristicas.assign(
+        puntos_formacion=caracteristicas["nivel_formacion"].map(puntos_formacion).fillna(0)
+    )
+
+    subpuntajes = {}
+    for columna, (caracteristica, peso, tope) in tabla.items():
+        puntaje = valores[caracteristica].to_numpy(dtype=float) * peso
+        if tope is not None:
+            puntaje = np.minimum(puntaje, tope)
+        subpuntajes[columna] = puntaje
+
+    total = np.clip(np.sum(list(subpuntajes.values()), axis=0), perfil["minimo"], perfil["maximo"])
+    aptitud = clasificar_aptitud(
+        caracteristicas["nivel_formacion"],
+        caracteristicas["experiencia_judicial"],
+        caracteristicas["conteo_riesgos"],
+        criterios=perfil["criterios"],
+        puntaje_total=total,
+        aptitud_por_defecto=perfil["aptitud_por_defecto"]
+    )
+
+    return pd.DataFrame(
+        {"Puntaje Total": total, "Aptitud": aptitud, **subpuntajes},
+        index=caracteristicas.index
+    )
@@ -0,0 +1,226 @@
+"""
+Escritura incremental de resultados.
+Las filas se escriben en CSV, JSONL o Parquet a medida que terminan los
+candidatos, en un archivo `.part` que se renombra al cerrar. Si la ejecución
+se interrumpe, los resultados parciales quedan en el archivo `.part` y el
+resultado completo anterior no se pierde. Excel es solo una exportación
+final opcional que se escribe una vez.
+"""
+
+import os
+import csv
+import json
+import shutil
+import logging
+
+import pandas as pd
+
+from .config import FORMATO_RESULTADOS, PARQUET_FILAS_POR_PARTE
+
+def _valor_json(valor):
+    """Convierte los escalares de NumPy/pandas a tipos nativos para JSON."""
+    if hasattr(valor, "item"):
+        return valor.item()
+    return str(valor)
+
+class EscritorResultados:
+    """Base de los escritores: se usan como administradores de contexto."""
+
+    extension = None
+
+    def __init__(self, ruta):
+        """
+        Abre el escritor.
+
+        Args:
+            ruta (str): Ruta final de los resultados
+        """
+        self.ruta = ruta
+        self.ruta_parcial = ruta + ".part"
+        self.filas_escritas = 0
+
+    def escribir(self, fila):
+        """Escribe una fila (diccionario columna -> valor)."""
+        self.escribir_filas([fila])
+
+    def escribir_filas(self, filas):
+        """Escribe varias filas y las vuelca a disco."""
+        raise NotImplementedError
+
+    def _cerrar_archivo(self):
+        """Cierra el archivo parcial."""
+        raise NotImplementedError
+
+    def cerrar(self, completo=True):
+        """
+        Cierra el escritor.
+
+        Args:
+            completo (bool): Si es True, el archivo parcial reemplaza al final;
+                si no, se conserva como `.part` con las filas escritas
+        """
+        self._cerrar_archivo()
+        if completo:
+            if os.path.isdir(self.ruta):
+                shutil.rmtree(self.ruta)
+            os.replace(self.ruta_parcial, self.ruta)
+            logging.info(f"Resultados guardados en {self.ruta} ({self.filas_escritas} filas)")
+        else:
+            logging.warning(f"Resultados parciales en {self.ruta_parcial} ({self.filas_escritas} filas)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar(completo=tipo is None)
+        return False
+
+class EscritorCSV(EscritorResultados):
+    extension = "csv"
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        # utf-8-sig para que Excel reconozca los acentos al abrir el CSV
+        self._archivo = open(self.ruta_parcial, "w", newline="", encoding="utf-8-sig")
+        self._escritor = None
+
+    def escribir_filas(self, filas):
+        for fila in filas:
+            if self._escritor is None:
+                self._escritor = csv.DictWriter(self._archivo, fieldnames=list(fila))
+                self._escritor.writeheader()
+            self._escritor.writerow(fila)
+            self.filas_escritas += 1
+        self._archivo.flush()
+
+    def _cerrar_archivo(self):
+        self._archivo.close()
+
+class EscritorJSONL(EscritorResultados):
+    extension = "jsonl"
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        self._archivo = open(self.ruta_parcial, "w", encoding="utf-8")
+
+    def escribir_filas(self, filas):
+        for fila in filas:
+            self._archivo.write(json.dumps(fila, ensure_ascii=False, default=_valor_json) + "\n")
+            self.filas_escritas += 1
+        self._archivo.flush()
+
+    def _cerrar_archivo(self):
+        self._archivo.close()
+
+class EscritorParquet(EscritorResultados):
+    """
+    Escribe un directorio de archivos Parquet (uno cada `filas_por_parte`
+    filas), que pandas y pyarrow leen como una sola tabla. Un archivo Parquet
+    sin cerrar no se puede leer, así que una interrupción pierde como mucho
+    las filas de la parte en curso.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, ruta, filas_por_parte=PARQUET_FILAS_POR_PARTE):
+        super().__init__(ruta)
+        self.filas_por_parte = filas_por_parte
+        if os.path.isdir(self.ruta_parcial):
+            shutil.rmtree(self.ruta_parcial)
+        os.makedirs(self.ruta_parcial)
+        self._pendientes = []
+        self._partes = 0
+        self._esquema = None
+
+    def escribir_filas(self, filas):
+        self._pendientes.extend(filas)
+        if len(self._pendientes) >= self.filas_por_parte:
+            self._escribir_parte()
+
+    def _escribir_parte(self):
+        """Escribe las filas pendientes en un archivo nuevo del directorio."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._pendientes:
+            return
+        if self._esquema is None:
+            tabla = pa.Table.from_pylist(self._pendientes)
+            # Las columnas vacías en la primera parte se guardan como texto
+            self._esquema = pa.schema([
+                campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo
+                for campo in tabla.schema
+            ])
+        tabla = pa.Table.from_pylist(self._pendientes, schema=self._esquema)
+        pq.write_table(tabla, os.path.join(self.ruta_parcial, f"parte-{self._partes:05d}.parquet"))
+        self._partes += 1
+        self.filas_escritas += len(self._pendientes)
+        self._pendientes = []
+
+    def _cerrar_archivo(self):
+        self._escribir_parte()
+
+ESCRITORES = {
+    EscritorCSV.extension: EscritorCSV,
+    EscritorJSONL.extension: EscritorJSONL,
+    EscritorParquet.extension: EscritorParquet
+}
+
+def ruta_resultados(ruta_base, formato=FORMATO_RESULTADOS):
+    """Devuelve la ruta de resultados con la extensión del formato."""
+    return os.path.splitext(ruta_base)[0] + "." + formato
+
+def abrir_escritor(ruta_base, formato=FORMATO_RESULTADOS):
+    """
+    Abre un escritor de resultados.
+
+    Args:
+        ruta_base (str): Ruta de salida; su extensión se reemplaza por la del formato
+        formato (str): "csv", "jsonl" o "parquet"
+
+    Returns:
+        EscritorResultados: Escritor abierto
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato de resultados desconocido: {formato}")
+    ruta = ruta_resultados(ruta_base, formato)
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    return ESCRITORES[formato](ruta)
+
+def leer_resultados(ruta):
+    """
+    Lee un archivo de resultados escrito por abrir_escritor.
+
+    Args:
+        ruta (str): Ruta con extensión .csv, .jsonl o .parquet
+
+    Returns:
+        pandas.DataFrame: Resultados
+    """
+    formato = os.path.splitext(ruta)[1].lstrip(".")
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato de resultados desconocido: {formato}")
+    # Sin filas: directorio Parquet vacío, o archivo vacío o solo con la marca BOM
+    if (not os.listdir(ruta)) if os.path.isdir(ruta) else os.path.getsize(ruta) <= 3:
+        return pd.DataFrame()
+    if formato == "csv":
+        return pd.read_csv(ruta, encoding="utf-8-sig")
+    if formato == "jsonl":
+        return pd.read_json(ruta, lines=True)
+    return pd.read_parquet(ruta)
+
+def exportar_excel(ruta_resultados, archivo_excel, hoja="Resultados"):
+    """
+    Exporta un archivo de resultados a Excel, reemplazando el libro si existe.
+
+    Args:
+        ruta_resultados (str): Archivo escrito por abrir_escritor
+        archivo_excel (str): Ruta del libro .xlsx
+        hoja (str): Nombre de la hoja
+    """
+    df = leer_resultados(ruta_resultados)
+    df.to_excel(archivo_excel, sheet_name=hoja, index=False)
+    logging.info(f"Resultados exportados a la hoja '{hoja}' de {archivo_excel}")
@@ -3,59 +3,103 @@ Utilidades para el evaluador de perfiles judiciales.
 Contiene funciones auxiliares utilizadas en el análisis.
 """
 
-import re
 from datetime import datetime
 import os
 import logging
+import hashlib
 
-from .config import LOGS_DIR
+from .config import LOGS_DIR, LOG_NIVEL
+from .patrones import menciones_cv
 
-def extraer_años_experiencia(texto):
-    """Extrae los años de experiencia mencionados en el texto."""
-    patrones = [
-        r'(\d+)\s*años?\s*de\s*experiencia',
-        r'experiencia\s*de\s*(\d+)\s*años?',
-        r'(\d+)\s*años?\s*en\s*el\s*cargo',
-        r'(\d+)\s*años?\s*como\s*juez',
-        r'(\d+)\s*años?\s*como\s*magistrado',
-        r'desde\s*el\s*año\s*(\d{4})',
-        r'desde\s*(\d{4})\s*a\s*la\s*fecha'
-    ]
+def extraer_años_experiencia(texto, menciones=None):
+    """
+    Extrae los años de experiencia mencionados en el texto.
     
-    años = []
-    for patron in patrones:
-        matches = re.finditer(patron, texto.lower())
-        for match in matches:
-            if len(match.group(1)) == 4:  # Si es un año
-                años.append(2024 - int(match.group(1)))  # Calcular años hasta 2024
-            else:
-                años.append(int(match.group(1)))
+    Args:
+        texto (str): Texto del CV
+        menciones (dict, opcional): Resultado previo de patrones.menciones_cv
+            sobre el texto en minúsculas
+    """
+    if menciones is None:
+        menciones = menciones_cv(texto.lower())
+    return menciones["años"]
+
+def extraer_texto_pdf(ruta_pdf, max_paginas=None):
+    """
+    Extrae el texto de las páginas de un PDF con el backend configurado.
+    
+    Args:
+        ruta_pdf (str): Ruta del archivo PDF
+        max_paginas (int, opcional): Número máximo de páginas a leer
+        
+    Returns:
+        str: Texto concatenado de las páginas
+    """
+    from .extraccion import extraer_texto
     
-    return max(años) if años else 0
+    return extraer_texto(ruta_pdf, max_paginas=max_paginas)["texto"]
 
-def analizar_formacion(texto):
-    """Analiza la formación académica mencionada en el texto."""
-    texto = texto.lower()
+def hash_archivo(ruta, tamano_bloque=1024 * 1024):
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+def limitar_memoria(max_mb):
+    """
+    Limita el espacio de direcciones del proceso actual. Al superarlo, las
+    reservas de memoria fallan con MemoryError en lugar de que el sistema
+    termine el proceso.
     
-    # Detectar grados académicos
-    grados = {
-        "doctorado": len(re.findall(r'doctorado|doctora|doctor', texto)),
-        "maestría": len(re.findall(r'maestría|maestro|maestra', texto)),
-        "licenciatura": len(re.findall(r'licenciatura|licenciado|licenciada', texto)),
-        "especialidad": len(re.findall(r'especialidad|especialista', texto))
-    }
+    Args:
+        max_mb (int): Límite en MB
+        
+    Returns:
+        bool: Si se aplicó el límite (requiere el módulo resource de Unix)
+    """
+    try:
+        import resource
+    except ImportError:
+        logging.warning("El límite de memoria por worker requiere el módulo resource; se ignora")
+        return False
+    limite = int(max_mb) * 1024 * 1024
+    _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+    if maximo != resource.RLIM_INFINITY:
+        limite = min(limite, maximo)
+    resource.setrlimit(resource.RLIMIT_AS, (limite, maximo))
+    return True
+
+def analizar_formacion(texto, menciones=None):
+    """
+    Analiza la formación académica mencionada en el texto.
+    
+    Args:
+        texto (str): Texto del CV
+        menciones (dict, opcional): Resultado previo de patrones.menciones_cv
+            sobre el texto en minúsculas
+    """
+    if menciones is None:
+        menciones = menciones_cv(texto.lower())
     
-    # Detectar instituciones de prestigio
-    instituciones = len(re.findall(r'universidad|instituto|centro|escuela', texto))
+    # Grados académicos e instituciones de prestigio detectados
+    grados = dict(menciones["grados"])
     
     return {
         "grados_academicos": grados,
-        "instituciones": instituciones,
+        "instituciones": menciones["instituciones"],
         "nivel_maximo": max(grados.items(), key=lambda x: x[1])[0] if any(grados.values()) else "ninguno"
     }
 
-def configurar_logging(log_file=None):
-    """Configura el sistema de logging."""
+def configurar_logging(log_file=None, nivel=LOG_NIVEL):
+    """
+    Configura el sistema de logging.
+    
+    Args:
+        log_file (str, opcional): Archivo de log; por defecto uno con fecha en LOGS_DIR
+        nivel (str): Nivel mínimo de los mensajes ("DEBUG", "INFO", ...)
+    """
     log_dir = LOGS_DIR
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -68,7 +112,7 @@ def configurar_logging(log_file=None):
         log_filepath = log_file
     
     logging.basicConfig(
-        level=logging.DEBUG, # Establecer nivel de logging a DEBUG
+        level=nivel,
         format='%(asctime)s - %(levelname)s - %(message)s',
         filename=log_filepath,
         filemode='w'
@@ -76,7 +120,7 @@ def configurar_logging(log_file=None):
     
     # También configurar un handler para la consola para ver logs en tiempo real
     console = logging.StreamHandler()
-    console.setLevel(logging.DEBUG)
+    console.setLevel(nivel)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     console.setFormatter(formatter)
     logging.getLogger('').addHandler(console)